@@ -1,3 +1,5 @@
+import { AsyncLocalStorage } from 'async_hooks';
+import { createHash } from 'crypto';
 import { MongoClient, ObjectId } from 'mongodb';
 import bcrypt from 'bcryptjs';
 import jwt from 'jsonwebtoken';
@@ -8,9 +10,66 @@ const DAILY_XP_PER_LESSON = 10;
 const MAX_DAILY_LESSONS = 20;
 const ALLOWED_SCENARIOS = ['butikk', 'jobb', 'telefon', 'lege', 'reise', 'mat', 'bolig', 'survival'];
 const ALLOWED_LEVELS = ['beginner', 'intermediate', 'advanced'];
+// Opt-in per-phase Server-Timing headers for load testing (see harness/metrics.py)
+const SERVER_TIMING_ENABLED = process.env.SERVER_TIMING === '1';
+// Lets the Python streak simulation set "now" per request via X-Test-Now (never in production)
+const TEST_CLOCK_ENABLED = process.env.ALLOW_TEST_CLOCK === '1' && process.env.NODE_ENV !== 'production';
+// Indexes behind every hot query, created on first connect (harness/indexes.py checks the plans use them)
+const INDEXES = [
+  { collection: 'users', key: { email: 1 }, options: { unique: true } },
+  { collection: 'daily_progress', key: { userId: 1, date: -1 }, options: { unique: true } }
+];
+
+// Per-user GETs are revalidated on every use, so an unchanged dashboard load costs a 304
+const REVALIDATE_HEADERS = { 'Cache-Control': 'private, no-cache', Vary: 'Cookie' };
 
 let cachedClient = null;
 let cachedDb = null;
+const serverTimingStorage = new AsyncLocalStorage();
+
+function recordPhase(name, duration) {
+  const phases = serverTimingStorage.getStore();
+  if (!phases) return;
+  const phase = phases.get(name) || { duration: 0, count: 0 };
+  phase.duration += duration;
+  phase.count += 1;
+  phases.set(name, phase);
+}
+
+async function timed(name, fn) {
+  if (!SERVER_TIMING_ENABLED) return fn();
+  const start = performance.now();
+  try {
+    return await fn();
+  } finally {
+    recordPhase(name, performance.now() - start);
+  }
+}
+
+function timedSync(name, fn) {
+  if (!SERVER_TIMING_ENABLED) return fn();
+  const start = performance.now();
+  try {
+    return fn();
+  } finally {
+    recordPhase(name, performance.now() - start);
+  }
+}
+
+// Runs a handler and adds Server-Timing: one entry per phase, `app` for the
+// unmeasured rest (validation, streak logic, serialization) and `total`
+async function withServerTiming(handler) {
+  if (!SERVER_TIMING_ENABLED) return handler();
+  const phases = new Map();
+  const start = performance.now();
+  const response = await serverTimingStorage.run(phases, handler);
+  const total = performance.now() - start;
+  const measured = [...phases.values()].reduce((sum, phase) => sum + phase.duration, 0);
+  const entries = [...phases].map(([name, { duration, count }]) => `${name};dur=${duration.toFixed(2)};desc="${count}x"`);
+  entries.push(`app;dur=${Math.max(0, total - measured).toFixed(2)}`, `total;dur=${total.toFixed(2)}`);
+  response.headers.set('Server-Timing', entries.join(', '));
+  return response;
+}
 
 function assertEnvVars() {
   const missing = REQUIRED_ENV_VARS.filter((key) => !process.env[key]);
@@ -26,8 +85,9 @@ async function connectToDatabase() {
     return { client: cachedClient, db: cachedDb };
   }
 
-  const client = await MongoClient.connect(process.env.MONGO_URL);
+  const client = await timed('db-connect', () => MongoClient.connect(process.env.MONGO_URL));
   const db = client.db();
+  await timed('db-indexes', () => ensureIndexes(db));
 
   cachedClient = client;
   cachedDb = db;
@@ -35,19 +95,72 @@ async function connectToDatabase() {
   return { client, db };
 }
 
+// createIndex is a no-op when the index exists; a failure (e.g. duplicates blocking a
+// unique index) is logged rather than taking the API down
+async function ensureIndexes(db) {
+  if (process.env.SKIP_ENSURE_INDEXES === '1') return;
+  try {
+    await Promise.all(INDEXES.map(({ collection, key, options }) => db.collection(collection).createIndex(key, options)));
+  } catch (error) {
+    console.error('Ensure indexes error:', error);
+  }
+}
+
 function verifyToken(request) {
   const token = request.cookies.get('token')?.value;
   if (!token) return null;
   
   try {
-    return jwt.verify(token, process.env.JWT_SECRET);
+    return timedSync('jwt', () => jwt.verify(token, process.env.JWT_SECRET));
   } catch (error) {
     return null;
   }
 }
 
+// Current time for date-based progress logic; X-Test-Now takes an ISO timestamp or epoch milliseconds
+function requestNow(request) {
+  if (!TEST_CLOCK_ENABLED) return new Date();
+  const override = request.headers.get('x-test-now');
+  if (!override) return new Date();
+  const parsed = /^\d+$/.test(override) ? new Date(Number(override)) : new Date(override);
+  return Number.isNaN(parsed.getTime()) ? new Date() : parsed;
+}
+
+// If-None-Match uses the weak comparison: W/"x" and "x" match
+function isNotModified(request, etag) {
+  const header = request.headers.get('if-none-match');
+  if (!header) return false;
+  const opaque = (tag) => tag.trim().replace(/^W\//, '');
+  return header.split(',').some((tag) => tag.trim() === '*' || opaque(tag) === opaque(etag));
+}
+
+function notModified(etag) {
+  return new NextResponse(null, { status: 304, headers: { ETag: etag, ...REVALIDATE_HEADERS } });
+}
+
+function jsonWithEtag(body, etag) {
+  const response = NextResponse.json(body);
+  response.headers.set('ETag', etag);
+  Object.entries(REVALIDATE_HEADERS).forEach(([name, value]) => response.headers.set(name, value));
+  return response;
+}
+
+function bodyEtag(body) {
+  return `"${createHash('sha1').update(JSON.stringify(body)).digest('base64url')}"`;
+}
+
+// Progress changes only through POST /api/progress, which always rewrites the user's latest day,
+// or when the 30-day window and today/yesterday move on; this validator covers both without
+// reading the window
+function progressEtag(today, latest) {
+  const version = latest
+    ? `${latest.date}.${latest.completionsCount || 0}.${new Date(latest.lastCompletionAt || 0).getTime()}`
+    : 'none';
+  return `W/"${today}.${version}"`;
+}
+
 function createToken(userId) {
-  return jwt.sign({ userId }, process.env.JWT_SECRET, { expiresIn: '7d' });
+  return timedSync('jwt', () => jwt.sign({ userId }, process.env.JWT_SECRET, { expiresIn: '7d' }));
 }
 
 function sanitizeDisplayName(name, fallback) {
@@ -110,7 +223,7 @@ function validateProfilePayload(updates, userPlan) {
 // POST /api/auth/signup
 async function handleSignup(request) {
   try {
-    const { email, password, displayName } = await request.json();
+    const { email, password, displayName } = await timed('parse', () => request.json());
     const normalizedEmail = (email || '').trim().toLowerCase();
     
     if (!normalizedEmail || !password) {
@@ -123,15 +236,15 @@ async function handleSignup(request) {
 
     const { db } = await connectToDatabase();
     
-    const existingUser = await db.collection('users').findOne({ email: normalizedEmail });
+    const existingUser = await timed('db', () => db.collection('users').findOne({ email: normalizedEmail }));
     if (existingUser) {
       return NextResponse.json({ error: 'E-post er allerede registrert' }, { status: 400 });
     }
 
-    const hashedPassword = await bcrypt.hash(password, 10);
+    const hashedPassword = await timed('bcrypt', () => bcrypt.hash(password, 10));
     const safeDisplayName = sanitizeDisplayName(displayName, normalizedEmail.split('@')[0]);
     
-    const result = await db.collection('users').insertOne({
+    const result = await timed('db', () => db.collection('users').insertOne({
       email: normalizedEmail,
       password: hashedPassword,
       displayName: safeDisplayName,
@@ -140,7 +253,7 @@ async function handleSignup(request) {
       scenarios: ['survival', 'butikk'],
       plan: 'free',
       createdAt: new Date()
-    });
+    }));
 
     const token = createToken(result.insertedId.toString());
     
@@ -170,7 +283,7 @@ async function handleSignup(request) {
 // POST /api/auth/signin
 async function handleSignin(request) {
   try {
-    const { email, password } = await request.json();
+    const { email, password } = await timed('parse', () => request.json());
     
     if (!email || !password) {
       return NextResponse.json({ error: 'Email og passord er påkrevd' }, { status: 400 });
@@ -178,12 +291,12 @@ async function handleSignin(request) {
 
     const { db } = await connectToDatabase();
     
-    const user = await db.collection('users').findOne({ email: email.toLowerCase() });
+    const user = await timed('db', () => db.collection('users').findOne({ email: email.toLowerCase() }));
     if (!user) {
       return NextResponse.json({ error: 'Ugyldig e-post eller passord' }, { status: 401 });
     }
 
-    const validPassword = await bcrypt.compare(password, user.password);
+    const validPassword = await timed('bcrypt', () => bcrypt.compare(password, user.password));
     if (!validPassword) {
       return NextResponse.json({ error: 'Ugyldig e-post eller passord' }, { status: 401 });
     }
@@ -222,13 +335,13 @@ async function handleGetMe(request) {
     }
 
     const { db } = await connectToDatabase();
-    const user = await db.collection('users').findOne({ _id: new ObjectId(decoded.userId) });
+    const user = await timed('db', () => db.collection('users').findOne({ _id: new ObjectId(decoded.userId) }));
     
     if (!user) {
       return NextResponse.json({ error: 'Bruker ikke funnet' }, { status: 404 });
     }
 
-    return NextResponse.json({
+    const body = {
       id: user._id.toString(),
       email: user.email,
       displayName: user.displayName,
@@ -236,7 +349,9 @@ async function handleGetMe(request) {
       goal: user.goal,
       scenarios: user.scenarios,
       plan: user.plan
-    });
+    };
+    const etag = bodyEtag(body);
+    return isNotModified(request, etag) ? notModified(etag) : jsonWithEtag(body, etag);
   } catch (error) {
     console.error('Get me error:', error);
     return NextResponse.json({ error: 'Noe gikk galt' }, { status: 500 });
@@ -259,19 +374,21 @@ async function handleGetProfile(request) {
     }
 
     const { db } = await connectToDatabase();
-    const user = await db.collection('users').findOne({ _id: new ObjectId(decoded.userId) });
+    const user = await timed('db', () => db.collection('users').findOne({ _id: new ObjectId(decoded.userId) }));
     
     if (!user) {
       return NextResponse.json({ error: 'Bruker ikke funnet' }, { status: 404 });
     }
 
-    return NextResponse.json({
+    const body = {
       displayName: user.displayName,
       level: user.level,
       goal: user.goal,
       scenarios: user.scenarios,
       plan: user.plan
-    });
+    };
+    const etag = bodyEtag(body);
+    return isNotModified(request, etag) ? notModified(etag) : jsonWithEtag(body, etag);
   } catch (error) {
     console.error('Get profile error:', error);
     return NextResponse.json({ error: 'Noe gikk galt' }, { status: 500 });
@@ -286,9 +403,9 @@ async function handleUpdateProfile(request) {
       return NextResponse.json({ error: 'Ikke autorisert' }, { status: 401 });
     }
 
-    const updates = await request.json();
+    const updates = await timed('parse', () => request.json());
     const { db } = await connectToDatabase();
-    const user = await db.collection('users').findOne({ _id: new ObjectId(decoded.userId) });
+    const user = await timed('db', () => db.collection('users').findOne({ _id: new ObjectId(decoded.userId) }));
 
     if (!user) {
       return NextResponse.json({ error: 'Bruker ikke funnet' }, { status: 404 });
@@ -300,10 +417,10 @@ async function handleUpdateProfile(request) {
       return NextResponse.json({ error: errors.join('. ') }, { status: 400 });
     }
 
-    await db.collection('users').updateOne(
+    await timed('db', () => db.collection('users').updateOne(
       { _id: new ObjectId(decoded.userId) },
       { $set: validated }
-    );
+    ));
 
     return NextResponse.json({ success: true });
   } catch (error) {
@@ -321,23 +438,34 @@ async function handleGetProgress(request) {
     }
 
     const { db } = await connectToDatabase();
+    const now = requestNow(request);
+    const today = now.toISOString().split('T')[0];
+
+    const latest = await timed('db', () => db.collection('daily_progress')
+      .find({ userId: decoded.userId }, { projection: { date: 1, completionsCount: 1, lastCompletionAt: 1 } })
+      .sort({ date: -1 })
+      .limit(1)
+      .next());
+    const etag = progressEtag(today, latest);
+    if (isNotModified(request, etag)) {
+      return notModified(etag);
+    }
     
     // Get last 30 days of progress
-    const thirtyDaysAgo = new Date();
+    const thirtyDaysAgo = new Date(now);
     thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
     
-    const progress = await db.collection('daily_progress')
+    const progress = await timed('db', () => db.collection('daily_progress')
       .find({ 
         userId: decoded.userId,
         date: { $gte: thirtyDaysAgo.toISOString().split('T')[0] }
       })
       .sort({ date: -1 })
-      .toArray();
+      .toArray());
 
     // Calculate current streak
     let currentStreak = 0;
-    const today = new Date().toISOString().split('T')[0];
-    const yesterday = new Date(Date.now() - 86400000).toISOString().split('T')[0];
+    const yesterday = new Date(now.getTime() - 86400000).toISOString().split('T')[0];
     
     const todayProgress = progress.find(p => p.date === today);
     const yesterdayProgress = progress.find(p => p.date === yesterday);
@@ -353,14 +481,14 @@ async function handleGetProgress(request) {
     // Calculate total XP
     const totalXP = progress.reduce((sum, p) => sum + (p.xpEarned || 0), 0);
 
-    return NextResponse.json({
+    return jsonWithEtag({
       progress,
       currentStreak,
       totalXP,
       completedToday: completedLessonsToday >= MAX_DAILY_LESSONS,
       completedLessonsToday,
       maxDailyLessons: MAX_DAILY_LESSONS
-    });
+    }, etag);
   } catch (error) {
     console.error('Get progress error:', error);
     return NextResponse.json({ error: 'Noe gikk galt' }, { status: 500 });
@@ -376,24 +504,25 @@ async function handleCompleteLesson(request) {
     }
 
     const { db } = await connectToDatabase();
+    const now = requestNow(request);
     
-    const today = new Date().toISOString().split('T')[0];
-    const yesterday = new Date(Date.now() - 86400000).toISOString().split('T')[0];
+    const today = now.toISOString().split('T')[0];
+    const yesterday = new Date(now.getTime() - 86400000).toISOString().split('T')[0];
     
-    const todayProgress = await db.collection('daily_progress').findOne({
+    const todayProgress = await timed('db', () => db.collection('daily_progress').findOne({
       userId: decoded.userId,
       date: today
-    });
+    }));
 
     if (todayProgress?.completionsCount >= MAX_DAILY_LESSONS) {
       return NextResponse.json({ error: 'Dagens maks antall oppgaver er nådd' }, { status: 400 });
     }
 
     // Get yesterday's progress to calculate streak for first completion
-    const yesterdayProgress = await db.collection('daily_progress').findOne({
+    const yesterdayProgress = await timed('db', () => db.collection('daily_progress').findOne({
       userId: decoded.userId,
       date: yesterday
-    });
+    }));
 
     const isFirstCompletionToday = !todayProgress;
     const currentCompletions = todayProgress?.completionsCount || 0;
@@ -408,15 +537,15 @@ async function handleCompleteLesson(request) {
       completed: true,
       streakAfter: newStreak,
       completionsCount: currentCompletions + 1,
-      completedAt: new Date(),
-      lastCompletionAt: new Date()
+      completedAt: now,
+      lastCompletionAt: now
     };
 
-    await db.collection('daily_progress').updateOne(
+    await timed('db', () => db.collection('daily_progress').updateOne(
       { userId: decoded.userId, date: today },
       { $set: updatedProgress },
       { upsert: true }
-    );
+    ));
 
     return NextResponse.json({ 
       success: true,
@@ -435,7 +564,7 @@ async function handleCompleteLesson(request) {
 // POST /api/contact
 async function handleContact(request) {
   try {
-    const { email, message } = await request.json();
+    const { email, message } = await timed('parse', () => request.json());
     
     if (!email || !message) {
       return NextResponse.json({ error: 'E-post og melding er påkrevd' }, { status: 400 });
@@ -443,11 +572,11 @@ async function handleContact(request) {
 
     const { db } = await connectToDatabase();
     
-    await db.collection('contact_messages').insertOne({
+    await timed('db', () => db.collection('contact_messages').insertOne({
       email,
       message,
       createdAt: new Date()
-    });
+    }));
 
     return NextResponse.json({ success: true });
   } catch (error) {
@@ -464,7 +593,7 @@ async function handleStripeCheckout(request) {
       return NextResponse.json({ error: 'Ikke autorisert' }, { status: 401 });
     }
 
-    const { priceId } = await request.json();
+    const { priceId } = await timed('parse', () => request.json());
     
     // TODO: Implement Stripe checkout session
     // Requires: STRIPE_SECRET_KEY, STRIPE_PRICE_ID_BASIC, STRIPE_PRICE_ID_PRO
@@ -520,15 +649,15 @@ export async function GET(request, { params }) {
   const path = params.path?.join('/') || '';
   
   if (path === 'auth/me') {
-    return handleGetMe(request);
+    return withServerTiming(() => handleGetMe(request));
   }
   
   if (path === 'profile') {
-    return handleGetProfile(request);
+    return withServerTiming(() => handleGetProfile(request));
   }
   
   if (path === 'progress') {
-    return handleGetProgress(request);
+    return withServerTiming(() => handleGetProgress(request));
   }
   
   return NextResponse.json({ error: 'Not found' }, { status: 404 });
@@ -538,31 +667,31 @@ export async function POST(request, { params }) {
   const path = params.path?.join('/') || '';
   
   if (path === 'auth/signup') {
-    return handleSignup(request);
+    return withServerTiming(() => handleSignup(request));
   }
   
   if (path === 'auth/signin') {
-    return handleSignin(request);
+    return withServerTiming(() => handleSignin(request));
   }
   
   if (path === 'auth/logout') {
-    return handleLogout();
+    return withServerTiming(() => handleLogout());
   }
   
   if (path === 'progress') {
-    return handleCompleteLesson(request);
+    return withServerTiming(() => handleCompleteLesson(request));
   }
   
   if (path === 'contact') {
-    return handleContact(request);
+    return withServerTiming(() => handleContact(request));
   }
   
   if (path === 'stripe/checkout') {
-    return handleStripeCheckout(request);
+    return withServerTiming(() => handleStripeCheckout(request));
   }
   
   if (path === 'stripe/webhook') {
-    return handleStripeWebhook(request);
+    return withServerTiming(() => handleStripeWebhook(request));
   }
   
   return NextResponse.json({ error: 'Not found' }, { status: 404 });
@@ -572,7 +701,7 @@ export async function PUT(request, { params }) {
   const path = params.path?.join('/') || '';
   
   if (path === 'profile') {
-    return handleUpdateProfile(request);
+    return withServerTiming(() => handleUpdateProfile(request));
   }
   
   return NextResponse.json({ error: 'Not found' }, { status: 404 });
@@ -6,7 +6,23 @@ const audioCache = new Map();
 const MAX_TEXT_LENGTH = 200;
 const client = createClient();
 
+function createStubClient() {
+  // Local stand-in for load tests (TTS_STUB=1), never reaches Google
+  const latencyMs = Number(process.env.TTS_STUB_LATENCY_MS) || 150;
+  const bytesPerChar = Number(process.env.TTS_STUB_BYTES_PER_CHAR) || 1500;
+  return {
+    async synthesizeSpeech(request) {
+      await new Promise((resolve) => setTimeout(resolve, latencyMs));
+      return [{ audioContent: Buffer.alloc(request.input.text.length * bytesPerChar, 0x55) }];
+    }
+  };
+}
+
 function createClient() {
+  if (process.env.TTS_STUB === '1' && process.env.NODE_ENV !== 'production') {
+    return createStubClient();
+  }
+
   // Supports GOOGLE_TTS_CREDENTIALS as base64 JSON or GOOGLE_APPLICATION_CREDENTIALS path/ADC
   const base64Creds = process.env.GOOGLE_TTS_CREDENTIALS;
   if (base64Creds) {
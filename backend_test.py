@@ -5,55 +5,125 @@ Tests all authentication, profile, progress, and contact endpoints
 """
 
 import requests
-import json
 import time
 from datetime import datetime, timedelta
 import os
+import uuid
+
+from harness.metrics import LatencyRecorder, parse_server_timing
+from harness.scheduler import requires, run_parallel
+from harness.sinks import ConsoleSink, RequestRecord
+from harness.transport import Transport
 
 # Get base URL from environment
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
 API_BASE = f"{BASE_URL}/api"
+LATENCY_REPORT = os.getenv('LATENCY_REPORT', 'backend_latency.json')
 
 class SvenskPa3APITester:
-    def __init__(self):
-        self.session = requests.Session()
-        self.test_user_email = f"testuser_{int(time.time())}@example.com"
+    def __init__(self, backend=None, latency=None, user_pool=None, sink=None, retry=None, transport=None,
+                 live=None):
+        self.backend = backend
+        self.retry = retry
+        # Optional harness.live.LiveMetrics, fed while the suite runs
+        self.live = live
+        # Shared by parallel testers so every session reuses the same warm sockets
+        self.transport = transport or Transport(backend=backend, base_url=BASE_URL)
+        self.latency = latency or LatencyRecorder()
+        self.user_pool = user_pool
+        self.sink = sink or ConsoleSink()
+        self.session = self.new_session()
+        # Suffix keeps parallel testers created in the same second on separate users
+        self.test_user_email = f"testuser_{int(time.time())}_{uuid.uuid4().hex[:6]}@example.com"
         self.test_user_password = "TestPassword123!"
         self.test_user_display_name = "Test Användare"
         self.auth_token = None
         self.user_id = None
+        self.lesson_completed = False
         
+    def new_session(self):
+        """Fresh cookie-less session over the shared pool, answered in-process when a backend stand-in is set"""
+        return self.transport.session()
+
+    def ensure_state(self, state):
+        """Bring this tester's user into `state` ('session' or 'lesson') without logging a test"""
+        if state in ('session', 'lesson') and 'token' not in self.session.cookies and self.user_pool is not None:
+            # Borrow a cached signed-in user instead of paying for signup/bcrypt
+            user, token = self.user_pool.checkout()
+            self.test_user_email, self.test_user_password = user['email'], user['password']
+            self.session.cookies.set('token', token, path='/')
+        if state in ('session', 'lesson') and 'token' not in self.session.cookies:
+            credentials = {"email": self.test_user_email, "password": self.test_user_password}
+            response = self.send(self.session, 'POST', 'auth/signup',
+                                 {**credentials, "displayName": self.test_user_display_name})
+            if response.status_code != 200:
+                self.send(self.session, 'POST', 'auth/signin', credentials)
+        if state == 'lesson' and not self.lesson_completed:
+            response = self.send(self.session, 'POST', 'progress', {})
+            self.lesson_completed = response.status_code == 200
+        elif state not in ('session', 'lesson'):
+            raise ValueError(f"Unknown test state: {state}")
+
     def log_test(self, test_name, success, details=""):
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
-        if details:
-            print(f"   Details: {details}")
-        print()
+        self.sink.test(test_name, success, details)
         
-    def make_request(self, method, endpoint, data=None, expect_success=True):
-        """Make HTTP request and handle response"""
+    def send(self, session, method, endpoint, data=None):
+        """Issue one request on `session`, retried per self.retry (a harness.retry.RetryPolicy) if set"""
+        if self.retry is None:
+            return self.send_once(session, method, endpoint, data)
+
+        def attempt(timeout):
+            try:
+                response = self.send_once(session, method, endpoint, data, timeout)
+                return response.status_code, response
+            except requests.RequestException as error:
+                return None, error
+
+        status, result = self.retry.call_sync(method, attempt)
+        if status is None:
+            raise result
+        return result
+
+    def send_once(self, session, method, endpoint, data=None, timeout=None):
+        """Issue one request on `session` and record its latency"""
         url = f"{API_BASE}/{endpoint}"
-        
+        response = None
+        if self.live is not None:
+            self.live.begin(method, endpoint)
+        start = time.perf_counter()
         try:
             if method.upper() == 'GET':
-                response = self.session.get(url)
+                response = session.get(url, timeout=timeout)
             elif method.upper() == 'POST':
-                response = self.session.post(url, json=data)
+                response = session.post(url, json=data, timeout=timeout)
             elif method.upper() == 'PUT':
-                response = self.session.put(url, json=data)
+                response = session.put(url, json=data, timeout=timeout)
             else:
                 raise ValueError(f"Unsupported method: {method}")
-                
-            print(f"   Request: {method} {url}")
-            if data:
-                print(f"   Data: {json.dumps(data, indent=2)}")
-            print(f"   Response Status: {response.status_code}")
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            status = response.status_code if response is not None else None
+            # Per-phase breakdown when the server runs with SERVER_TIMING=1
+            phases = parse_server_timing(response.headers.get('Server-Timing')) if response is not None else None
+            connect = getattr(response, 'connect_elapsed', None)
+            if connect is not None:
+                # TCP setup apart from the exchange itself, so new and reused connections compare fairly
+                phases = {**(phases or {}), 'connect': connect * 1000, 'exchange': (elapsed - connect) * 1000}
+            self.latency.record(method, endpoint, status, elapsed, phases)
+            if self.live is not None:
+                self.live.end(method, endpoint, status, elapsed)
+            # Bodies stay unserialized until a sink needs them
+            self.sink.request(RequestRecord(method, url, data, status, elapsed, response))
+
+    def make_request(self, method, endpoint, data=None, expect_success=True):
+        """Make HTTP request and handle response"""
+        try:
+            response = self.send(self.session, method, endpoint, data)
             
             try:
                 response_data = response.json()
-                print(f"   Response: {json.dumps(response_data, indent=2)}")
-            except:
-                print(f"   Response: {response.text}")
+            except ValueError:
                 response_data = {}
                 
             return response, response_data
@@ -64,7 +134,7 @@ class SvenskPa3APITester:
 
     def test_auth_signup_success(self):
         """Test successful user signup"""
-        print("🧪 Testing Authentication Signup - Success Case")
+        self.sink.start("🧪 Testing Authentication Signup - Success Case")
         
         data = {
             "email": self.test_user_email,
@@ -91,9 +161,10 @@ class SvenskPa3APITester:
             self.log_test("Auth Signup Success", False, f"Status: {response.status_code if response else 'No response'}")
             return False
 
+    @requires(after=('test_auth_signup_success',))
     def test_auth_signup_duplicate_email(self):
         """Test signup with duplicate email"""
-        print("🧪 Testing Authentication Signup - Duplicate Email")
+        self.sink.start("🧪 Testing Authentication Signup - Duplicate Email")
         
         data = {
             "email": self.test_user_email,  # Same email as before
@@ -116,7 +187,7 @@ class SvenskPa3APITester:
 
     def test_auth_signup_missing_fields(self):
         """Test signup with missing required fields"""
-        print("🧪 Testing Authentication Signup - Missing Fields")
+        self.sink.start("🧪 Testing Authentication Signup - Missing Fields")
         
         data = {
             "email": f"incomplete_{int(time.time())}@example.com"
@@ -136,9 +207,10 @@ class SvenskPa3APITester:
             self.log_test("Auth Signup Missing Fields", False, f"Expected 400, got {response.status_code if response else 'No response'}")
             return False
 
+    @requires(after=('test_auth_signup_success',))
     def test_auth_signin_success(self):
         """Test successful signin"""
-        print("🧪 Testing Authentication Signin - Success Case")
+        self.sink.start("🧪 Testing Authentication Signin - Success Case")
         
         data = {
             "email": self.test_user_email,
@@ -162,9 +234,10 @@ class SvenskPa3APITester:
             self.log_test("Auth Signin Success", False, f"Status: {response.status_code if response else 'No response'}")
             return False
 
+    @requires(after=('test_auth_signup_success',))
     def test_auth_signin_wrong_password(self):
         """Test signin with wrong password"""
-        print("🧪 Testing Authentication Signin - Wrong Password")
+        self.sink.start("🧪 Testing Authentication Signin - Wrong Password")
         
         data = {
             "email": self.test_user_email,
@@ -184,9 +257,10 @@ class SvenskPa3APITester:
             self.log_test("Auth Signin Wrong Password", False, f"Expected 401, got {response.status_code if response else 'No response'}")
             return False
 
+    @requires('session')
     def test_auth_me_with_token(self):
         """Test getting user info with valid token"""
-        print("🧪 Testing Authentication Me - With Valid Token")
+        self.sink.start("🧪 Testing Authentication Me - With Valid Token")
         
         response, response_data = self.make_request('GET', 'auth/me')
         
@@ -204,21 +278,17 @@ class SvenskPa3APITester:
 
     def test_auth_me_without_token(self):
         """Test getting user info without token"""
-        print("🧪 Testing Authentication Me - Without Token")
+        self.sink.start("🧪 Testing Authentication Me - Without Token")
         
         # Create new session without cookies
-        temp_session = requests.Session()
-        url = f"{API_BASE}/auth/me"
+        temp_session = self.new_session()
         
         try:
-            response = temp_session.get(url)
-            print(f"   Request: GET {url}")
-            print(f"   Response Status: {response.status_code}")
+            response = self.send(temp_session, 'GET', 'auth/me')
             
             try:
                 response_data = response.json()
-                print(f"   Response: {json.dumps(response_data, indent=2)}")
-            except:
+            except ValueError:
                 response_data = {}
                 
             if response.status_code == 401:
@@ -236,9 +306,10 @@ class SvenskPa3APITester:
             self.log_test("Auth Me Without Token", False, f"Error: {str(e)}")
             return False
 
+    @requires('session')
     def test_profile_get_authenticated(self):
         """Test getting profile for authenticated user"""
-        print("🧪 Testing Profile Get - Authenticated User")
+        self.sink.start("🧪 Testing Profile Get - Authenticated User")
         
         response, response_data = self.make_request('GET', 'profile')
         
@@ -258,9 +329,10 @@ class SvenskPa3APITester:
             self.log_test("Profile Get Authenticated", False, f"Status: {response.status_code if response else 'No response'}")
             return False
 
+    @requires('session')
     def test_profile_update_valid_data(self):
         """Test updating profile with valid data"""
-        print("🧪 Testing Profile Update - Valid Data")
+        self.sink.start("🧪 Testing Profile Update - Valid Data")
         
         data = {
             "displayName": "Uppdaterat Namn",
@@ -284,21 +356,17 @@ class SvenskPa3APITester:
 
     def test_profile_get_without_auth(self):
         """Test getting profile without authentication"""
-        print("🧪 Testing Profile Get - Without Authentication")
+        self.sink.start("🧪 Testing Profile Get - Without Authentication")
         
         # Create new session without cookies
-        temp_session = requests.Session()
-        url = f"{API_BASE}/profile"
+        temp_session = self.new_session()
         
         try:
-            response = temp_session.get(url)
-            print(f"   Request: GET {url}")
-            print(f"   Response Status: {response.status_code}")
+            response = self.send(temp_session, 'GET', 'profile')
             
             try:
                 response_data = response.json()
-                print(f"   Response: {json.dumps(response_data, indent=2)}")
-            except:
+            except ValueError:
                 response_data = {}
                 
             if response.status_code == 401:
@@ -312,9 +380,10 @@ class SvenskPa3APITester:
             self.log_test("Profile Get Without Auth", False, f"Error: {str(e)}")
             return False
 
+    @requires('session')
     def test_progress_get_new_user(self):
         """Test getting progress for new user"""
-        print("🧪 Testing Progress Get - New User")
+        self.sink.start("🧪 Testing Progress Get - New User")
         
         response, response_data = self.make_request('GET', 'progress')
         
@@ -340,9 +409,10 @@ class SvenskPa3APITester:
             self.log_test("Progress Get New User", False, f"Status: {response.status_code if response else 'No response'}")
             return False
 
+    @requires('session')
     def test_progress_complete_lesson_first_time(self):
         """Test completing today's lesson for the first time"""
-        print("🧪 Testing Progress Complete Lesson - First Time Today")
+        self.sink.start("🧪 Testing Progress Complete Lesson - First Time Today")
         
         data = {
             "xpEarned": 15
@@ -352,6 +422,7 @@ class SvenskPa3APITester:
         
         if response and response.status_code == 200:
             if response_data.get('success'):
+                self.lesson_completed = True
                 streak = response_data.get('streak', 0)
                 xp_earned = response_data.get('xpEarned', 0)
                 self.log_test("Progress Complete Lesson First Time", True, 
@@ -364,9 +435,10 @@ class SvenskPa3APITester:
             self.log_test("Progress Complete Lesson First Time", False, f"Status: {response.status_code if response else 'No response'}")
             return False
 
+    @requires('lesson', after=('test_progress_complete_lesson_first_time',))
     def test_progress_complete_lesson_already_completed(self):
         """Test completing lesson again same day (should fail)"""
-        print("🧪 Testing Progress Complete Lesson - Already Completed Today")
+        self.sink.start("🧪 Testing Progress Complete Lesson - Already Completed Today")
         
         data = {
             "xpEarned": 10
@@ -385,9 +457,10 @@ class SvenskPa3APITester:
             self.log_test("Progress Complete Lesson Already Completed", False, f"Expected 400, got {response.status_code if response else 'No response'}")
             return False
 
+    @requires('lesson', after=('test_progress_complete_lesson_already_completed',))
     def test_progress_verify_streak_and_xp(self):
         """Test that progress shows updated streak and XP"""
-        print("🧪 Testing Progress Verify Streak and XP")
+        self.sink.start("🧪 Testing Progress Verify Streak and XP")
         
         response, response_data = self.make_request('GET', 'progress')
         
@@ -412,21 +485,17 @@ class SvenskPa3APITester:
 
     def test_progress_get_without_auth(self):
         """Test getting progress without authentication"""
-        print("🧪 Testing Progress Get - Without Authentication")
+        self.sink.start("🧪 Testing Progress Get - Without Authentication")
         
         # Create new session without cookies
-        temp_session = requests.Session()
-        url = f"{API_BASE}/progress"
+        temp_session = self.new_session()
         
         try:
-            response = temp_session.get(url)
-            print(f"   Request: GET {url}")
-            print(f"   Response Status: {response.status_code}")
+            response = self.send(temp_session, 'GET', 'progress')
             
             try:
                 response_data = response.json()
-                print(f"   Response: {json.dumps(response_data, indent=2)}")
-            except:
+            except ValueError:
                 response_data = {}
                 
             if response.status_code == 401:
@@ -442,7 +511,7 @@ class SvenskPa3APITester:
 
     def test_contact_form_valid_data(self):
         """Test submitting contact form with valid data"""
-        print("🧪 Testing Contact Form - Valid Data")
+        self.sink.start("🧪 Testing Contact Form - Valid Data")
         
         data = {
             "email": "contact@example.com",
@@ -464,7 +533,7 @@ class SvenskPa3APITester:
 
     def test_contact_form_missing_fields(self):
         """Test submitting contact form with missing fields"""
-        print("🧪 Testing Contact Form - Missing Fields")
+        self.sink.start("🧪 Testing Contact Form - Missing Fields")
         
         data = {
             "email": "incomplete@example.com"
@@ -484,9 +553,10 @@ class SvenskPa3APITester:
             self.log_test("Contact Form Missing Fields", False, f"Expected 400, got {response.status_code if response else 'No response'}")
             return False
 
+    @requires('session')
     def test_auth_logout(self):
         """Test logout functionality"""
-        print("🧪 Testing Authentication Logout")
+        self.sink.start("🧪 Testing Authentication Logout")
         
         response, response_data = self.make_request('POST', 'auth/logout')
         
@@ -506,55 +576,70 @@ class SvenskPa3APITester:
             self.log_test("Auth Logout", False, f"Status: {response.status_code if response else 'No response'}")
             return False
 
-    def run_all_tests(self):
-        """Run all backend API tests"""
+    TEST_SECTIONS = (
+        ("📋 AUTHENTICATION TESTS", (
+            'test_auth_signup_success',
+            'test_auth_signup_duplicate_email',
+            'test_auth_signup_missing_fields',
+            'test_auth_signin_success',
+            'test_auth_signin_wrong_password',
+            'test_auth_me_with_token',
+            'test_auth_me_without_token',
+        )),
+        ("📋 PROFILE TESTS", (
+            'test_profile_get_authenticated',
+            'test_profile_update_valid_data',
+            'test_profile_get_without_auth',
+        )),
+        ("📋 PROGRESS TESTS", (
+            'test_progress_get_new_user',
+            'test_progress_complete_lesson_first_time',
+            'test_progress_complete_lesson_already_completed',
+            'test_progress_verify_streak_and_xp',
+            'test_progress_get_without_auth',
+        )),
+        ("📋 CONTACT TESTS", (
+            'test_contact_form_valid_data',
+            'test_contact_form_missing_fields',
+        )),
+        ("📋 LOGOUT TEST", (
+            'test_auth_logout',
+        )),
+    )
+
+    def run_all_tests(self, parallel=False, max_workers=None):
+        """Run all backend API tests
+
+        With parallel=True, independent branches (see @requires) run at the same
+        time on a thread pool, each on its own freshly created user.
+        """
         print("🚀 Starting SvenskPå3 Backend API Testing")
         print("=" * 60)
         print(f"Base URL: {BASE_URL}")
         print(f"API Base: {API_BASE}")
         print(f"Test User Email: {self.test_user_email}")
+        print(f"Mode: {'parallel' if parallel else 'sequential'}")
         print("=" * 60)
         print()
         
-        test_results = []
-        
-        # Authentication Tests
-        print("📋 AUTHENTICATION TESTS")
-        print("-" * 30)
-        test_results.append(self.test_auth_signup_success())
-        test_results.append(self.test_auth_signup_duplicate_email())
-        test_results.append(self.test_auth_signup_missing_fields())
-        test_results.append(self.test_auth_signin_success())
-        test_results.append(self.test_auth_signin_wrong_password())
-        test_results.append(self.test_auth_me_with_token())
-        test_results.append(self.test_auth_me_without_token())
-        
-        # Profile Tests
-        print("📋 PROFILE TESTS")
-        print("-" * 30)
-        test_results.append(self.test_profile_get_authenticated())
-        test_results.append(self.test_profile_update_valid_data())
-        test_results.append(self.test_profile_get_without_auth())
-        
-        # Progress Tests
-        print("📋 PROGRESS TESTS")
-        print("-" * 30)
-        test_results.append(self.test_progress_get_new_user())
-        test_results.append(self.test_progress_complete_lesson_first_time())
-        test_results.append(self.test_progress_complete_lesson_already_completed())
-        test_results.append(self.test_progress_verify_streak_and_xp())
-        test_results.append(self.test_progress_get_without_auth())
-        
-        # Contact Tests
-        print("📋 CONTACT TESTS")
-        print("-" * 30)
-        test_results.append(self.test_contact_form_valid_data())
-        test_results.append(self.test_contact_form_missing_fields())
-        
-        # Logout Test
-        print("📋 LOGOUT TEST")
-        print("-" * 30)
-        test_results.append(self.test_auth_logout())
+        started = time.perf_counter()
+        if parallel:
+            names = [name for _, section in self.TEST_SECTIONS for name in section]
+            test_results = run_parallel(
+                type(self),
+                lambda: type(self)(self.backend, self.latency, self.user_pool, self.sink, self.retry, self.transport,
+                                   self.live),
+                names,
+                max_workers,
+            )
+        else:
+            test_results = []
+            for title, section in self.TEST_SECTIONS:
+                print(title)
+                print("-" * 30)
+                for name in section:
+                    test_results.append(getattr(self, name)())
+        wall_clock = time.perf_counter() - started
         
         # Summary
         print("=" * 60)
@@ -569,17 +654,116 @@ class SvenskPa3APITester:
         print(f"Passed: {passed} ✅")
         print(f"Failed: {failed} ❌")
         print(f"Success Rate: {(passed/total)*100:.1f}%")
+        print(f"Wall Clock: {wall_clock:.2f}s")
         
         if failed == 0:
             print("\n🎉 ALL TESTS PASSED! Backend API is working correctly.")
         else:
             print(f"\n⚠️  {failed} test(s) failed. Please check the details above.")
         
+        # Latency
+        print()
+        print("⏱️  LATENCY BY ENDPOINT")
+        self.latency.print_table()
+        if self.backend is None:
+            print()
+            self.transport.print_summary()
+        self.latency.write_json(LATENCY_REPORT, summary={"total": total, "passed": passed, "failed": failed},
+                                transport=self.transport.summary())
+        print(f"\nLatency report written to {LATENCY_REPORT}")
+        
         return passed, total
 
 if __name__ == "__main__":
-    tester = SvenskPa3APITester()
-    passed, total = tester.run_all_tests()
+    import argparse
+    import sys
+
+    if '--load' in sys.argv:
+        # Asyncio load mode: python backend_test.py --load --concurrency 200 --duration 60
+        from harness import loadgen
+        loadgen.main([arg for arg in sys.argv[1:] if arg != '--load'])
+        exit(0)
+
+    if '--stress' in sys.argv:
+        # Concurrent POST /api/progress races: python backend_test.py --stress --levels 1,5,25
+        from harness import stress
+        summary = stress.main([arg for arg in sys.argv[1:] if arg != '--stress'])
+        exit(1 if any(level['violating'] for level in summary) else 0)
+
+    if '--bench' in sys.argv:
+        # Per-route benchmarks gated against a stored baseline: python backend_test.py --bench
+        from harness import bench
+        regressed = bench.main([arg for arg in sys.argv[1:] if arg != '--bench'])
+        exit(1 if regressed else 0)
+
+    parser = argparse.ArgumentParser(description="SvenskPå3 backend API tests")
+    parser.add_argument('--in-process', action='store_true',
+                        help="run against the Python stand-in for app/api/[[...path]]/route.js, no server needed")
+    parser.add_argument('--parallel', action='store_true', help="run independent test branches concurrently")
+    parser.add_argument('--user-pool', type=int, default=0, metavar='N',
+                        help="provision --parallel branch prerequisites from N cached signed-in users")
+    parser.add_argument('--verbosity', type=int, default=3, choices=range(4),
+                        help="0 failures only, 1 test results, 2 requests, 3 request/response bodies")
+    parser.add_argument('--quiet', dest='verbosity', action='store_const', const=1, help="same as --verbosity 1")
+    parser.add_argument('--jsonl', metavar='PATH', help="also write buffered JSON Lines results to PATH")
+    parser.add_argument('--junit', metavar='PATH', help="also write a JUnit XML report to PATH")
+    parser.add_argument('--samples', metavar='PATH', help="also record every request to a sample store")
+    parser.add_argument('--retry', metavar='POLICY',
+                        help="retry/timeout/backoff policy, e.g. 'attempts=3,timeout=2s' (see harness/retry.py)")
+    parser.add_argument('--pool-size', type=int, default=10, metavar='N', help="keep-alive sockets per host")
+    parser.add_argument('--pool-block', action='store_true',
+                        help="wait for a free pooled socket instead of opening more than --pool-size")
+    from harness import live
+    live.add_arguments(parser)
+    args = parser.parse_args()
+    if args.user_pool and not args.parallel:
+        # Sequential runs start with the signup test, so a pooled user would never be checked out
+        parser.error("--user-pool requires --parallel")
+
+    from harness.sinks import ConsoleSink, JsonlSink, JUnitSink, MultiSink, SampleSink
+    sinks = [ConsoleSink(args.verbosity)]
+    if args.jsonl:
+        sinks.append(JsonlSink(args.jsonl))
+    if args.junit:
+        sinks.append(JUnitSink(args.junit))
+    if args.samples:
+        sinks.append(SampleSink(args.samples))
+    sink = sinks[0] if len(sinks) == 1 else MultiSink(*sinks)
+
+    backend = None
+    if args.in_process:
+        from harness.fake_backend import InMemoryBackend
+        backend = InMemoryBackend()
+
+    retry = None
+    if args.retry:
+        from harness.retry import parse_policy
+        retry = parse_policy(args.retry)
+
+    transport = Transport(args.pool_size, block=args.pool_block, backend=backend, base_url=BASE_URL)
+    session = live.from_args(args)
+    tester = SvenskPa3APITester(backend, sink=sink, retry=retry, transport=transport,
+                                live=session.metrics if session else None)
+    if args.user_pool:
+        from harness.user_pool import USER_POOL_FILE, UserPool
+        # An in-process backend starts empty, so its users are never written to disk
+        tester.user_pool = UserPool(
+            args.user_pool,
+            path=None if backend is not None else USER_POOL_FILE,
+            api_base=API_BASE,
+            session_factory=tester.new_session,
+        ).ensure()
+
+    try:
+        passed, total = tester.run_all_tests(parallel=args.parallel)
+    finally:
+        sink.close()
+        transport.close()
+        if session is not None:
+            session.close()
+    if retry is not None:
+        summary = retry.summary()
+        print(f"Retries: {summary['retries']} over {summary['requests']} requests, gave up {summary['gave_up']}")
     
     # Exit with appropriate code
-    exit(0 if passed == total else 1)
\ No newline at end of file
+    exit(0 if passed == total else 1)
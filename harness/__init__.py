@@ -0,0 +1,14 @@
+"""
+Load and performance harness for the SvenskPå3 backend API
+Shared by backend_test.py and simple_backend_test.py
+"""
+
+import os
+
+# Get base URL from environment
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE = f"{BASE_URL}/api"
+
+# Mirrors the constants of the same name in app/api/[[...path]]/route.js
+DAILY_XP_PER_LESSON = 10
+MAX_DAILY_LESSONS = 20
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Per-route latency benchmarks with a statistical regression gate
+Every route in app/api/[[...path]]/route.js is timed sequentially; a baseline
+run stores the raw samples and later runs are compared against them with a
+one-sided Mann-Whitney U test plus bootstrap confidence intervals on the
+p50/p95 ratios, rather than a comparison of means.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from datetime import datetime, timezone
+
+from harness import API_BASE, MAX_DAILY_LESSONS
+
+BENCH_BASELINE = os.getenv('BENCH_BASELINE', 'bench_baseline.json')
+BENCH_OUTPUT = 'bench_output.txt'
+BENCH_PASSWORD = "BenchPassword123!"
+GATED_PERCENTILES = (50, 95)
+
+
+# Statistics
+
+def quantile(samples, pct):
+    """Linear-interpolated percentile of an unsorted sample"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * pct / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def mann_whitney_greater(baseline, candidate):
+    """One-sided p-value that `candidate` is stochastically slower than `baseline`
+
+    Normal approximation with tie and continuity correction, fine for the
+    sample sizes a benchmark run produces (tens and up per side)
+    """
+    n1, n2 = len(baseline), len(candidate)
+    if not n1 or not n2:
+        return 1.0
+    ranked = sorted([(value, 0) for value in baseline] + [(value, 1) for value in candidate])
+    rank_sum = 0.0
+    tie_term = 0
+    index = 0
+    while index < len(ranked):
+        end = index
+        while end + 1 < len(ranked) and ranked[end + 1][0] == ranked[index][0]:
+            end += 1
+        ties = end - index + 1
+        average_rank = (index + end) / 2 + 1
+        rank_sum += average_rank * sum(1 for _, group in ranked[index:end + 1] if group == 1)
+        tie_term += ties ** 3 - ties
+        index = end + 1
+    u = rank_sum - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_ratio(baseline, candidate, pct, resamples=1000, confidence=0.95, rng=None):
+    """(low, high) percentile-bootstrap interval of quantile(candidate) / quantile(baseline)"""
+    rng = rng or random.Random(0)
+    ratios = []
+    for _ in range(resamples):
+        base = quantile(rng.choices(baseline, k=len(baseline)), pct)
+        new = quantile(rng.choices(candidate, k=len(candidate)), pct)
+        ratios.append(new / base if base else math.inf)
+    tail = (1 - confidence) / 2 * 100
+    return quantile(ratios, tail), quantile(ratios, 100 - tail)
+
+
+def compare(baseline, candidate, threshold=0.10, alpha=0.01, min_delta_ms=1.0, rng=None):
+    """Per-percentile verdicts for one endpoint, samples in milliseconds
+
+    A percentile regresses when its ratio's lower confidence bound exceeds
+    1 + threshold and it grew by more than min_delta_ms; p50 additionally
+    needs the Mann-Whitney test to reject "not slower" at `alpha`
+    """
+    p_value = mann_whitney_greater(baseline, candidate)
+    verdicts = []
+    for pct in GATED_PERCENTILES:
+        base, new = quantile(baseline, pct), quantile(candidate, pct)
+        low, high = bootstrap_ratio(baseline, candidate, pct, rng=rng)
+        regressed = low > 1 + threshold and new - base > min_delta_ms
+        if pct == 50:
+            regressed = regressed and p_value < alpha
+        verdicts.append({"pct": pct, "baseline_ms": base, "candidate_ms": new, "ratio_low": low,
+                         "ratio_high": high, "p_value": p_value, "regressed": regressed})
+    return verdicts
+
+
+# Benchmarks
+
+class BenchClient:
+    """Sequential requests.Session driver that hands out fresh signed-in users"""
+
+    def __init__(self, api_base=API_BASE, session_factory=None):
+        self.api_base = api_base
+        self.session_factory = session_factory
+        self.run_id = f"{time.time_ns()}_{os.getpid()}"
+        self.user_ids = iter(range(1 << 62))
+
+    def new_session(self):
+        if self.session_factory is not None:
+            return self.session_factory()
+        import requests
+        return requests.Session()
+
+    def new_email(self):
+        return f"bench_{self.run_id}_{next(self.user_ids)}@example.com"
+
+    def signed_in(self):
+        """(session, email) for a newly signed-up user"""
+        session = self.new_session()
+        email = self.new_email()
+        response = session.post(f"{self.api_base}/auth/signup",
+                                json={"email": email, "password": BENCH_PASSWORD, "displayName": "Bench User"})
+        if response.status_code != 200:
+            raise RuntimeError(f"Signup failed with {response.status_code}: {response.text[:200]}")
+        return session, email
+
+    def timed(self, session, method, endpoint, data=None):
+        start = time.perf_counter()
+        response = session.request(method, f"{self.api_base}/{endpoint}", json=data)
+        elapsed = time.perf_counter() - start
+        return response.status_code, elapsed * 1000
+
+
+def bench_signup(client):
+    session = client.new_session()
+    while True:
+        yield client.timed(session, 'POST', 'auth/signup',
+                           {"email": client.new_email(), "password": BENCH_PASSWORD, "displayName": "Bench User"})
+
+
+def bench_signin(client):
+    session, email = client.signed_in()
+    while True:
+        yield client.timed(session, 'POST', 'auth/signin', {"email": email, "password": BENCH_PASSWORD})
+
+
+def bench_authenticated(method, endpoint, data=None):
+    def bench(client):
+        session, _ = client.signed_in()
+        while True:
+            yield client.timed(session, method, endpoint, data)
+    return bench
+
+
+def bench_complete_lesson(client):
+    # The daily cap would turn later iterations into 400s, so rotate users (untimed)
+    while True:
+        session, _ = client.signed_in()
+        for _ in range(MAX_DAILY_LESSONS):
+            yield client.timed(session, 'POST', 'progress', {})
+
+
+def bench_logout(client):
+    while True:
+        session, _ = client.signed_in()
+        yield client.timed(session, 'POST', 'auth/logout')
+
+
+def bench_contact(client):
+    session = client.new_session()
+    while True:
+        yield client.timed(session, 'POST', 'contact',
+                           {"email": "bench@example.com", "message": "Benchmark message from the harness"})
+
+
+def bench_webhook(client):
+    session = client.new_session()
+    while True:
+        yield client.timed(session, 'POST', 'stripe/webhook', {"type": "customer.subscription.updated"})
+
+
+# (name, generator of (status, elapsed ms), expected status)
+BENCHMARKS = (
+    ('POST auth/signup', bench_signup, 200),
+    ('POST auth/signin', bench_signin, 200),
+    ('GET auth/me', bench_authenticated('GET', 'auth/me'), 200),
+    ('POST auth/logout', bench_logout, 200),
+    ('GET profile', bench_authenticated('GET', 'profile'), 200),
+    ('PUT profile', bench_authenticated('PUT', 'profile', {"displayName": "Bench Updated", "goal": "Jobb"}), 200),
+    ('GET progress', bench_authenticated('GET', 'progress'), 200),
+    ('POST progress', bench_complete_lesson, 200),
+    ('POST contact', bench_contact, 200),
+    ('POST stripe/checkout', bench_authenticated('POST', 'stripe/checkout', {"plan": "pro"}), 501),
+    ('POST stripe/webhook', bench_webhook, 200),
+)
+
+
+def selected(only=None):
+    """Names of the benchmarks matching any of the `only` substrings, all of them without"""
+    return [name for name, _, _ in BENCHMARKS if not only or any(part in name for part in only)]
+
+
+def run_benchmarks(client, iterations=200, warmup=20, only=None, report=print):
+    """({name: [elapsed ms, ...]}, {name: error}); a benchmark whose status is unexpected fails"""
+    results = {}
+    failed = {}
+    names = selected(only)
+    for name, bench, expected in BENCHMARKS:
+        if name not in names:
+            continue
+        samples = []
+        try:
+            for index, (status, elapsed) in enumerate(bench(client)):
+                if status != expected:
+                    raise RuntimeError(f"status {status}, expected {expected}")
+                if index >= warmup:
+                    samples.append(elapsed)
+                if len(samples) >= iterations:
+                    break
+        except Exception as error:
+            report(f"⚠️  {name}: {error}")
+            failed[name] = str(error)
+            continue
+        results[name] = samples
+    return results, failed
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def save_baseline(path, results, **extra):
+    document = {
+        **extra,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "endpoints": {name: {"samples_ms": [round(s, 4) for s in samples]} for name, samples in results.items()},
+    }
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(document, handle, indent=1)
+
+
+def gate(baseline, results, threshold=0.10, alpha=0.01, min_delta_ms=1.0, names=None, report=print):
+    """Compare a run with a baseline document, returns the regressed endpoint names
+
+    `names` are the routes this run was meant to cover (default: the run's and
+    the baseline's); one without a result or without a baseline counts as regressed
+    """
+    rng = random.Random(0)
+    regressed = []
+    endpoints = baseline.get('endpoints', {})
+    if names is None:
+        names = list(results) + [name for name in endpoints if name not in results]
+    report(f"{'Endpoint':<24}{'pct':>5}{'base ms':>10}{'new ms':>10}{'ratio 95% CI':>18}{'MW p':>10}  verdict")
+    report("-" * 90)
+    for name in names:
+        samples = results.get(name)
+        stored = endpoints.get(name)
+        if not samples:
+            report(f"{name:<24}{'':>5}{'':>10}{'':>10}{'':>18}{'':>10}  ❌ NO RESULT")
+            regressed.append(name)
+            continue
+        if not stored:
+            report(f"{name:<24}{'':>5}{'':>10}{quantile(samples, 50):>10.2f}{'':>18}{'':>10}  ❌ NO BASELINE")
+            regressed.append(name)
+            continue
+        for verdict in compare(stored['samples_ms'], samples, threshold, alpha, min_delta_ms, rng):
+            interval = f"{verdict['ratio_low']:.2f}-{verdict['ratio_high']:.2f}"
+            label = "❌ REGRESSED" if verdict['regressed'] else "✅ ok"
+            report(f"{name:<24}{'p' + str(verdict['pct']):>5}{verdict['baseline_ms']:>10.2f}"
+                   f"{verdict['candidate_ms']:>10.2f}{interval:>18}{verdict['p_value']:>10.4f}  {label}")
+            if verdict['regressed'] and name not in regressed:
+                regressed.append(name)
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every SvenskPå3 API route against a stored baseline")
+    parser.add_argument('--iterations', type=int, default=200, help="timed requests per route")
+    parser.add_argument('--warmup', type=int, default=20, help="untimed requests per route first")
+    parser.add_argument('--baseline', default=BENCH_BASELINE, help="baseline file to compare with or save to")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed p50/p95 slowdown, 0.10 = 10%%")
+    parser.add_argument('--alpha', type=float, default=0.01, help="significance level of the Mann-Whitney test")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help="ignore slowdowns smaller than this")
+    parser.add_argument('--only', default='', help="comma-separated substrings of route names to run")
+    parser.add_argument('--output', default=BENCH_OUTPUT, help="also write the report here")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--in-process', action='store_true', help="benchmark the Python backend stand-in")
+    args = parser.parse_args(argv)
+
+    session_factory = None
+    if args.in_process:
+        import requests
+
+        from harness.fake_backend import InMemoryBackend, install
+        backend = InMemoryBackend()
+
+        def session_factory():
+            return install(requests.Session(), backend, args.api_base.rsplit('/api', 1)[0])
+
+    lines = []
+
+    def report(line=""):
+        print(line)
+        lines.append(line)
+
+    target = 'in-process' if args.in_process else args.api_base
+    report("⏱️  SvenskPå3 API Benchmarks")
+    report(f"API Base: {target}, Iterations: {args.iterations}, Warmup: {args.warmup}")
+    report()
+    client = BenchClient(args.api_base, session_factory)
+    only = [part.strip() for part in args.only.split(',') if part.strip()]
+    results, failed = run_benchmarks(client, args.iterations, args.warmup, only, report)
+
+    regressed = []
+    if args.save_baseline and failed:
+        report()
+        report(f"⚠️  Not writing {args.baseline}: {len(failed)} route(s) failed: {', '.join(failed)}")
+        regressed = list(failed)
+    elif args.save_baseline:
+        save_baseline(args.baseline, results, api_base=target, iterations=args.iterations)
+        for name, samples in results.items():
+            report(f"{name:<24} p50={quantile(samples, 50):.2f}ms p95={quantile(samples, 95):.2f}ms")
+        report()
+        report(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        baseline = load_baseline(args.baseline)
+        report(f"Baseline: {args.baseline} ({baseline.get('created', 'unknown date')}, {baseline.get('api_base')})")
+        report()
+        regressed = gate(baseline, results, args.threshold, args.alpha, args.min_delta_ms, selected(only), report)
+        report()
+        if regressed:
+            report(f"⚠️  {len(regressed)} route(s) failed or regressed beyond {args.threshold:.0%}: "
+                   f"{', '.join(regressed)}")
+        else:
+            report("🎉 No significant regressions")
+    else:
+        report(f"No baseline at {args.baseline}; run with --save-baseline first")
+        regressed = list(failed)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(lines) + '\n')
+    return regressed
+
+
+if __name__ == "__main__":
+    exit(1 if main() else 0)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Cold-start and first-request benchmark
+Boots the app from scratch, waits for the port to accept connections, then
+hits every route in the GET/POST/PUT dispatchers once (paying lazy Mongo
+connects and, under `next dev`, route compilation) before timing warm calls.
+Authenticated routes sign a user up first; that signup is timed separately as
+setup, since it reaches the server before the route's own first request.
+Only the first route after a boot is truly cold, so the route order rotates
+between runs (or, with --per-route, every route gets its own boot) and cold
+figures come only from boots a route went first in. Repeated runs give
+distributions of time-to-first-success per route.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import time
+from urllib.parse import urlsplit
+
+from harness import BASE_URL
+from harness.bench import BENCHMARKS, BenchClient, quantile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(command, cwd=ROOT, env=None, log_path=os.devnull):
+    """Spawn `command` in its own process group so the whole tree can be stopped"""
+    with open(log_path, 'ab') as log:
+        return subprocess.Popen(shlex.split(command), cwd=cwd, env={**os.environ, **(env or {})}, stdout=log,
+                                stderr=subprocess.STDOUT, start_new_session=True)
+
+
+def stop_server(process, timeout=10.0):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+def wait_listening(base_url, process, timeout=120.0, interval=0.05):
+    """Seconds until the port accepts TCP connections; no HTTP request, so nothing gets compiled early"""
+    parts = urlsplit(base_url)
+    address = (parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} before listening")
+        try:
+            with socket.create_connection(address, timeout=interval):
+                return time.perf_counter() - started
+        except OSError:
+            time.sleep(interval)
+    raise TimeoutError(f"{base_url} not listening after {timeout:.0f}s")
+
+
+def route_orders(runs, per_route=False):
+    """BENCHMARKS entries to hit after each boot
+
+    Only the first route after a boot pays the lazy Mongo connect and, under
+    `next dev`, compilation. So the order rotates from run to run, and with
+    `per_route` every route gets a boot of its own in every run.
+    """
+    if per_route:
+        return [[entry] for _ in range(runs) for entry in BENCHMARKS]
+    return [list(BENCHMARKS[index % len(BENCHMARKS):] + BENCHMARKS[:index % len(BENCHMARKS)])
+            for index in range(runs)]
+
+
+def cold_run(command, base_url, warm=20, first_timeout=120.0, env=None, log_path=os.devnull, routes=BENCHMARKS):
+    """One boot hitting `routes` in order: {'listening_s': .., 'first_route': name, 'routes': {name:
+    {'first_success_s', 'setup_ms', 'first_ms', 'attempts', 'warm_ms', 'warm_errors'}}}"""
+    spawned = time.perf_counter()
+    process = start_server(command, env=env, log_path=log_path)
+    try:
+        result = {"listening_s": wait_listening(base_url, process, first_timeout), "first_route": routes[0][0],
+                  "routes": {}}
+        client = BenchClient(f"{base_url.rstrip('/')}/api")
+        # Pay the client's lazy requests import now rather than in the first route's setup
+        client.new_session().close()
+        for name, bench, expected in routes:
+            attempts = 0
+            deadline = time.perf_counter() + first_timeout
+            # A route can 500 while the DB connection or compilation is still settling; retry until it succeeds
+            while True:
+                attempts += 1
+                started = time.perf_counter()
+                try:
+                    runner = bench(client)
+                    status, first_ms = next(runner)
+                except Exception:
+                    status, first_ms, runner = None, 0.0, None
+                # Whatever next() spent beyond the timed request went on setup, i.e. the signup
+                setup_ms = max(0.0, (time.perf_counter() - started) * 1000 - first_ms)
+                if status == expected:
+                    break
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f"{name} never returned {expected} (last status {status})")
+                time.sleep(0.2)
+            first_success = time.perf_counter() - spawned
+            warm_runs = list(zip(range(warm), runner))
+            warm_samples = [elapsed for _, (status, elapsed) in warm_runs if status == expected]
+            result["routes"][name] = {"first_success_s": first_success, "setup_ms": setup_ms, "first_ms": first_ms,
+                                      "attempts": attempts, "warm_ms": warm_samples,
+                                      "warm_errors": len(warm_runs) - len(warm_samples)}
+        return result
+    finally:
+        stop_server(process)
+
+
+def summarize(runs):
+    """Per-route distributions across runs; `cold_ms` only counts boots the route went first in"""
+    rows = [{
+        "route": "(listening)",
+        "first_success_s": [run['listening_s'] for run in runs],
+        "setup_ms": [],
+        "first_ms": [],
+        "cold_ms": [],
+        "warm_ms": [],
+        "warm_errors": 0,
+        "attempts": [],
+    }]
+    for name, _, _ in BENCHMARKS:
+        per_run = [(run['first_route'] == name, run['routes'][name]) for run in runs if name in run['routes']]
+        rows.append({
+            "route": name,
+            "first_success_s": [r['first_success_s'] for _, r in per_run],
+            "setup_ms": [r['setup_ms'] for _, r in per_run],
+            "first_ms": [r['first_ms'] for _, r in per_run],
+            # The setup signup of an authenticated route is what reaches the cold server first
+            "cold_ms": [r['setup_ms'] + r['first_ms'] for first, r in per_run if first],
+            "warm_ms": [sample for _, r in per_run for sample in r['warm_ms']],
+            "warm_errors": sum(r['warm_errors'] for _, r in per_run),
+            "attempts": [r['attempts'] for _, r in per_run],
+        })
+    return rows
+
+
+def print_summary(rows):
+    print(f"{'Route':<24}{'Runs':>5}{'ready p50 s':>13}{'ready max s':>13}{'setup p50':>11}{'first p50':>11}"
+          f"{'cold n':>8}{'cold p50':>10}{'warm p50':>10}{'cold/warm':>11}{'warm err':>10}")
+    print("-" * 126)
+    for row in rows:
+        ready = row['first_success_s']
+        if not ready:
+            continue
+        first, cold, warm = row['first_ms'], row['cold_ms'], row['warm_ms']
+        warm_p50 = quantile(warm, 50) if warm else 0.0
+        ratio = f"{quantile(cold, 50) / warm_p50:.1f}x" if cold and warm_p50 else ''
+        cold_p50 = f"{quantile(cold, 50):.1f}" if cold else '-'
+        print(f"{row['route']:<24}{len(ready):>5}{quantile(ready, 50):>13.2f}{max(ready):>13.2f}"
+              + (f"{quantile(row['setup_ms'], 50):>11.1f}{quantile(first, 50):>11.1f}{len(cold):>8}{cold_p50:>10}"
+                 f"{warm_p50:>10.1f}{ratio:>11}{row['warm_errors']:>10}" if first else ''))
+    print()
+    print("ready = seconds from spawn until the first success; setup (the signup before authenticated routes), "
+          "first and warm (expected status only) in ms")
+    print("cold = setup + first over the boots where the route went first; later routes find the DB connected "
+          "and the route compiled, so their first is not cold (use --per-route for a cold sample every run)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Boot the app repeatedly and time its first requests per route")
+    parser.add_argument('--command', default='yarn start',
+                        help="server command run from the repo root, e.g. 'yarn dev' to include compilation")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--runs', type=int, default=5, help="cold boots to measure")
+    parser.add_argument('--per-route', action='store_true',
+                        help="boot once per route in every run, so each route is measured cold")
+    parser.add_argument('--warm', type=int, default=20, help="warm requests per route after the first success")
+    parser.add_argument('--timeout', type=float, default=120.0, help="seconds to wait for listening / each route")
+    parser.add_argument('--log', default=os.devnull, help="append server output to this file")
+    parser.add_argument('--json', metavar='PATH', help="write raw runs and summaries to PATH")
+    args = parser.parse_args(argv)
+
+    print("🧊 SvenskPå3 Cold-Start Benchmark")
+    print(f"Command: {args.command}, Base URL: {args.base_url}, Runs: {args.runs}"
+          f"{', one boot per route' if args.per_route else ''}")
+    print()
+
+    runs = []
+    for index, routes in enumerate(route_orders(args.runs, args.per_route)):
+        run = cold_run(args.command, args.base_url, args.warm, args.timeout, log_path=args.log, routes=routes)
+        runs.append(run)
+        first = run['routes'][run['first_route']]
+        print(f"   Boot {index + 1}: listening after {run['listening_s']:.2f}s, all routes warm after "
+              f"{max(r['first_success_s'] for r in run['routes'].values()):.2f}s, "
+              f"first route {run['first_route']} {first['setup_ms'] + first['first_ms']:.0f}ms")
+    print()
+    rows = summarize(runs)
+    print_summary(rows)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as handle:
+            json.dump({"command": args.command, "per_route": args.per_route, "runs": runs, "summary": rows},
+                      handle, indent=2)
+    return rows
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,671 @@
+"""
+In-memory stand-in for app/api/[[...path]]/route.js
+Follows the same routes, status codes, Norwegian error strings, `token` cookie,
+MAX_DAILY_LESSONS cap and streakAfter logic, without Node, MongoDB or bcrypt.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import io
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from harness import DAILY_XP_PER_LESSON, MAX_DAILY_LESSONS
+
+ALLOWED_SCENARIOS = ['butikk', 'jobb', 'telefon', 'lege', 'reise', 'mat', 'bolig', 'survival']
+ALLOWED_LEVELS = ['beginner', 'intermediate', 'advanced']
+TOKEN_MAX_AGE = 60 * 60 * 24 * 7
+
+UNAUTHORIZED = {"error": "Ikke autorisert"}
+USER_NOT_FOUND = {"error": "Bruker ikke funnet"}
+SERVER_ERROR = {"error": "Noe gikk galt"}
+NOT_FOUND = {"error": "Not found"}
+REVALIDATE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "Cookie"}
+
+
+def _b64url(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def _b64url_decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _object_id():
+    return uuid.uuid4().hex[:24]
+
+
+def _iso(moment):
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.') + f"{moment.microsecond // 1000:03d}Z"
+
+
+def create_token(user_id, secret, now=None):
+    """HS256 JWT with the same payload shape as jsonwebtoken's sign({ userId }, ..., { expiresIn: '7d' })"""
+    issued = int(now if now is not None else time.time())
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(',', ':')).encode())
+    payload = _b64url(json.dumps({"userId": user_id, "iat": issued, "exp": issued + TOKEN_MAX_AGE},
+                                 separators=(',', ':')).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+def decode_token(token, secret=None, now=None):
+    """Return the token payload, or None when malformed, badly signed or expired"""
+    try:
+        header, payload, signature = token.split('.')
+        if secret is not None:
+            expected = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+            if not hmac.compare_digest(_b64url(expected), signature):
+                return None
+        claims = json.loads(_b64url_decode(payload))
+    except Exception:
+        return None
+    if claims.get('exp', 0) <= (now if now is not None else time.time()):
+        return None
+    return claims
+
+
+def sanitize_display_name(name, fallback):
+    candidate = (name or fallback or '').strip()
+    return candidate[:80] or fallback
+
+
+def validate_profile_payload(updates, user_plan):
+    errors = []
+    validated = {}
+
+    if 'displayName' in updates:
+        if not isinstance(updates['displayName'], str):
+            errors.append('displayName must be a string')
+        else:
+            validated['displayName'] = sanitize_display_name(updates['displayName'], '')
+
+    if 'level' in updates:
+        if updates['level'] not in ALLOWED_LEVELS:
+            errors.append('Ugyldig nivå')
+        else:
+            validated['level'] = updates['level']
+
+    if 'goal' in updates:
+        if not isinstance(updates['goal'], str):
+            errors.append('goal must be a string')
+        elif len(updates['goal']) > 200:
+            errors.append('Målet må være under 200 tegn')
+        else:
+            validated['goal'] = updates['goal'].strip()
+
+    if 'scenarios' in updates:
+        if not isinstance(updates['scenarios'], list):
+            errors.append('scenarios må være en liste')
+        else:
+            unique_scenarios = list(dict.fromkeys(updates['scenarios']))
+            if any(s not in ALLOWED_SCENARIOS for s in unique_scenarios):
+                errors.append('Ugyldig scenario valgt')
+            elif user_plan == 'free' and len(unique_scenarios) > 2:
+                errors.append('Basic-planen tillater maks 2 scenarioer')
+            else:
+                validated['scenarios'] = unique_scenarios
+
+    return errors, validated
+
+
+class Response:
+    """Status, JSON body, cookies and extra headers produced by a handler"""
+
+    def __init__(self, body, status=200, cookies=None, headers=None):
+        self.body = body
+        self.status = status
+        self.cookies = cookies or {}
+        self.headers = headers or {}
+
+    def set_cookie_headers(self):
+        headers = []
+        for name, value in self.cookies.items():
+            if value is None:
+                headers.append(f"{name}=; Path=/; Expires=Thu, 01 Jan 1970 00:00:00 GMT")
+            else:
+                headers.append(f"{name}={value}; Path=/; Max-Age={TOKEN_MAX_AGE}; HttpOnly; SameSite=lax")
+        return headers
+
+
+class InMemoryBackend:
+    """Python port of the GET/POST/PUT dispatchers in app/api/[[...path]]/route.js"""
+
+    def __init__(self, secret=None, clock=None, server_timing=None, test_clock=None):
+        self.secret = secret or os.getenv('JWT_SECRET', 'in-process-jwt-secret')
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        # Mirrors route.js's SERVER_TIMING=1 switch
+        self.server_timing = os.getenv('SERVER_TIMING') == '1' if server_timing is None else server_timing
+        self._phases = None
+        # Mirrors route.js's ALLOW_TEST_CLOCK=1 X-Test-Now override
+        self.test_clock = os.getenv('ALLOW_TEST_CLOCK') == '1' if test_clock is None else test_clock
+        self._request_now = None
+        self._if_none_match = None
+        self.users = {}
+        self.users_by_email = {}
+        self.daily_progress = {}
+        self.contact_messages = []
+        self.lock = threading.Lock()
+
+    # Helpers
+
+    def _now(self):
+        """Request time for date-based progress logic, honouring X-Test-Now"""
+        return self._request_now or self.clock()
+
+    def _day(self, days_ago=0):
+        return (self._now() - timedelta(days=days_ago)).date().isoformat()
+
+    @contextmanager
+    def _timed(self, name):
+        """Add the block's duration to phase `name` of the current request's Server-Timing"""
+        if self._phases is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration, count = self._phases.get(name, (0.0, 0))
+            self._phases[name] = (duration + (time.perf_counter() - start) * 1000, count + 1)
+
+    def _hash_password(self, password):
+        salt = os.urandom(8).hex()
+        return f"{salt}${hashlib.sha256((salt + password).encode()).hexdigest()}"
+
+    def _check_password(self, password, hashed):
+        salt, digest = hashed.split('$', 1)
+        return hmac.compare_digest(hashlib.sha256((salt + password).encode()).hexdigest(), digest)
+
+    def _verify(self, cookies):
+        token = cookies.get('token')
+        if not token:
+            return None
+        with self._timed('jwt'):
+            return decode_token(token, self.secret, self.clock().timestamp())
+
+    def _auth_response(self, user):
+        with self._timed('jwt'):
+            token = create_token(user['_id'], self.secret, self.clock().timestamp())
+        return Response({
+            "success": True,
+            "user": {"id": user['_id'], "email": user['email'], "displayName": user['displayName']}
+        }, cookies={'token': token})
+
+    def _progress_for_user(self, user_id):
+        return self.daily_progress.setdefault(user_id, {})
+
+    def _conditional(self, etag, body):
+        """304 when If-None-Match already names `etag`, otherwise `body` with the validator"""
+        headers = {"ETag": etag, **REVALIDATE_HEADERS}
+        if etag_matches(self._if_none_match, etag):
+            return Response(None, 304, headers=headers)
+        return Response(body, headers=headers)
+
+    # Dispatch
+
+    def handle(self, method, path, body=None, cookies=None, headers=None):
+        """Route one request, `body` is the raw request bytes or an already-decoded object"""
+        cookies = cookies or {}
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        request_now = parse_test_now(headers.get('x-test-now')) if self.test_clock else None
+        routes = {
+            'GET': {
+                'auth/me': self.handle_get_me,
+                'profile': self.handle_get_profile,
+                'progress': self.handle_get_progress,
+            },
+            'POST': {
+                'auth/signup': self.handle_signup,
+                'auth/signin': self.handle_signin,
+                'auth/logout': self.handle_logout,
+                'progress': self.handle_complete_lesson,
+                'contact': self.handle_contact,
+                'stripe/checkout': self.handle_stripe_checkout,
+                'stripe/webhook': self.handle_stripe_webhook,
+            },
+            'PUT': {
+                'profile': self.handle_update_profile,
+            },
+        }
+        handler = routes.get(method.upper(), {}).get(path.strip('/'))
+        if handler is None:
+            return Response(NOT_FOUND, 404)
+
+        def read_json():
+            with self._timed('parse'):
+                if isinstance(body, (bytes, bytearray, str)):
+                    return json.loads(body)
+                if body is None:
+                    raise ValueError("Unexpected end of JSON input")
+                return body
+
+        try:
+            with self.lock:
+                self._request_now = request_now
+                self._if_none_match = headers.get('if-none-match')
+                if not self.server_timing:
+                    return handler(read_json, cookies)
+                self._phases = {}
+                start = time.perf_counter()
+                try:
+                    response = handler(read_json, cookies)
+                    total = (time.perf_counter() - start) * 1000
+                    entries = [f'{name};dur={duration:.2f};desc="{count}x"'
+                               for name, (duration, count) in self._phases.items()]
+                    measured = sum(duration for duration, _ in self._phases.values())
+                    entries += [f"app;dur={max(0.0, total - measured):.2f}", f"total;dur={total:.2f}"]
+                    response.headers['Server-Timing'] = ', '.join(entries)
+                    return response
+                finally:
+                    self._phases = None
+        except Exception:
+            return Response(SERVER_ERROR, 500)
+
+    # POST /api/auth/signup
+    def handle_signup(self, read_json, cookies):
+        payload = read_json()
+        email, password = payload.get('email'), payload.get('password')
+        normalized_email = (email or '').strip().lower()
+
+        if not normalized_email or not password:
+            return Response({"error": "Email og passord er påkrevd"}, 400)
+        if len(password) < 8:
+            return Response({"error": "Passordet må være minst 8 tegn"}, 400)
+        if normalized_email in self.users_by_email:
+            return Response({"error": "E-post er allerede registrert"}, 400)
+
+        with self._timed('bcrypt'):
+            hashed_password = self._hash_password(password)
+        user = {
+            "_id": _object_id(),
+            "email": normalized_email,
+            "password": hashed_password,
+            "displayName": sanitize_display_name(payload.get('displayName'), normalized_email.split('@')[0]),
+            "level": 'beginner',
+            "goal": '',
+            "scenarios": ['survival', 'butikk'],
+            "plan": 'free',
+            "createdAt": _iso(self.clock()),
+        }
+        self.users[user['_id']] = user
+        self.users_by_email[normalized_email] = user
+        return self._auth_response(user)
+
+    # POST /api/auth/signin
+    def handle_signin(self, read_json, cookies):
+        payload = read_json()
+        email, password = payload.get('email'), payload.get('password')
+
+        if not email or not password:
+            return Response({"error": "Email og passord er påkrevd"}, 400)
+
+        user = self.users_by_email.get(email.lower())
+        if not user:
+            return Response({"error": "Ugyldig e-post eller passord"}, 401)
+        with self._timed('bcrypt'):
+            valid_password = self._check_password(password, user['password'])
+        if not valid_password:
+            return Response({"error": "Ugyldig e-post eller passord"}, 401)
+        return self._auth_response(user)
+
+    # GET /api/auth/me
+    def handle_get_me(self, read_json, cookies):
+        decoded = self._verify(cookies)
+        if not decoded:
+            return Response(UNAUTHORIZED, 401)
+        user = self.users.get(decoded['userId'])
+        if not user:
+            return Response(USER_NOT_FOUND, 404)
+        body = {
+            "id": user['_id'],
+            "email": user['email'],
+            "displayName": user['displayName'],
+            "level": user['level'],
+            "goal": user['goal'],
+            "scenarios": user['scenarios'],
+            "plan": user['plan'],
+        }
+        return self._conditional(body_etag(body), body)
+
+    # POST /api/auth/logout
+    def handle_logout(self, read_json, cookies):
+        return Response({"success": True}, cookies={'token': None})
+
+    # GET /api/profile
+    def handle_get_profile(self, read_json, cookies):
+        decoded = self._verify(cookies)
+        if not decoded:
+            return Response(UNAUTHORIZED, 401)
+        user = self.users.get(decoded['userId'])
+        if not user:
+            return Response(USER_NOT_FOUND, 404)
+        body = {key: user[key] for key in ('displayName', 'level', 'goal', 'scenarios', 'plan')}
+        return self._conditional(body_etag(body), body)
+
+    # PUT /api/profile
+    def handle_update_profile(self, read_json, cookies):
+        decoded = self._verify(cookies)
+        if not decoded:
+            return Response(UNAUTHORIZED, 401)
+        updates = read_json()
+        user = self.users.get(decoded['userId'])
+        if not user:
+            return Response(USER_NOT_FOUND, 404)
+
+        errors, validated = validate_profile_payload(updates, user['plan'])
+        if errors:
+            return Response({"error": '. '.join(errors)}, 400)
+        user.update(validated)
+        return Response({"success": True})
+
+    # GET /api/progress
+    def handle_get_progress(self, read_json, cookies):
+        decoded = self._verify(cookies)
+        if not decoded:
+            return Response(UNAUTHORIZED, 401)
+
+        user_progress = self._progress_for_user(decoded['userId'])
+        today, yesterday = self._day(0), self._day(1)
+        etag = progress_etag(today, user_progress[max(user_progress)] if user_progress else None)
+        if etag_matches(self._if_none_match, etag):
+            return self._conditional(etag, None)
+
+        since = self._day(30)
+        progress = sorted(
+            (dict(doc) for date, doc in user_progress.items() if date >= since),
+            key=lambda doc: doc['date'],
+            reverse=True,
+        )
+
+        today_progress = next((p for p in progress if p['date'] == today), None)
+        yesterday_progress = next((p for p in progress if p['date'] == yesterday), None)
+
+        current_streak = 0
+        if today_progress and today_progress.get('completed'):
+            current_streak = today_progress['streakAfter']
+        elif yesterday_progress and yesterday_progress.get('completed'):
+            current_streak = yesterday_progress['streakAfter']
+
+        completed_lessons_today = (today_progress or {}).get('completionsCount') or 0
+        return self._conditional(etag, {
+            "progress": progress,
+            "currentStreak": current_streak,
+            "totalXP": sum(p.get('xpEarned') or 0 for p in progress),
+            "completedToday": completed_lessons_today >= MAX_DAILY_LESSONS,
+            "completedLessonsToday": completed_lessons_today,
+            "maxDailyLessons": MAX_DAILY_LESSONS,
+        })
+
+    # POST /api/progress
+    def handle_complete_lesson(self, read_json, cookies):
+        decoded = self._verify(cookies)
+        if not decoded:
+            return Response(UNAUTHORIZED, 401)
+
+        user_progress = self._progress_for_user(decoded['userId'])
+        today, yesterday = self._day(0), self._day(1)
+        today_progress = user_progress.get(today)
+
+        if today_progress and today_progress['completionsCount'] >= MAX_DAILY_LESSONS:
+            return Response({"error": "Dagens maks antall oppgaver er nådd"}, 400)
+
+        yesterday_progress = user_progress.get(yesterday)
+        if today_progress is None:
+            new_streak = yesterday_progress['streakAfter'] + 1 if yesterday_progress and yesterday_progress.get('completed') else 1
+        else:
+            new_streak = today_progress['streakAfter']
+
+        now = _iso(self._now())
+        updated = {
+            "_id": (today_progress or {}).get('_id') or _object_id(),
+            "userId": decoded['userId'],
+            "date": today,
+            "xpEarned": (today_progress or {}).get('xpEarned', 0) + DAILY_XP_PER_LESSON,
+            "completed": True,
+            "streakAfter": new_streak,
+            "completionsCount": (today_progress or {}).get('completionsCount', 0) + 1,
+            "completedAt": now,
+            "lastCompletionAt": now,
+        }
+        user_progress[today] = updated
+
+        return Response({
+            "success": True,
+            "streak": new_streak,
+            "xpEarned": DAILY_XP_PER_LESSON,
+            "completionsCount": updated['completionsCount'],
+            "maxDailyLessons": MAX_DAILY_LESSONS,
+            "totalXpToday": updated['xpEarned'],
+        })
+
+    # POST /api/contact
+    def handle_contact(self, read_json, cookies):
+        payload = read_json()
+        if not payload.get('email') or not payload.get('message'):
+            return Response({"error": "E-post og melding er påkrevd"}, 400)
+        self.contact_messages.append({
+            "_id": _object_id(),
+            "email": payload['email'],
+            "message": payload['message'],
+            "createdAt": _iso(self.clock()),
+        })
+        return Response({"success": True})
+
+    # POST /api/stripe/checkout
+    def handle_stripe_checkout(self, read_json, cookies):
+        if not self._verify(cookies):
+            return Response(UNAUTHORIZED, 401)
+        read_json()
+        return Response({"error": "Stripe ikke konfigurert. Legg til STRIPE_SECRET_KEY i .env"}, 501)
+
+    # POST /api/stripe/webhook
+    def handle_stripe_webhook(self, read_json, cookies):
+        return Response({"received": True})
+
+
+def parse_test_now(value):
+    """X-Test-Now header (ISO timestamp or epoch milliseconds) as an aware datetime, None if unusable"""
+    if not value:
+        return None
+    try:
+        if value.isdigit():
+            return datetime.fromtimestamp(int(value) / 1000, timezone.utc)
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    except (ValueError, OverflowError):
+        return None
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match weak comparison, as isNotModified in route.js"""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix('W/')
+    return any(tag.strip() == '*' or tag.strip().removeprefix('W/') == opaque for tag in if_none_match.split(','))
+
+
+def body_etag(body):
+    """Strong ETag over the JSON.stringify form of `body`"""
+    serialized = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return f'"{_b64url(hashlib.sha1(serialized).digest())}"'
+
+
+def progress_etag(today, latest):
+    """Weak validator from today's date and the user's latest daily_progress document"""
+    if latest is None:
+        return f'W/"{today}.none"'
+    completed = latest.get('lastCompletionAt')
+    millis = int(datetime.fromisoformat(completed.replace('Z', '+00:00')).timestamp() * 1000) if completed else 0
+    return f'W/"{today}.{latest["date"]}.{latest.get("completionsCount") or 0}.{millis}"'
+
+
+def _split_api_path(path):
+    """'/api/auth/me?x=1' -> 'auth/me'"""
+    path = path.split('?', 1)[0]
+    prefix = '/api/'
+    return path[len(prefix):] if path.startswith(prefix) else None
+
+
+def make_requests_adapter(backend):
+    """A requests transport adapter that answers from `backend` instead of opening a socket"""
+    from http.client import HTTPMessage
+    from urllib.parse import urlsplit
+
+    import requests
+    from requests.adapters import BaseAdapter
+    from requests.cookies import extract_cookies_to_jar
+    from requests.structures import CaseInsensitiveDict
+    from urllib3.response import HTTPResponse
+
+    class _OriginalResponse:
+        def __init__(self, headers):
+            self.msg = headers
+
+        def info(self):
+            return self.msg
+
+    class InProcessAdapter(BaseAdapter):
+        def send(self, request, **kwargs):
+            api_path = _split_api_path(urlsplit(request.url).path)
+            cookies = {}
+            for part in (request.headers.get('Cookie') or '').split(';'):
+                if '=' in part:
+                    name, value = part.strip().split('=', 1)
+                    cookies[name] = value
+
+            if api_path is None:
+                result = Response(NOT_FOUND, 404)
+            else:
+                result = backend.handle(request.method, api_path, request.body, cookies, request.headers)
+
+            content = b'' if result.body is None else json.dumps(result.body, ensure_ascii=False).encode('utf-8')
+            message = HTTPMessage()
+            message['Content-Type'] = 'application/json'
+            for name, value in result.headers.items():
+                message[name] = value
+            for header in result.set_cookie_headers():
+                message['Set-Cookie'] = header
+
+            raw = HTTPResponse(
+                body=io.BytesIO(content),
+                headers=dict(message.items()),
+                status=result.status,
+                preload_content=False,
+                original_response=_OriginalResponse(message),
+            )
+            response = requests.Response()
+            response.status_code = result.status
+            response.headers = CaseInsensitiveDict({'Content-Type': 'application/json', **result.headers})
+            response.raw = raw
+            response._content = content
+            response.encoding = 'utf-8'
+            response.url = request.url
+            response.request = request
+            response.connection = self
+            extract_cookies_to_jar(response.cookies, request, raw)
+            return response
+
+        def close(self):
+            pass
+
+    return InProcessAdapter()
+
+
+def install(session, backend, base_url):
+    """Route every request `session` makes under `base_url` to `backend`"""
+    session.mount(base_url, make_requests_adapter(backend))
+    return session
+
+
+def make_http_server(backend, host='127.0.0.1', port=0):
+    """A keep-alive HTTP/1.1 server answering from `backend`, for tools that need a real socket
+
+    Call serve_forever() on it, e.g. from a daemon thread; server_address has the bound port
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _dispatch(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0)) or None
+            cookies = {}
+            for part in (self.headers.get('Cookie') or '').split(';'):
+                if '=' in part:
+                    name, value = part.strip().split('=', 1)
+                    cookies[name] = value
+            api_path = _split_api_path(self.path)
+            if api_path is None:
+                result = Response(NOT_FOUND, 404)
+            else:
+                result = backend.handle(self.command, api_path, body, cookies, dict(self.headers.items()))
+            content = b'' if result.body is None else json.dumps(result.body, ensure_ascii=False).encode('utf-8')
+            self.send_response(result.status)
+            self.send_header('Content-Type', 'application/json')
+            for name, value in result.headers.items():
+                self.send_header(name, value)
+            for header in result.set_cookie_headers():
+                self.send_header('Set-Cookie', header)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_PUT = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def handle_error(self, request, client_address):
+            # Clients and fault proxies hang up mid-response; that is not a server bug
+            if not isinstance(sys.exc_info()[1], ConnectionError):
+                super().handle_error(request, client_address)
+
+    return Server((host, port), Handler)
+
+
+class InProcessAsyncClient:
+    """Drop-in for loadgen.AsyncAPIClient that calls the backend directly"""
+
+    def __init__(self, backend, stats):
+        self.backend = backend
+        self.stats = stats
+        self.cookies = {}
+
+    async def request(self, method, endpoint, data=None):
+        stats = self.stats.endpoint(method, endpoint)
+        # Yield so virtual users interleave the way they would on real I/O
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        try:
+            body = json.dumps(data).encode() if data is not None else None
+            result = self.backend.handle(method, endpoint, body, dict(self.cookies))
+            for name, value in result.cookies.items():
+                if value is None:
+                    self.cookies.pop(name, None)
+                else:
+                    self.cookies[name] = value
+            content = json.dumps(result.body)
+            parsed = json.loads(content)
+            stats.record(result.status, time.perf_counter() - start, len(content))
+            return result.status, parsed or {}
+        except Exception:
+            stats.fail(time.perf_counter() - start)
+            return None, {}
+
+    def set_token(self, token):
+        self.cookies['token'] = token
+
+    async def close(self):
+        pass
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Fault-injecting TCP proxy for degraded-link experiments
+Sits between the harness and the app (or between the app and MongoDB with
+--raw) and, per route, adds latency and jitter, resets connections before the
+request reaches the server or after it has been handled, and caps bandwidth.
+With --sweep it drives harness.loadgen through the proxy once per retry policy
+and compares p99, errors and load amplification.
+"""
+
+import argparse
+import asyncio
+import random
+import socket
+import struct
+import threading
+import time
+
+from harness.fake_backend import _split_api_path
+from harness.retry import parse_duration, parse_policy
+
+CHUNK = 64 * 1024
+
+
+def parse_rate(text):
+    """'64k', '1m' or a bare number of bytes per second"""
+    text = text.strip().lower()
+    scale = {'k': 1024, 'm': 1024 ** 2}.get(text[-1:], 1)
+    return float(text[:-1] if scale > 1 else text) * scale
+
+
+class Fault:
+    """Faults for requests matching `route`: '*', an API path prefix such as 'auth/', or 'METHOD path'
+
+    `reset` is the chance the connection is reset before the request is forwarded,
+    `drop` the chance it is reset once the server has answered
+    """
+
+    def __init__(self, route='*', latency=0.0, jitter=0.0, reset=0.0, drop=0.0, bandwidth=None):
+        self.route = route
+        method, _, path = route.partition(' ') if ' ' in route else ('', '', route)
+        self.method = method.upper() or None
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self.reset = reset
+        self.drop = drop
+        self.bandwidth = bandwidth
+
+    def matches(self, method, path):
+        if self.method is not None and self.method != method:
+            return False
+        return self.path == '*' or (path is not None and path.startswith(self.path))
+
+    def delay(self, rng):
+        return max(0.0, self.latency + (rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0))
+
+
+def parse_fault(spec):
+    """Fault from 'POST progress:latency=200ms,jitter=50ms,reset=0.02,drop=0.01,bandwidth=64k'"""
+    route, _, options = spec.rpartition(':')
+    fault = Fault(route.strip() or '*')
+    for item in filter(None, (part.strip() for part in options.split(','))):
+        name, _, value = item.partition('=')
+        if name in ('latency', 'jitter'):
+            setattr(fault, name, parse_duration(value))
+        elif name in ('reset', 'drop'):
+            setattr(fault, name, float(value))
+        elif name == 'bandwidth':
+            fault.bandwidth = parse_rate(value)
+        else:
+            raise ValueError(f"Unknown fault option: {name}")
+    return fault
+
+
+def _content_length(head):
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            return int(value)
+    return 0
+
+
+def _reset(writer):
+    """Close with a TCP RST rather than a FIN"""
+    sock = writer.get_extra_info('socket')
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        except OSError:
+            pass
+    writer.transport.abort()
+
+
+class FaultProxy:
+    """Forwards connections on `listen` to `upstream`, applying the first Fault that matches each request
+
+    In raw mode (any TCP protocol, e.g. MongoDB) only '*' faults apply: resets at
+    connect, latency per forwarded chunk and drops per response chunk
+    """
+
+    def __init__(self, upstream, faults=(), listen=('127.0.0.1', 0), raw=False, seed=None):
+        self.upstream = upstream
+        self.faults = list(faults)
+        self.listen = listen
+        self.raw = raw
+        self.rng = random.Random(seed)
+        self.stats = {}
+        self.server = None
+        self.port = None
+        self._loop = None
+
+    def fault_for(self, method, path):
+        for fault in self.faults:
+            if fault.matches(method, path):
+                return fault
+        return None
+
+    def _count(self, fault, name, amount=1):
+        counters = self.stats.setdefault(fault.route if fault else '-', dict.fromkeys(
+            ('requests', 'delay_s', 'resets', 'drops', 'throttle_s'), 0))
+        counters[name] += amount
+
+    async def _sleep(self, fault, name, seconds):
+        if seconds > 0:
+            self._count(fault, name, seconds)
+            await asyncio.sleep(seconds)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, *self.listen)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def start_in_thread(self):
+        """Serve from a daemon thread's event loop, for blocking or separately-looped clients"""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=serve, daemon=True).start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    async def _handle(self, client_reader, client_writer):
+        state = {'fault': self.fault_for(None, None) if self.raw else None, 'drop': False}
+        if self.raw:
+            self._count(state['fault'], 'requests')
+            if state['fault'] and self.rng.random() < state['fault'].reset:
+                self._count(state['fault'], 'resets')
+                _reset(client_writer)
+                return
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(*self.upstream)
+        except OSError:
+            _reset(client_writer)
+            return
+        forward = self._forward_raw if self.raw else self._forward_requests
+        tasks = [asyncio.ensure_future(forward(client_reader, upstream_writer, client_writer, state)),
+                 asyncio.ensure_future(self._forward_responses(upstream_reader, client_writer, state))]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for writer in (upstream_writer, client_writer):
+                if not writer.transport.is_closing():
+                    writer.close()
+
+    async def _forward_requests(self, reader, upstream, client, state):
+        """Parse each HTTP/1.1 request head so faults can follow the route"""
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+                body = await reader.readexactly(_content_length(head))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            method, target = head.split(b' ', 2)[:2]
+            method = method.decode('latin-1').upper()
+            path = _split_api_path(target.decode('latin-1'))
+            fault = self.fault_for(method, path)
+            self._count(fault, 'requests')
+            state['fault'], state['drop'] = fault, False
+            if fault is not None:
+                await self._sleep(fault, 'delay_s', fault.delay(self.rng))
+                if self.rng.random() < fault.reset:
+                    self._count(fault, 'resets')
+                    _reset(client)
+                    return
+                state['drop'] = self.rng.random() < fault.drop
+            upstream.write(head + body)
+            await upstream.drain()
+
+    async def _forward_raw(self, reader, upstream, client, state):
+        fault = state['fault']
+        while chunk := await reader.read(CHUNK):
+            if fault is not None:
+                await self._sleep(fault, 'delay_s', fault.delay(self.rng))
+            upstream.write(chunk)
+            await upstream.drain()
+
+    async def _forward_responses(self, reader, client, state):
+        while chunk := await reader.read(CHUNK):
+            fault = state['fault']
+            if fault is not None:
+                if state['drop'] or (self.raw and self.rng.random() < fault.drop):
+                    self._count(fault, 'drops')
+                    _reset(client)
+                    return
+                if fault.bandwidth:
+                    # Small slices so a capped response trickles out rather than arriving in one burst
+                    step = max(1, int(fault.bandwidth / 50))
+                    for offset in range(0, len(chunk), step):
+                        piece = chunk[offset:offset + step]
+                        await self._sleep(fault, 'throttle_s', len(piece) / fault.bandwidth)
+                        client.write(piece)
+                        await client.drain()
+                    continue
+            client.write(chunk)
+            await client.drain()
+
+    def print_stats(self):
+        print(f"{'Fault route':<24}{'Requests':>10}{'Resets':>8}{'Drops':>8}{'Delay s':>10}{'Throttle s':>12}")
+        print("-" * 72)
+        for route, counters in sorted(self.stats.items()):
+            print(f"{route:<24}{counters['requests']:>10}{counters['resets']:>8}{counters['drops']:>8}"
+                  f"{counters['delay_s']:>10.1f}{counters['throttle_s']:>12.1f}")
+
+
+def parse_address(text, default_host='127.0.0.1'):
+    host, _, port = text.rpartition(':')
+    return host or default_host, int(port)
+
+
+def sweep(proxy, policies, concurrency=20, duration=20.0, seed=None):
+    """Run loadgen through `proxy` once per retry policy spec, returns one summary row per policy"""
+    from harness.loadgen import LoadStats, run_load
+    from harness.metrics import LatencyHistogram
+
+    api_base = f"http://127.0.0.1:{proxy.port}/api"
+    rows = []
+    for spec in policies:
+        policy = parse_policy(spec, seed=seed)
+        stats = LoadStats()
+        asyncio.run(run_load(concurrency, duration, api_base=api_base, stats=stats, retry=policy))
+        histogram = LatencyHistogram()
+        failed = 0
+        for endpoint in stats.endpoints.values():
+            histogram.merge(endpoint.histogram)
+            failed += endpoint.errors + sum(count for status, count in endpoint.statuses.items() if status >= 500)
+        rows.append({
+            **policy.summary(),
+            "journeys": stats.journeys_completed,
+            "error_rate": failed / policy.requests if policy.requests else 0.0,
+            "p50_ms": histogram.percentile(50) * 1000,
+            "p99_ms": histogram.percentile(99) * 1000,
+            "max_ms": histogram.max_us / 1000,
+            "throughput": policy.requests / stats.elapsed,
+        })
+    return rows
+
+
+def print_sweep(rows):
+    print(f"{'Policy':<56}{'Req/s':>8}{'Err':>7}{'Ampl':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    print("-" * 105)
+    for row in rows:
+        print(f"{row['policy']:<56}{row['throughput']:>8.1f}{row['error_rate']:>7.1%}{row['amplification']:>7.2f}"
+              f"{row['p50_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fault-injecting proxy and retry policy sweeps")
+    parser.add_argument('--listen', default='127.0.0.1:3100', help="host:port to accept connections on")
+    parser.add_argument('--upstream', default='127.0.0.1:3000', help="host:port of the app (or MongoDB with --raw)")
+    parser.add_argument('--fault', action='append', default=[], metavar='SPEC',
+                        help="'[METHOD ]route:latency=200ms,jitter=50ms,reset=0.02,drop=0.01,bandwidth=64k', "
+                             "repeatable; the first matching route wins")
+    parser.add_argument('--raw', action='store_true', help="plain TCP, e.g. in front of MongoDB via MONGO_URL")
+    parser.add_argument('--sweep', action='append', default=[], metavar='POLICY',
+                        help="run loadgen through the proxy with this retry policy "
+                             "('attempts=3,timeout=500ms,backoff=50ms,budget=0.1'), repeatable")
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=20.0, help="seconds per swept policy")
+    parser.add_argument('--in-process', action='store_true',
+                        help="proxy to the Python stand-in served over HTTP instead of --upstream")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.sweep and args.raw:
+        parser.error("--sweep drives HTTP load; drop --raw")
+
+    server = None
+    upstream = parse_address(args.upstream)
+    if args.in_process:
+        from harness.fake_backend import InMemoryBackend, make_http_server
+        server = make_http_server(InMemoryBackend())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        upstream = server.server_address[:2]
+
+    faults = [parse_fault(spec) for spec in args.fault]
+    listen = ('127.0.0.1', 0) if args.sweep else parse_address(args.listen)
+    proxy = FaultProxy(upstream, faults, listen, raw=args.raw, seed=args.seed).start_in_thread()
+    print("🌩️  SvenskPå3 Fault Proxy")
+    print(f"Listening: {proxy.listen[0]}:{proxy.port} → {upstream[0]}:{upstream[1]}{' (raw TCP)' if args.raw else ''}")
+    for fault in faults:
+        print(f"   {fault.route}: latency {fault.latency * 1000:g}±{fault.jitter * 1000:g}ms, reset {fault.reset:.1%}, "
+              f"drop {fault.drop:.1%}, bandwidth {fault.bandwidth or '∞'}")
+    print()
+
+    rows = None
+    try:
+        if args.sweep:
+            rows = sweep(proxy, args.sweep, args.concurrency, args.duration, args.seed)
+            print_sweep(rows)
+            print()
+        else:
+            print("Proxying until interrupted (Ctrl-C)")
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        proxy.stop()
+        if server is not None:
+            server.shutdown()
+    proxy.print_stats()
+    return rows
+
+
+if __name__ == "__main__":
+    main()
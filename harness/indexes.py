@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Index audit for the MongoDB query shapes in app/api/[[...path]]/route.js
+Runs explain() on each hot query against a seeded database and flags
+collection scans, in-memory sorts and high examined-to-returned ratios.
+Exits non-zero when any shape is not served by an index.
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+# Mirrors INDEXES in route.js, which the app creates on first connect
+INDEXES = (
+    ('users', [('email', 1)], {'unique': True}),
+    ('daily_progress', [('userId', 1), ('date', -1)], {'unique': True}),
+)
+PROGRESS_WINDOW_DAYS = 30
+# Stages that answer from an index without a separate scan stage
+INDEX_STAGES = ('IXSCAN', 'IDHACK', 'EXPRESS_IXSCAN', 'EXPRESS_IDHACK', 'EXPRESS_CLUSTERED_IXSCAN', 'COUNT_SCAN',
+                'DISTINCT_SCAN')
+
+
+def _email(user, today):
+    return {"email": user['email']}, None, 1
+
+
+def _user_id(user, today):
+    return {"_id": user['_id']}, None, 1
+
+
+def _progress_range(user, today):
+    since = (today - timedelta(days=PROGRESS_WINDOW_DAYS)).isoformat()
+    return {"userId": str(user['_id']), "date": {"$gte": since}}, [('date', -1)], 0
+
+
+def _progress_latest(user, today):
+    return {"userId": str(user['_id'])}, [('date', -1)], 1
+
+
+def _progress_day(user, today):
+    return {"userId": str(user['_id']), "date": today.isoformat()}, None, 1
+
+
+# (name, collection, builder(user, today) -> (filter, sort, limit), route.js callers)
+QUERY_SHAPES = (
+    ("users by email", 'users', _email, "signup, signin"),
+    ("users by _id", 'users', _user_id, "auth/me, profile GET/PUT"),
+    ("progress latest day", 'daily_progress', _progress_latest, "progress GET ETag"),
+    ("progress 30-day range", 'daily_progress', _progress_range, "progress GET"),
+    ("progress by day", 'daily_progress', _progress_day, "progress POST today/yesterday and upsert"),
+)
+
+
+def plan_stages(node):
+    """Flatten an explain plan tree into a list of stage dicts, root first"""
+    if not node:
+        return []
+    # Slot-based engine wraps the classic tree; sharded plans list one per shard
+    if 'queryPlan' in node:
+        return plan_stages(node['queryPlan'])
+    stages = [node] if 'stage' in node else []
+    children = []
+    if 'inputStage' in node:
+        children.append(node['inputStage'])
+    children.extend(node.get('inputStages', []))
+    for shard in node.get('shards', []):
+        children.append(shard.get('winningPlan'))
+    for child in children:
+        stages.extend(plan_stages(child))
+    return stages
+
+
+def analyze(explain, max_ratio=2.0):
+    """Summarize one explain() result, with `problems` listing why it is not index-served"""
+    stages = plan_stages(explain.get('queryPlanner', {}).get('winningPlan'))
+    names = [stage['stage'] for stage in stages]
+    indexes = [stage.get('indexName', '_id_') for stage in stages if stage['stage'] in INDEX_STAGES]
+    stats = explain.get('executionStats', {})
+    returned = stats.get('nReturned', 0)
+    keys = stats.get('totalKeysExamined', 0)
+    docs = stats.get('totalDocsExamined', 0)
+    ratio = max(keys, docs) / max(returned, 1)
+
+    problems = []
+    if 'COLLSCAN' in names:
+        problems.append("COLLSCAN")
+    if 'SORT' in names:
+        problems.append("in-memory SORT")
+    if not indexes and 'COLLSCAN' not in names:
+        problems.append("no index used")
+    if ratio > max_ratio:
+        problems.append(f"examined/returned {ratio:.1f} > {max_ratio:g}")
+    return {
+        "plan": ' → '.join(names),
+        "indexes": indexes,
+        "returned": returned,
+        "keys_examined": keys,
+        "docs_examined": docs,
+        "ratio": ratio,
+        "problems": problems,
+    }
+
+
+def explain_shape(db, collection, query_filter, sort=None, limit=0):
+    cursor = db[collection].find(query_filter)
+    if sort:
+        cursor = cursor.sort(sort)
+    if limit:
+        cursor = cursor.limit(limit)
+    return cursor.explain()
+
+
+def ensure_indexes(db):
+    """Same indexes the app creates at startup"""
+    for collection, keys, options in INDEXES:
+        db[collection].create_index(keys, **options)
+
+
+def sample_users(db, samples):
+    """Seeded users with at least one daily_progress document, so range queries return something"""
+    users = list(db.users.aggregate([{"$sample": {"size": samples * 4}}]))
+    with_progress = [user for user in users if db.daily_progress.find_one({"userId": str(user['_id'])})]
+    return (with_progress or users)[:samples]
+
+
+def audit(db, samples=5, max_ratio=2.0, today=None):
+    """Explain every shape for each sampled user, returns one row per shape with the worst sample"""
+    today = today or datetime.now(timezone.utc).date()
+    users = sample_users(db, samples)
+    if not users:
+        raise RuntimeError("No users to sample; seed the database first (--seed-users)")
+    rows = []
+    for name, collection, builder, callers in QUERY_SHAPES:
+        results = [analyze(explain_shape(db, collection, *builder(user, today)), max_ratio) for user in users]
+        worst = max(results, key=lambda result: (len(result['problems']), result['ratio']))
+        rows.append({"shape": name, "collection": collection, "callers": callers, **worst})
+    return rows
+
+
+def print_report(rows, existing):
+    print("Existing indexes:")
+    for collection, names in existing.items():
+        print(f"   {collection}: {', '.join(names) or '(none)'}")
+    print()
+    print(f"{'Shape':<24} {'Plan':<28} {'Index':<20} {'Ret':>5} {'Keys':>6} {'Docs':>6} {'Ratio':>6}")
+    print("-" * 100)
+    for row in rows:
+        print(f"{row['shape']:<24} {row['plan']:<28} {','.join(row['indexes']) or '-':<20} {row['returned']:>5} "
+              f"{row['keys_examined']:>6} {row['docs_examined']:>6} {row['ratio']:>6.1f}")
+        for problem in row['problems']:
+            print(f"   ❌ {problem} ({row['callers']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="explain() the route.js query shapes and fail on unindexed ones")
+    parser.add_argument('--mongo-url', default=os.getenv('MONGO_URL', 'mongodb://localhost:27017/svenskpa3'))
+    parser.add_argument('--seed-users', type=int, default=0, help="seed this many users first (harness.seeder)")
+    parser.add_argument('--create-indexes', action='store_true', help="create the app's indexes first, as startup does")
+    parser.add_argument('--samples', type=int, default=5, help="users to explain each shape for")
+    parser.add_argument('--max-ratio', type=float, default=2.0, help="max examined documents/keys per returned one")
+    parser.add_argument('--json', default=None, help="write the per-shape rows to this file")
+    args = parser.parse_args(argv)
+
+    from pymongo import MongoClient
+
+    client = MongoClient(args.mongo_url)
+    db = client.get_default_database()
+    print("🔎 SvenskPå3 Index Audit")
+    print(f"Database: {args.mongo_url}")
+    print()
+    try:
+        if args.seed_users:
+            from harness.seeder import MongoTarget, seed
+            target = MongoTarget(args.mongo_url)
+            try:
+                counts = seed(target, users=args.seed_users)
+            finally:
+                target.close()
+            print(f"🌱 Seeded {counts['users']} users, {counts['daily_progress']} daily_progress")
+        if args.create_indexes:
+            ensure_indexes(db)
+            print("✅ Ensured app indexes")
+        existing = {collection: sorted(db[collection].index_information()) for collection in ('users', 'daily_progress')}
+        rows = audit(db, args.samples, args.max_ratio)
+    finally:
+        client.close()
+
+    print_report(rows, existing)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+    failing = [row['shape'] for row in rows if row['problems']]
+    print()
+    if failing:
+        print(f"❌ Not index-served: {', '.join(failing)}")
+    else:
+        print("🎉 Every query shape is served by an index")
+    return failing
+
+
+if __name__ == "__main__":
+    exit(1 if main() else 0)
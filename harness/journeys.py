@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+User-journey workload model mirroring the frontend's fetch patterns
+Each virtual user walks a weighted state machine of page visits: the dashboard
+and lesson pages fire auth/me and progress in parallel, lesson steps call
+/api/tts once per phrase the learner plays, the last step posts progress, and
+settings loads auth/me before PUT /api/profile. Exponential think times sit
+between pages, so load tests see the request mix and burst shape of real learners.
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import re
+import time
+
+from harness import API_BASE
+from harness.loadgen import AsyncAPIClient, LoadStats
+from harness.tts_replay import _STRING, LESSON_PAGE
+
+JOURNEY_PASSWORD = "JourneyPassword123!"
+# Chance a learner presses play on a step that has audio, and abandons the lesson after a step
+PLAY_PROBABILITY = 0.7
+ABANDON_PROBABILITY = 0.05
+DEFAULT_SCENARIO = 'butikk'
+
+
+def load_lessons(path=LESSON_PAGE):
+    """{scenario: [playable phrase or None per step]} from LESSON_DATA, in step order"""
+    with open(path, encoding='utf-8') as handle:
+        source = handle.read()
+    source = source[source.index('const LESSON_DATA'):]
+    source = source[:source.index('\n};')]
+    lessons = {}
+    blocks = re.split(r"^  (\w+): \[", source, flags=re.M)
+    for scenario, block in zip(blocks[1::2], blocks[2::2]):
+        steps = []
+        for step in re.split(r"\btype:", block)[1:]:
+            match = re.search(rf"(?:swedish|audio):\s*{_STRING}", step)
+            steps.append(match.group(1).replace("\\'", "'") if match else None)
+        lessons[scenario] = steps
+    return lessons
+
+
+class VirtualUser:
+    """Account state that outlives a single visit"""
+
+    def __init__(self, email):
+        self.email = email
+        self.signed_up = False
+        self.signed_in = False
+
+
+class Visit:
+    """One browsing session, the state machine's memory between pages"""
+
+    def __init__(self, user, lessons, rng):
+        self.user = user
+        self.lessons = lessons
+        self.rng = rng
+        self.responses = {}
+        self.lesson = []
+        self.step = 0
+        self.played = set()
+
+
+# Requests each state fires in parallel, as tuples of (method, endpoint, body) or a callable(visit)
+
+def _page_load(visit):
+    # Promise.all([fetch('/api/auth/me'), fetch('/api/progress')]) on the dashboard and lesson pages
+    return ('GET', 'auth/me', None), ('GET', 'progress', None)
+
+
+def _signup(visit):
+    return ('POST', 'auth/signup', {"email": visit.user.email, "password": JOURNEY_PASSWORD, "displayName": "Journey"}),
+
+
+def _signin(visit):
+    return ('POST', 'auth/signin', {"email": visit.user.email, "password": JOURNEY_PASSWORD}),
+
+
+def _lesson_step(visit):
+    # The page caches audio per phrase, so a replay within the visit never reaches the server
+    phrase = visit.lesson[visit.step]
+    visit.step += 1
+    if phrase and phrase not in visit.played and visit.rng.random() < PLAY_PROBABILITY:
+        visit.played.add(phrase)
+        return ('POST', 'tts', {"text": phrase}),
+    return ()
+
+
+def _save_profile(visit):
+    user = visit.responses.get('auth/me', {})
+    return ('PUT', 'profile', {"displayName": user.get('displayName') or 'Journey', "level": user.get('level', 'beginner'),
+                               "goal": user.get('goal', ''), "scenarios": user.get('scenarios') or [DEFAULT_SCENARIO]}),
+
+
+def _contact(visit):
+    return ('POST', 'contact', {"email": visit.user.email, "message": "Hej! Jag har en fråga om appen."}),
+
+
+# Transitions as ((next state, weight), ...) or a callable(visit) returning them; () ends the visit
+
+def _arrive(visit):
+    if not visit.user.signed_up:
+        return ('signup', 1),
+    if not visit.user.signed_in:
+        return ('signin', 1),
+    return ('dashboard', 0.6), ('lesson', 0.25), ('settings', 0.1), ('contact', 0.05)
+
+
+def _lesson_loaded(visit):
+    progress = visit.responses.get('progress', {})
+    if progress.get('completedToday'):
+        return ('dashboard', 0.5), ('leave', 0.5)
+    me = visit.responses.get('auth/me', {})
+    scenario = (me.get('scenarios') or [DEFAULT_SCENARIO])[0]
+    visit.lesson = visit.lessons.get(scenario) or visit.lessons.get(DEFAULT_SCENARIO) or [None]
+    visit.step = 0
+    visit.played = set()
+    return ('lesson_step', 1),
+
+
+def _next_step(visit):
+    if visit.step < len(visit.lesson):
+        return ('lesson_step', 1 - ABANDON_PROBABILITY), ('leave', ABANDON_PROBABILITY)
+    return ('lesson_complete', 1),
+
+
+# state: (parallel requests, mean think seconds on the page, transitions)
+JOURNEY = {
+    'arrive': ((), 0.0, _arrive),
+    'signup': (_signup, 2.0, (('dashboard', 1),)),
+    'signin': (_signin, 2.0, (('dashboard', 1),)),
+    'dashboard': (_page_load, 8.0, (('lesson', 0.6), ('settings', 0.1), ('logout', 0.05), ('leave', 0.25))),
+    'lesson': (_page_load, 4.0, _lesson_loaded),
+    'lesson_step': (_lesson_step, 12.0, _next_step),
+    'lesson_complete': ((('POST', 'progress', {}),), 6.0, (('dashboard', 0.4), ('lesson', 0.3), ('leave', 0.3))),
+    'settings': ((('GET', 'auth/me', None),), 15.0, (('save_profile', 0.6), ('dashboard', 0.3), ('leave', 0.1))),
+    'save_profile': (_save_profile, 3.0, (('dashboard', 0.5), ('leave', 0.5))),
+    'contact': (_contact, 20.0, (('leave', 1),)),
+    'logout': ((('POST', 'auth/logout', None),), 0.0, ()),
+    'leave': ((), 0.0, ()),
+}
+
+
+class JourneyStats(LoadStats):
+    """LoadStats plus state visits and the size of each parallel burst"""
+
+    def __init__(self, samples=None):
+        super().__init__(samples)
+        self.states = {}
+        self.bursts = {}
+
+    def print_report(self):
+        super().print_report()
+        total = self.total_requests or 1
+        print(f"{'Request mix':<24}{'Share':>8}")
+        for (method, endpoint), stats in sorted(self.endpoints.items(), key=lambda item: -item[1].count):
+            print(f"{method + ' ' + endpoint:<24}{(stats.count + stats.errors) / total:>8.1%}")
+        print()
+        print("States: " + ', '.join(f"{state} {count}" for state, count in
+                                     sorted(self.states.items(), key=lambda item: -item[1])))
+        print("Bursts: " + ', '.join(f"{size} in parallel ×{count}" for size, count in sorted(self.bursts.items())))
+        print()
+
+
+async def run_visit(client, visit, stats, journey=JOURNEY, think_scale=1.0):
+    """Walk one visit from 'arrive' until a state with no transitions, returns True if no request failed"""
+    state = 'arrive'
+    ok = True
+    while True:
+        requests, think, transitions = journey[state]
+        stats.states[state] = stats.states.get(state, 0) + 1
+        requests = requests(visit) if callable(requests) else requests
+        if requests:
+            stats.bursts[len(requests)] = stats.bursts.get(len(requests), 0) + 1
+            results = await asyncio.gather(*(client.request(method, endpoint, body)
+                                             for method, endpoint, body in requests))
+            for (method, endpoint, _), (status, body) in zip(requests, results):
+                visit.responses[endpoint] = body
+                ok = ok and status is not None and status < 500
+                if status == 200 and endpoint in ('auth/signup', 'auth/signin'):
+                    visit.user.signed_up = visit.user.signed_in = True
+                elif endpoint == 'auth/logout' or status == 401:
+                    visit.user.signed_in = False
+        transitions = transitions(visit) if callable(transitions) else transitions
+        if not transitions:
+            return ok
+        if think and think_scale:
+            await asyncio.sleep(visit.rng.expovariate(1 / (think * think_scale)))
+        states, weights = zip(*transitions)
+        state = visit.rng.choices(states, weights)[0]
+
+
+async def run_journeys(client_factory, users=50, duration=60.0, visits=None, think_scale=1.0, visit_gap=60.0,
+                       lessons=None, stats=None, seed=None, run_id=None, journey=JOURNEY):
+    """Run `users` concurrent virtual users, each making visits until `duration` or `visits` per user"""
+    stats = stats or JourneyStats()
+    lessons = lessons if lessons is not None else load_lessons()
+    rng = random.Random(seed)
+    run_id = run_id or time.time_ns()
+    deadline = time.monotonic() + duration
+    user_ids = itertools.count()
+
+    async def virtual_user(user_rng):
+        user = VirtualUser(f"journey_{run_id}_{next(user_ids)}@example.com")
+        client = client_factory()
+        try:
+            # Stagger arrivals over one gap so users do not land in lockstep
+            if think_scale and visit_gap:
+                await asyncio.sleep(user_rng.uniform(0, visit_gap * think_scale))
+            for count in itertools.count():
+                if time.monotonic() >= deadline or (visits is not None and count >= visits):
+                    return
+                stats.journeys_started += 1
+                if await run_visit(client, Visit(user, lessons, user_rng), stats, journey, think_scale):
+                    stats.journeys_completed += 1
+                if think_scale and visit_gap:
+                    await asyncio.sleep(user_rng.expovariate(1 / (visit_gap * think_scale)))
+        finally:
+            await client.close()
+
+    try:
+        await asyncio.gather(*(virtual_user(random.Random(rng.random())) for _ in range(users)))
+    finally:
+        stats.finished_at = time.perf_counter()
+    return stats
+
+
+class InProcessJourneyClient:
+    """InProcessAsyncClient for the main API, with POST tts served by a shared TtsRouteModel"""
+
+    def __init__(self, backend, stats, tts):
+        from harness.fake_backend import InProcessAsyncClient
+
+        self.api = InProcessAsyncClient(backend, stats)
+        self.stats = stats
+        self.tts = tts
+
+    async def request(self, method, endpoint, data=None):
+        if endpoint != 'tts':
+            return await self.api.request(method, endpoint, data)
+        status, _, latency = self.tts.post((data or {}).get('text'))
+        await asyncio.sleep(latency)
+        self.stats.endpoint(method, endpoint).record(status, latency)
+        return status, {}
+
+    async def close(self):
+        await self.api.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Weighted user-journey load test mirroring the frontend's fetches")
+    parser.add_argument('--users', type=int, default=50, help="concurrent virtual users")
+    parser.add_argument('--duration', type=float, default=60.0, help="run time in seconds")
+    parser.add_argument('--visits', type=int, default=None, help="stop each user after this many visits")
+    parser.add_argument('--think-scale', type=float, default=1.0, help="multiply think times and gaps (0 disables)")
+    parser.add_argument('--visit-gap', type=float, default=60.0, help="mean seconds between a user's visits")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--in-process', action='store_true', help="drive the Python backend stand-in and TTS model")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--samples', metavar='PATH', help="also record every request to a sample store (harness/samples.py)")
+    parser.add_argument('--label', default='journeys', help="run label in the sample store")
+    from harness import live
+    live.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    print("🧭 SvenskPå3 Journey Load Test")
+    print(f"API Base: {'in-process' if args.in_process else args.api_base} (live TTS needs TTS_STUB=1)")
+    print(f"Users: {args.users}, Duration: {args.duration}s, Think scale: {args.think_scale}")
+    print()
+
+    store = None
+    if args.samples:
+        from harness.samples import SampleStore
+        store = SampleStore(args.samples)
+    stats = JourneyStats(store.start_run(args.label) if store else None)
+    connector = None
+    if args.in_process:
+        from harness.fake_backend import InMemoryBackend
+        from harness.tts_replay import TtsRouteModel
+        backend, tts = InMemoryBackend(), TtsRouteModel()
+
+        def client_factory():
+            return InProcessJourneyClient(backend, stats, tts)
+    else:
+        import aiohttp
+
+        def client_factory():
+            nonlocal connector
+            connector = connector or aiohttp.TCPConnector(limit=args.users * 2)
+            return AsyncAPIClient(connector, stats, args.api_base)
+
+    session = live.from_args(args)
+    if session is not None:
+        client_factory = session.metrics.wrap(client_factory)
+
+    async def run():
+        try:
+            await run_journeys(client_factory, args.users, args.duration, args.visits, args.think_scale,
+                               args.visit_gap, stats=stats, seed=args.seed)
+        finally:
+            if connector is not None:
+                await connector.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        if session is not None:
+            session.close()
+        if store is not None:
+            stats.samples.close()
+            store.close()
+    stats.print_report()
+    if store is not None:
+        print(f"Samples: run {stats.samples.run_id} in {args.samples}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Saturation knee-finder for the bcrypt-bound auth endpoints
+Ramps open-loop POST /api/auth/signin (or signup) load step by step while a
+low-rate GET /api/auth/me probe runs alongside, and stops at the step where
+p99 takes off or throughput stops following the offered rate. The last step
+before that is the per-instance capacity figure.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from harness import API_BASE
+from harness.fake_backend import InMemoryBackend
+from harness.openloop import (HttpTransport, InProcessTransport, OpenLoopStats, fixed_schedule, poisson_schedule,
+                              run_open_loop)
+
+
+class BcryptBackend(InMemoryBackend):
+    """InMemoryBackend paying real bcrypt cost on the event loop thread, as bcryptjs does in route.js"""
+
+    def __init__(self, rounds=10, **kwargs):
+        try:
+            import bcrypt
+        except ImportError as error:
+            raise ImportError("BcryptBackend needs the bcrypt package (pip install bcrypt)") from error
+
+        super().__init__(**kwargs)
+        self.bcrypt = bcrypt
+        self.rounds = rounds
+
+    def _hash_password(self, password):
+        return self.bcrypt.hashpw(password.encode(), self.bcrypt.gensalt(self.rounds)).decode()
+
+    def _check_password(self, password, hashed):
+        return self.bcrypt.checkpw(password.encode(), hashed.encode())
+
+
+def step_row(rate, elapsed, stats, operation, probe):
+    """Throughput and latency summary for one ramp step"""
+    load = stats.intended.get(operation)
+    completed = load.count if load else 0
+    ok = sum(count for (op, status), count in stats.statuses.items() if op == operation and status == 200)
+    probe_histogram = probe.intended.get('me')
+    return {
+        "offered": rate,
+        "achieved": ok / elapsed if elapsed else 0.0,
+        "requests": completed + stats.dropped,
+        "errors": completed - ok + stats.dropped,
+        "p50_ms": load.percentile_us(50) / 1000 if load else 0.0,
+        "p99_ms": load.percentile_us(99) / 1000 if load else 0.0,
+        "probe_p50_ms": probe_histogram.percentile_us(50) / 1000 if probe_histogram else 0.0,
+        "probe_p99_ms": probe_histogram.percentile_us(99) / 1000 if probe_histogram else 0.0,
+    }
+
+
+def find_knee(rows, latency_factor=3.0, throughput_ratio=0.9, max_error_rate=0.01):
+    """Index of the first step past the knee, or None while the curve is still linear
+
+    A step is past the knee when its p99 exceeds `latency_factor` times the
+    lowest p99 seen so far, when achieved throughput falls below
+    `throughput_ratio` of the offered rate, or when more than `max_error_rate` of
+    the step's requests (completed or dropped) failed
+    """
+    floor = None
+    for index, row in enumerate(rows):
+        if floor is not None and row['p99_ms'] > latency_factor * floor:
+            return index
+        if row['achieved'] < throughput_ratio * row['offered']:
+            return index
+        if row['errors'] / max(1, row['requests']) > max_error_rate:
+            return index
+        floor = row['p99_ms'] if floor is None else min(floor, row['p99_ms'])
+    return None
+
+
+async def run_step(transport, rate, duration, users, operation, probe_rate, max_outstanding, rng):
+    load, probe = OpenLoopStats(), OpenLoopStats()
+    started = time.perf_counter()
+    await asyncio.gather(
+        run_open_loop(transport, fixed_schedule(rate, duration), users, ((operation,), (1.0,)), max_outstanding,
+                      load, rng),
+        # Poisson arrivals keep the probe from lining up with the fixed-rate load
+        run_open_loop(transport, poisson_schedule(probe_rate, duration, rng), users, (('me',), (1.0,)),
+                      max_outstanding, probe, rng),
+    )
+    return step_row(rate, time.perf_counter() - started, load, operation, probe)
+
+
+async def ramp(transport, rates, step_duration, users, operation='signin', probe_rate=5.0, max_outstanding=1000,
+               latency_factor=3.0, throughput_ratio=0.9, max_error_rate=0.01, rng=None, report=print):
+    """Run steps until the knee, returns (rows, knee index or None)"""
+    rng = rng or random.Random()
+    rows = []
+    report(f"{'Offered/s':>10}{'Achieved/s':>12}{'Errors':>8}{'p50 ms':>10}{'p99 ms':>10}"
+           f"{'me p50':>10}{'me p99':>10}")
+    report("-" * 70)
+    for rate in rates:
+        row = await run_step(transport, rate, step_duration, users, operation, probe_rate, max_outstanding, rng)
+        rows.append(row)
+        report(f"{row['offered']:>10.1f}{row['achieved']:>12.1f}{row['errors']:>8}{row['p50_ms']:>10.1f}"
+               f"{row['p99_ms']:>10.1f}{row['probe_p50_ms']:>10.1f}{row['probe_p99_ms']:>10.1f}")
+        knee = find_knee(rows, latency_factor, throughput_ratio, max_error_rate)
+        if knee is not None:
+            return rows, knee
+    return rows, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find the saturation knee of the bcrypt-bound auth endpoints")
+    parser.add_argument('--operation', choices=('signin', 'signup'), default='signin')
+    parser.add_argument('--rates', default='2,4,8,12,16,24,32,48,64', help="comma-separated offered rates per step")
+    parser.add_argument('--step-duration', type=float, default=10.0, help="seconds per step")
+    parser.add_argument('--probe-rate', type=float, default=5.0, help="GET auth/me requests per second alongside")
+    parser.add_argument('--latency-factor', type=float, default=3.0, help="knee when p99 exceeds this x the floor")
+    parser.add_argument('--throughput-ratio', type=float, default=0.9,
+                        help="knee when achieved/offered drops below this")
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help="knee when more than this share of a step's requests fail")
+    parser.add_argument('--max-outstanding', type=int, default=1000)
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument('--users', type=int, default=10, help="pooled users to sign in as")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--in-process', action='store_true', help="run against a bcrypt-paying Python stand-in")
+    parser.add_argument('--bcrypt-rounds', type=int, default=10, help="in-process bcrypt cost, route.js uses 10")
+    parser.add_argument('--json', metavar='PATH', help="write the steps and capacity to PATH")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from harness.user_pool import USER_POOL_FILE, UserPool
+
+    session_factory = None
+    backend = None
+    if args.in_process:
+        import requests
+
+        from harness.fake_backend import install
+        try:
+            backend = BcryptBackend(args.bcrypt_rounds)
+        except ImportError:
+            parser.error("--in-process pays real bcrypt cost and needs the bcrypt package (pip install bcrypt)")
+
+        def session_factory():
+            return install(requests.Session(), backend, args.api_base.rsplit('/api', 1)[0])
+
+    pool = UserPool(args.users, path=None if args.in_process else USER_POOL_FILE, api_base=args.api_base,
+                    session_factory=session_factory).ensure()
+    users = [(user, pool.token(index)) for index, user in enumerate(pool.users[:args.users])]
+    rates = [float(rate) for rate in args.rates.split(',')]
+
+    print(f"🦵 SvenskPå3 Auth Knee-Finder ({args.operation})")
+    print(f"API Base: {'in-process, bcrypt rounds ' + str(args.bcrypt_rounds) if args.in_process else args.api_base}")
+    print(f"Steps: {args.rates} req/s x {args.step_duration}s, probe GET auth/me at {args.probe_rate}/s")
+    print()
+
+    async def run():
+        if args.in_process:
+            transport = InProcessTransport(backend)
+        else:
+            transport = HttpTransport(args.api_base, timeout=args.timeout)
+        try:
+            return await ramp(transport, rates, args.step_duration, users, args.operation, args.probe_rate,
+                              args.max_outstanding, args.latency_factor, args.throughput_ratio,
+                              args.max_error_rate, random.Random(args.seed))
+        finally:
+            await transport.close()
+
+    rows, knee = asyncio.run(run())
+    print()
+    if knee is None:
+        capacity = max(row['achieved'] for row in rows)
+        print(f"⚠️  No knee up to {rows[-1]['offered']:.0f} req/s; capacity is at least {capacity:.1f} "
+              f"{args.operation}/s. Extend --rates.")
+    elif knee == 0:
+        capacity = rows[0]['achieved']
+        print(f"⚠️  Already saturated at the first step; capacity is below {rows[0]['offered']:.0f} req/s. "
+              f"Lower --rates.")
+    else:
+        before, after = rows[knee - 1], rows[knee]
+        capacity = before['achieved']
+        print(f"🎯 Capacity: {capacity:.1f} {args.operation}/s per instance")
+        print(f"   Knee between {before['offered']:.0f} and {after['offered']:.0f} req/s: "
+              f"p99 {before['p99_ms']:.0f} → {after['p99_ms']:.0f}ms, "
+              f"GET auth/me p99 {before['probe_p99_ms']:.0f} → {after['probe_p99_ms']:.0f}ms")
+
+    result = {"operation": args.operation, "capacity_per_second": capacity, "knee_step": knee, "steps": rows}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as handle:
+            json.dump(result, handle, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
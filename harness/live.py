@@ -0,0 +1,290 @@
+"""
+Live metrics for running load tests
+LiveMetrics keeps per-endpoint counters, in-flight gauges, cumulative latency
+histograms and one-second buckets for sliding-window rates and percentiles.
+MetricsServer exposes them in Prometheus text format on a local port, and
+TerminalView redraws a compact table in place, so a saturated signin or a
+burst of progress errors is visible while the run is still going.
+"""
+
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+from harness.metrics import LatencyHistogram
+
+# Prometheus histogram bounds in seconds; bcrypt-bound signup/signin sit in the upper half
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WINDOWS = (10, 60)
+PREFIX = 'svenskpa3_harness'
+
+
+class EndpointMetrics:
+    """Totals for one (method, endpoint), plus a ring of per-second histograms"""
+
+    def __init__(self, horizon):
+        self.statuses = {}
+        self.failures = 0
+        self.in_flight = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.seconds_sum = 0.0
+        self.count = 0
+        # second -> (histogram, errors), pruned beyond `horizon` seconds
+        self.recent = {}
+        self.horizon = horizon
+
+    def record(self, status, seconds, now):
+        if status:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        else:
+            self.failures += 1
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.seconds_sum += seconds
+        self.count += 1
+        second = int(now)
+        histogram, errors = self.recent.get(second) or (LatencyHistogram(), 0)
+        histogram.record(seconds)
+        self.recent[second] = (histogram, errors + (not status or status >= 500))
+        if len(self.recent) > self.horizon:
+            for stale in [key for key in self.recent if key <= second - self.horizon]:
+                del self.recent[stale]
+
+    def window(self, seconds, now):
+        """(requests per second, errors per second, merged histogram) over the last `seconds` whole seconds"""
+        merged = LatencyHistogram()
+        errors = 0
+        first = int(now) - seconds
+        for second, (histogram, second_errors) in self.recent.items():
+            if first <= second < int(now):
+                merged.merge(histogram)
+                errors += second_errors
+        return merged.count / seconds, errors / seconds, merged
+
+
+class LiveMetrics:
+    """Thread-safe registry fed by begin()/end() around every request"""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.endpoints = {}
+        self.lock = threading.Lock()
+        self.started = clock()
+
+    def _endpoint(self, method, endpoint):
+        key = (method.upper(), endpoint)
+        metrics = self.endpoints.get(key)
+        if metrics is None:
+            metrics = self.endpoints[key] = EndpointMetrics(max(WINDOWS) + 1)
+        return metrics
+
+    def begin(self, method, endpoint):
+        with self.lock:
+            self._endpoint(method, endpoint).in_flight += 1
+
+    def end(self, method, endpoint, status, seconds):
+        """A request finished with `status` (None or 0 when no response arrived) after `seconds`"""
+        with self.lock:
+            metrics = self._endpoint(method, endpoint)
+            metrics.in_flight -= 1
+            metrics.record(status, seconds, self.clock())
+
+    def _span(self, window, now):
+        """`window`, shortened to the whole seconds elapsed so early rates are not diluted"""
+        return min(window, max(1, int(now) - int(self.started)))
+
+    def wrap(self, client_factory):
+        """client_factory whose async clients report to these metrics"""
+        return lambda: LiveClient(client_factory(), self)
+
+    def snapshot(self, window=WINDOWS[0]):
+        """One row per endpoint with totals, in-flight and `window`-second rates and percentiles"""
+        now = self.clock()
+        rows = []
+        with self.lock:
+            for (method, endpoint), metrics in sorted(self.endpoints.items()):
+                rate, error_rate, histogram = metrics.window(self._span(window, now), now)
+                rows.append({
+                    "method": method,
+                    "endpoint": endpoint,
+                    "total": metrics.count,
+                    "errors": metrics.failures + sum(count for status, count in metrics.statuses.items()
+                                                     if status >= 500),
+                    "in_flight": metrics.in_flight,
+                    "rate": rate,
+                    "error_rate": error_rate,
+                    "p50_ms": histogram.percentile_us(50) / 1000,
+                    "p95_ms": histogram.percentile_us(95) / 1000,
+                })
+        return rows
+
+    def exposition(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        now = self.clock()
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        with self.lock:
+            items = sorted(self.endpoints.items())
+            labelled = [(f'method="{method}",endpoint="{endpoint}"', metrics) for (method, endpoint), metrics in items]
+
+            family('requests_total', 'counter', "Completed requests by status")
+            for labels, metrics in labelled:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'{PREFIX}_requests_total{{{labels},status="{status}"}} {count}')
+            family('transport_failures_total', 'counter', "Requests that got no response")
+            for labels, metrics in labelled:
+                lines.append(f'{PREFIX}_transport_failures_total{{{labels}}} {metrics.failures}')
+            family('in_flight_requests', 'gauge', "Requests sent and not yet answered")
+            for labels, metrics in labelled:
+                lines.append(f'{PREFIX}_in_flight_requests{{{labels}}} {metrics.in_flight}')
+            family('request_duration_seconds', 'histogram', "Client-observed request latency")
+            for labels, metrics in labelled:
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float('inf'),), metrics.buckets):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                    lines.append(f'{PREFIX}_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f'{PREFIX}_request_duration_seconds_sum{{{labels}}} {metrics.seconds_sum:.6f}')
+                lines.append(f'{PREFIX}_request_duration_seconds_count{{{labels}}} {metrics.count}')
+            windows = [(labels, window, metrics.window(self._span(window, now), now))
+                       for labels, metrics in labelled for window in WINDOWS]
+            family('request_rate', 'gauge', "Requests per second over the sliding window")
+            for labels, window, (rate, _, _) in windows:
+                lines.append(f'{PREFIX}_request_rate{{{labels},window="{window}s"}} {rate:g}')
+            family('error_rate', 'gauge', "5xx and transport failures per second over the sliding window")
+            for labels, window, (_, error_rate, _) in windows:
+                lines.append(f'{PREFIX}_error_rate{{{labels},window="{window}s"}} {error_rate:g}')
+            family('window_latency_seconds', 'gauge', "Latency quantiles over the sliding window")
+            for labels, window, (_, _, histogram) in windows:
+                for quantile in (50, 95, 99):
+                    lines.append(f'{PREFIX}_window_latency_seconds{{{labels},window="{window}s",'
+                                 f'quantile="{quantile / 100:g}"}} {histogram.percentile(quantile):g}')
+        family('uptime_seconds', 'gauge', "Seconds since the run started")
+        lines.append(f'{PREFIX}_uptime_seconds {now - self.started:.1f}')
+        return '\n'.join(lines) + '\n'
+
+
+class LiveClient:
+    """Wraps an async harness client (loadgen.AsyncAPIClient and friends) to feed LiveMetrics"""
+
+    def __init__(self, client, metrics):
+        self.client = client
+        self.metrics = metrics
+
+    async def request(self, method, endpoint, data=None):
+        self.metrics.begin(method, endpoint)
+        start = time.perf_counter()
+        status = None
+        try:
+            status, body = await self.client.request(method, endpoint, data)
+            return status, body
+        finally:
+            self.metrics.end(method, endpoint, status, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class MetricsServer:
+    """Serves `metrics` at http://host:port/metrics from a daemon thread"""
+
+    def __init__(self, metrics, port=9464, host='127.0.0.1'):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                content = metrics.exposition().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TerminalView:
+    """Redraws a per-endpoint table every `interval` seconds, in place when `stream` is a terminal"""
+
+    def __init__(self, metrics, interval=1.0, stream=None):
+        self.metrics = metrics
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.lines = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def render(self):
+        rows = self.metrics.snapshot()
+        lines = [f"⏱️  {time.strftime('%H:%M:%S')}  last {WINDOWS[0]}s",
+                 f"{'Request':<24}{'Total':>8}{'In-fl':>7}{'Req/s':>8}{'Err/s':>7}{'p50 ms':>9}{'p95 ms':>9}"]
+        for row in rows:
+            flag = ' ❗' if row['error_rate'] else ''
+            lines.append(f"{row['method'] + ' ' + row['endpoint']:<24}{row['total']:>8}{row['in_flight']:>7}"
+                         f"{row['rate']:>8.1f}{row['error_rate']:>7.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{flag}")
+        return lines
+
+    def draw(self):
+        lines = self.render()
+        if self.stream.isatty() and self.lines:
+            # Back to the first line of the previous frame, then clear to the end of the screen
+            self.stream.write(f"\x1b[{self.lines}F\x1b[J")
+        self.stream.write('\n'.join(lines) + '\n')
+        self.stream.flush()
+        self.lines = len(lines)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self.draw()
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join()
+
+
+def add_arguments(parser):
+    parser.add_argument('--metrics-port', type=int, default=None, metavar='PORT',
+                        help="serve live Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--live', action='store_true', help="redraw a live per-endpoint table while running")
+
+
+class LiveSession:
+    """The LiveMetrics, server and view requested by add_arguments' options"""
+
+    def __init__(self, metrics_port=None, view=False):
+        self.metrics = LiveMetrics()
+        self.server = MetricsServer(self.metrics, metrics_port) if metrics_port is not None else None
+        self.view = TerminalView(self.metrics) if view else None
+        if self.server is not None:
+            print(f"📈 Live metrics: http://127.0.0.1:{self.server.port}/metrics")
+
+    def close(self):
+        if self.view is not None:
+            self.view.close()
+        if self.server is not None:
+            self.server.close()
+
+
+def from_args(args):
+    """LiveSession for parsed add_arguments() options, or None when neither was given"""
+    if args.metrics_port is None and not args.live:
+        return None
+    return LiveSession(args.metrics_port, args.live)
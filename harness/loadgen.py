@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Asyncio load generation for the SvenskPå3 backend API
+Replays the SvenskPa3APITester user journey across many virtual users
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+from harness import API_BASE, MAX_DAILY_LESSONS
+from harness.metrics import LatencyHistogram
+
+TEST_PASSWORD = "LoadPassword123!"
+
+
+class EndpointStats:
+    """Latencies and outcomes for one (method, endpoint) pair, optionally also kept as raw samples"""
+
+    def __init__(self, sample=None):
+        self.histogram = LatencyHistogram()
+        self.statuses = {}
+        self.errors = 0
+        self.sample = sample
+
+    def record(self, status, elapsed, size=0):
+        self.histogram.record(elapsed)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if self.sample is not None:
+            self.sample(status, elapsed, size)
+
+    def fail(self, elapsed):
+        """A request that got no response"""
+        self.errors += 1
+        if self.sample is not None:
+            self.sample(0, elapsed)
+
+    @property
+    def count(self):
+        return self.histogram.count
+
+    def percentile(self, pct):
+        return self.histogram.percentile(pct)
+
+
+class LoadStats:
+    """Aggregated results of a load run; `samples` is an optional harness.samples.SampleRun"""
+
+    def __init__(self, samples=None):
+        self.endpoints = {}
+        self.samples = samples
+        self.journeys_started = 0
+        self.journeys_completed = 0
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+    def endpoint(self, method, endpoint):
+        key = (method, endpoint)
+        if key not in self.endpoints:
+            self.endpoints[key] = EndpointStats(self.samples.recorder(method, endpoint) if self.samples else None)
+        return self.endpoints[key]
+
+    @property
+    def elapsed(self):
+        end = self.finished_at or time.perf_counter()
+        return end - self.started_at
+
+    @property
+    def total_requests(self):
+        return sum(s.count + s.errors for s in self.endpoints.values())
+
+    def print_report(self):
+        elapsed = self.elapsed
+        print("=" * 78)
+        print("📊 LOAD TEST SUMMARY")
+        print("=" * 78)
+        print(f"Duration: {elapsed:.1f}s")
+        print(f"Journeys: {self.journeys_completed}/{self.journeys_started} completed")
+        print(f"Requests: {self.total_requests} ({self.total_requests / elapsed:.1f} req/s)")
+        print()
+        print(f"{'Endpoint':<24}{'Count':>8}{'Errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        print("-" * 78)
+        for (method, endpoint), stats in sorted(self.endpoints.items()):
+            failed = stats.errors + sum(c for s, c in stats.statuses.items() if s >= 400)
+            print(f"{method + ' ' + endpoint:<24}{stats.count:>8}{failed:>8}"
+                  f"{stats.percentile(50) * 1000:>10.1f}{stats.percentile(95) * 1000:>10.1f}"
+                  f"{stats.percentile(99) * 1000:>10.1f}"
+                  f"{stats.histogram.max_us / 1000:>10.1f}")
+        print()
+
+
+class AsyncAPIClient:
+    """HTTP client for one virtual user with its own cookie jar"""
+
+    def __init__(self, connector, stats, api_base=API_BASE, retry=None):
+        import aiohttp
+
+        self.api_base = api_base
+        self.stats = stats
+        self.retry = retry
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+        )
+        if retry is not None:
+            # aiohttp silently repeats idempotent requests once when a pooled connection was reset;
+            # the policy owns retries, so attempts=1 really means one attempt (as in aiohttp.test_utils)
+            self.session._retry_connection = False
+
+    async def request(self, method, endpoint, data=None):
+        """Send one request and record its latency, returns (status, body)
+
+        With a retry policy the latency covers every attempt and backoff, as a user would see it
+        """
+        stats = self.stats.endpoint(method, endpoint)
+        url = f"{self.api_base}/{endpoint}"
+        start = time.perf_counter()
+        if self.retry is None:
+            status, (body, size) = await self._attempt(method, url, data)
+        else:
+            status, (body, size) = await self.retry.call(
+                method, lambda timeout: self._attempt(method, url, data, timeout))
+        if status is None:
+            stats.fail(time.perf_counter() - start)
+        else:
+            stats.record(status, time.perf_counter() - start, size)
+        return status, body
+
+    async def _attempt(self, method, url, data, timeout=None):
+        """One try, returns (status, (body, size)) with status None when no response arrived"""
+        options = {} if timeout is None else {'timeout': timeout}
+        try:
+            async with self.session.request(method, url, json=data, **options) as response:
+                body = await response.json(content_type=None)
+                return response.status, (body or {}, response.content_length or 0)
+        except Exception:
+            return None, ({}, 0)
+
+    def set_token(self, token):
+        """Adopt an existing `token` cookie, e.g. from a UserPool"""
+        from yarl import URL
+        self.session.cookie_jar.update_cookies({'token': token}, response_url=URL(self.api_base))
+
+    async def close(self):
+        await self.session.close()
+
+
+async def run_journey(client, email, password=TEST_PASSWORD, authenticated=False, complete_lesson=True):
+    """signup → signin → auth/me → progress GET/POST → logout, stops on first failure
+
+    An already authenticated client skips the bcrypt-bound signup/signin and logout.
+    POST progress is skipped when `complete_lesson` is false or GET progress reports
+    the user at the daily cap, where it could only return 400
+    """
+    auth_steps = (
+        ('POST', 'auth/signup', {"email": email, "password": password, "displayName": "Load User"}),
+        ('POST', 'auth/signin', {"email": email, "password": password}),
+    )
+    app_steps = (
+        ('GET', 'auth/me', None),
+        ('GET', 'progress', None),
+        ('POST', 'progress', {}),
+    )
+    logout_steps = (
+        ('POST', 'auth/logout', None),
+    )
+    steps = app_steps if authenticated else auth_steps + app_steps + logout_steps
+    for method, endpoint, data in steps:
+        if (method, endpoint) == ('POST', 'progress') and not complete_lesson:
+            continue
+        status, body = await client.request(method, endpoint, data)
+        if status != 200:
+            return False
+        if (method, endpoint) == ('GET', 'progress') and body.get('completedToday'):
+            complete_lesson = False
+    return True
+
+
+async def run_load(concurrency=50, duration=30.0, users=None, api_base=API_BASE, client_factory=None, stats=None,
+                   user_pool=None, run_id=None, retry=None, live=None):
+    """Keep `concurrency` virtual users running journeys until `duration` or `users` is reached
+
+    With a user_pool, virtual users reuse its cached tokens instead of signing up and
+    stop completing lessons once a pooled user reaches MAX_DAILY_LESSONS; `retry`
+    is a harness.retry.RetryPolicy for the default aiohttp clients and `live` a
+    harness.live.LiveMetrics fed by every client
+    """
+    stats = stats or LoadStats()
+    deadline = time.monotonic() + duration
+    user_ids = itertools.count()
+    run_id = run_id or int(time.time())
+    connector = None
+    # Lessons this run has completed per pooled user
+    lessons = {}
+
+    if client_factory is None:
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=concurrency)
+
+        def client_factory():
+            return AsyncAPIClient(connector, stats, api_base, retry)
+
+    if live is not None:
+        client_factory = live.wrap(client_factory)
+
+    async def virtual_user():
+        while time.monotonic() < deadline:
+            user_id = next(user_ids)
+            if users is not None and user_id >= users:
+                return
+            stats.journeys_started += 1
+            client = client_factory()
+            try:
+                complete_lesson = True
+                if user_pool is not None:
+                    index = user_id % len(user_pool)
+                    complete_lesson = lessons.get(index, 0) < MAX_DAILY_LESSONS
+                    if complete_lesson:
+                        lessons[index] = lessons.get(index, 0) + 1
+                    client.set_token(user_pool.token(index))
+                if await run_journey(client, f"load_{run_id}_{user_id}@example.com",
+                                     authenticated=user_pool is not None, complete_lesson=complete_lesson):
+                    stats.journeys_completed += 1
+            finally:
+                await client.close()
+
+    try:
+        await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    finally:
+        stats.finished_at = time.perf_counter()
+        if connector is not None:
+            await connector.close()
+    return stats
+
+
+def warn_lesson_cap(pool_size, users):
+    """Point out runs whose pooled users will hit the daily lesson cap"""
+    if users is not None and users > pool_size * MAX_DAILY_LESSONS:
+        print(f"⚠️  {users} journeys over {pool_size} pooled users exceeds {MAX_DAILY_LESSONS} lessons per user "
+              f"per day; journeys past the cap skip POST progress")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asyncio load test for the SvenskPå3 API")
+    parser.add_argument('--concurrency', type=int, default=50, help="simultaneous virtual users")
+    parser.add_argument('--duration', type=float, default=30.0, help="run time in seconds")
+    parser.add_argument('--users', type=int, default=None, help="stop after this many journeys")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--in-process', action='store_true',
+                        help="drive the Python backend stand-in instead of a server, to measure harness overhead")
+    parser.add_argument('--user-pool', type=int, default=0, metavar='N',
+                        help="reuse N cached signed-in users and skip signup/signin")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="spread virtual users over N processes (see harness/workers.py)")
+    parser.add_argument('--samples', metavar='PATH', help="also record every request to a sample store (harness/samples.py)")
+    parser.add_argument('--label', default='loadgen', help="run label in the sample store")
+    parser.add_argument('--retry', metavar='POLICY',
+                        help="retry/timeout/backoff policy, e.g. 'attempts=3,timeout=500ms,budget=0.1' "
+                             "(see harness/retry.py)")
+    from harness import live
+    live.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.workers > 1:
+        if args.samples:
+            parser.error("--samples records from a single process; drop --workers")
+        if args.retry:
+            parser.error("--retry counts attempts in a single process; drop --workers")
+        if args.metrics_port is not None or args.live:
+            parser.error("live metrics watch a single process; drop --workers")
+        from harness import workers
+        return workers.main(argv)
+
+    print("🚀 Starting SvenskPå3 Load Test")
+    print(f"API Base: {args.api_base}")
+    print(f"Concurrency: {args.concurrency}, Duration: {args.duration}s, Users: {args.users or 'unlimited'}")
+    print()
+
+    store = None
+    if args.samples:
+        from harness.samples import SampleStore
+        store = SampleStore(args.samples)
+    stats = LoadStats(store.start_run(args.label) if store else None)
+    retry = None
+    if args.retry:
+        from harness.retry import parse_policy
+        retry = parse_policy(args.retry)
+    client_factory = None
+    session_factory = None
+    if args.in_process:
+        import requests
+
+        from harness.fake_backend import InMemoryBackend, InProcessAsyncClient, install
+        backend = InMemoryBackend()
+
+        def client_factory():
+            return InProcessAsyncClient(backend, stats)
+
+        def session_factory():
+            return install(requests.Session(), backend, args.api_base.rsplit('/api', 1)[0])
+
+    user_pool = None
+    if args.user_pool:
+        from harness.user_pool import USER_POOL_FILE, UserPool
+        user_pool = UserPool(
+            args.user_pool,
+            path=None if args.in_process else USER_POOL_FILE,
+            api_base=args.api_base,
+            session_factory=session_factory,
+        ).ensure()
+        print(f"User pool: {len(user_pool.users)} users ({user_pool.signups} signups, {user_pool.signins} signins)")
+        warn_lesson_cap(len(user_pool.users), args.users)
+        print()
+
+    session = live.from_args(args)
+    try:
+        asyncio.run(run_load(args.concurrency, args.duration, args.users, args.api_base, client_factory, stats,
+                             user_pool, retry=retry, live=session.metrics if session else None))
+    finally:
+        if session is not None:
+            session.close()
+        if store is not None:
+            stats.samples.close()
+            store.close()
+    stats.print_report()
+    if retry is not None:
+        summary = retry.summary()
+        print(f"Retries: {summary['retries']} ({summary['amplification']:.2f}x attempts per request), "
+              f"gave up {summary['gave_up']}, budget denied {summary['budget_denied']}")
+    if store is not None:
+        print(f"Samples: run {stats.samples.run_id} in {args.samples}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
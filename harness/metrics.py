@@ -0,0 +1,179 @@
+"""
+Bounded-memory latency histograms for the API testers
+HDR-style log-linear buckets: exact below 128µs, ~1.6% relative error above
+"""
+
+import json
+import threading
+from array import array
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# Values are stored in whole microseconds, clamped at ~19 hours
+MAX_TRACKABLE_US = (1 << 36) - 1
+BUCKET_COUNT = ((36 - SUB_BUCKET_BITS) << (SUB_BUCKET_BITS - 1)) + SUB_BUCKETS
+
+
+def bucket_index(value_us):
+    """Bucket holding `value_us`"""
+    if value_us < SUB_BUCKETS:
+        return max(0, value_us)
+    value_us = min(value_us, MAX_TRACKABLE_US)
+    shift = value_us.bit_length() - SUB_BUCKET_BITS
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value_us >> shift)
+
+
+def bucket_bounds(index):
+    """Inclusive (low, high) microsecond range of a bucket"""
+    if index < SUB_BUCKETS:
+        return index, index
+    shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+    mantissa = index - (shift << (SUB_BUCKET_BITS - 1))
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed-size histogram of latencies in microseconds"""
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def record_us(self, value_us):
+        value_us = int(value_us)
+        self.counts[bucket_index(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        self.max_us = max(self.max_us, value_us)
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+
+    def record(self, seconds):
+        self.record_us(seconds * 1_000_000)
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+
+    def percentile_us(self, pct):
+        """Upper bound of the bucket containing the pct-th percentile"""
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(bucket_bounds(index)[1], self.max_us)
+        return self.max_us
+
+    def percentile(self, pct):
+        """Percentile in seconds"""
+        return self.percentile_us(pct) / 1_000_000
+
+    @property
+    def mean_us(self):
+        return self.total_us / self.count if self.count else 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "min_ms": (self.min_us or 0) / 1000,
+            "mean_ms": self.mean_us / 1000,
+            "p50_ms": self.percentile_us(50) / 1000,
+            "p90_ms": self.percentile_us(90) / 1000,
+            "p99_ms": self.percentile_us(99) / 1000,
+            "max_ms": self.max_us / 1000,
+        }
+
+
+def parse_server_timing(header):
+    """{phase: milliseconds} from a `Server-Timing` header, repeated phases are summed"""
+    phases = {}
+    for entry in (header or '').split(','):
+        name, *params = [part.strip() for part in entry.split(';')]
+        if not name:
+            continue
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'dur':
+                try:
+                    phases[name] = phases.get(name, 0.0) + float(value.strip('"'))
+                except ValueError:
+                    pass
+    return phases
+
+
+class LatencyRecorder:
+    """Per-(method, endpoint, status) histograms, safe to share between threads
+
+    Requests that carry Server-Timing phases (or the transport's `connect` and
+    `exchange` split) also feed per-(method, endpoint, phase) histograms, next to
+    `client` (observed latency) and `network` (client minus the server's `total`)
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.phases = {}
+        self.lock = threading.Lock()
+
+    def record(self, method, endpoint, status, seconds, phases=None):
+        key = (method.upper(), endpoint, status if status is not None else 'ERR')
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(seconds)
+            if phases:
+                phases = {**phases, 'client': seconds * 1000}
+                if 'total' in phases:
+                    phases['network'] = max(0.0, phases['client'] - phases['total'])
+                for phase, milliseconds in phases.items():
+                    phase_key = (method.upper(), endpoint, phase)
+                    phase_histogram = self.phases.get(phase_key)
+                    if phase_histogram is None:
+                        phase_histogram = self.phases[phase_key] = LatencyHistogram()
+                    phase_histogram.record_us(milliseconds * 1000)
+
+    def rows(self):
+        with self.lock:
+            items = sorted(self.histograms.items(), key=lambda item: tuple(map(str, item[0])))
+        return [
+            {"method": method, "endpoint": endpoint, "status": status, **histogram.summary()}
+            for (method, endpoint, status), histogram in items
+        ]
+
+    def phase_rows(self):
+        with self.lock:
+            items = sorted(self.phases.items())
+        return [
+            {"method": method, "endpoint": endpoint, "phase": phase, **histogram.summary()}
+            for (method, endpoint, phase), histogram in items
+        ]
+
+    def print_table(self):
+        print(f"{'Request':<28}{'Status':>7}{'Count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        print("-" * 82)
+        for row in self.rows():
+            print(f"{row['method'] + ' ' + row['endpoint']:<28}{row['status']:>7}{row['count']:>7}"
+                  f"{row['p50_ms']:>10.1f}{row['p90_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+        phase_rows = self.phase_rows()
+        if phase_rows:
+            print()
+            print(f"{'Request phase':<28}{'Phase':>12}{'Count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+            print("-" * 77)
+            for row in phase_rows:
+                print(f"{row['method'] + ' ' + row['endpoint']:<28}{row['phase']:>12}{row['count']:>7}"
+                      f"{row['p50_ms']:>10.2f}{row['p90_ms']:>10.2f}{row['p99_ms']:>10.2f}")
+
+    def write_json(self, path, **extra):
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump({**extra, "latency": self.rows(), "phases": self.phase_rows()}, handle, indent=2)
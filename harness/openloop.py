@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Open-loop constant-arrival-rate load without coordinated omission
+Requests are launched on a fixed, stepped or Poisson schedule whether or not
+earlier responses have arrived, and latency is measured from the intended send
+time, so queueing delay under overload shows up in the percentiles.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from harness import API_BASE
+from harness.metrics import LatencyHistogram
+
+OPERATIONS = {
+    'signup': ('POST', 'auth/signup'),
+    'signin': ('POST', 'auth/signin'),
+    'progress': ('GET', 'progress'),
+    'me': ('GET', 'auth/me'),
+}
+
+
+def fixed_schedule(rate, duration):
+    """Intended send offsets (seconds) at a constant rate"""
+    interval = 1 / rate
+    return itertools.takewhile(lambda t: t < duration, (i * interval for i in itertools.count()))
+
+
+def stepped_schedule(rates, step_duration):
+    """Constant rate within each step, stepping through `rates`"""
+    offset = 0.0
+    for rate in rates:
+        interval = 1 / rate
+        step_end = offset + step_duration
+        t = offset
+        while t < step_end:
+            yield t
+            t += interval
+        offset = step_end
+
+
+def poisson_schedule(rate, duration, rng=None):
+    """Exponential inter-arrival times with mean 1/rate"""
+    rng = rng or random.Random()
+    t = rng.expovariate(rate)
+    while t < duration:
+        yield t
+        t += rng.expovariate(rate)
+
+
+class OpenLoopStats:
+    """Per-operation latency from intended send time and from actual send time"""
+
+    def __init__(self):
+        self.intended = {}
+        self.service = {}
+        self.statuses = {}
+        self.dropped = 0
+        self.scheduled = 0
+        self.outstanding = 0
+        self.peak_outstanding = 0
+        self.max_send_lag = 0.0
+
+    def record(self, op, status, intended_latency, service_latency):
+        self.intended.setdefault(op, LatencyHistogram()).record(intended_latency)
+        self.service.setdefault(op, LatencyHistogram()).record(service_latency)
+        key = (op, status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def print_report(self, elapsed):
+        completed = sum(h.count for h in self.intended.values())
+        print("=" * 86)
+        print("📊 OPEN-LOOP SUMMARY")
+        print("=" * 86)
+        print(f"Scheduled: {self.scheduled}, Completed: {completed}, Dropped: {self.dropped}, "
+              f"Achieved: {completed / elapsed:.1f} req/s")
+        print(f"Peak outstanding: {self.peak_outstanding}, Max scheduler lag: {self.max_send_lag * 1000:.1f}ms")
+        print()
+        print(f"{'Operation':<12}{'Count':>8}{'Errors':>8}"
+              f"{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'svc p50':>10}{'svc p99':>10}{'svc max':>10}")
+        print("-" * 86)
+        for op in sorted(self.intended):
+            intended, service = self.intended[op], self.service[op]
+            errors = sum(c for (o, s), c in self.statuses.items() if o == op and (s is None or s >= 400))
+            print(f"{op:<12}{intended.count:>8}{errors:>8}"
+                  f"{intended.percentile_us(50) / 1000:>10.1f}{intended.percentile_us(99) / 1000:>10.1f}"
+                  f"{intended.max_us / 1000:>10.1f}"
+                  f"{service.percentile_us(50) / 1000:>10.1f}{service.percentile_us(99) / 1000:>10.1f}"
+                  f"{service.max_us / 1000:>10.1f}")
+        print()
+        print("p50/p99/max are measured from the intended send time; svc columns from the actual send.")
+
+
+class HttpTransport:
+    """Shared aiohttp session; cookies are passed per request so one socket pool serves every user"""
+
+    def __init__(self, api_base=API_BASE, limit=0, timeout=None):
+        import aiohttp
+
+        self.api_base = api_base
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=limit),
+                                             cookie_jar=aiohttp.DummyCookieJar(),
+                                             timeout=aiohttp.ClientTimeout(total=timeout))
+
+    async def send(self, method, endpoint, data=None, token=None):
+        headers = {'Cookie': f"token={token}"} if token else None
+        async with self.session.request(method, f"{self.api_base}/{endpoint}", json=data,
+                                        headers=headers) as response:
+            await response.read()
+            return response.status
+
+    async def close(self):
+        await self.session.close()
+
+
+class InProcessTransport:
+    """Calls an InMemoryBackend directly"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def send(self, method, endpoint, data=None, token=None):
+        await asyncio.sleep(0)
+        body = json.dumps(data).encode() if data is not None else None
+        return self.backend.handle(method, endpoint, body, {'token': token} if token else {}).status
+
+    async def close(self):
+        pass
+
+
+def parse_mix(text):
+    """'signin=1,progress=4' -> ([ops], [weights])"""
+    ops, weights = [], []
+    for part in text.split(','):
+        op, _, weight = part.partition('=')
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation {op!r}, expected one of {sorted(OPERATIONS)}")
+        ops.append(op)
+        weights.append(float(weight or 1))
+    return ops, weights
+
+
+async def run_open_loop(transport, schedule, users, mix=(('progress',), (1.0,)), max_outstanding=10000,
+                        stats=None, rng=None):
+    """Launch one request per schedule offset; `users` is a list of (user dict, token) pairs"""
+    stats = stats or OpenLoopStats()
+    rng = rng or random.Random()
+    ops, weights = mix
+    tasks = set()
+    signups = itertools.count()
+    run_id = time.time_ns()
+    start = time.perf_counter()
+
+    async def fire(op, intended_at, user, token):
+        method, endpoint = OPERATIONS[op]
+        data = None
+        if op == 'signin':
+            data = {"email": user['email'], "password": user['password']}
+        elif op == 'signup':
+            data = {"email": f"openloop_{run_id}_{next(signups)}@example.com", "password": user['password'],
+                    "displayName": "Open Loop User"}
+        sent_at = time.perf_counter()
+        status = None
+        try:
+            status = await transport.send(method, endpoint, data, None if op in ('signin', 'signup') else token)
+        except Exception:
+            status = None
+        finally:
+            done = time.perf_counter()
+            stats.outstanding -= 1
+            stats.record(op, status, done - intended_at, done - sent_at)
+
+    for offset in schedule:
+        intended_at = start + offset
+        delay = intended_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        stats.max_send_lag = max(stats.max_send_lag, time.perf_counter() - intended_at)
+        stats.scheduled += 1
+        if stats.outstanding >= max_outstanding:
+            stats.dropped += 1
+            continue
+        user, token = users[rng.randrange(len(users))]
+        stats.outstanding += 1
+        stats.peak_outstanding = max(stats.peak_outstanding, stats.outstanding)
+        task = asyncio.create_task(fire(rng.choices(ops, weights)[0], intended_at, user, token))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop arrival-rate load test for the SvenskPå3 API")
+    parser.add_argument('--model', choices=('fixed', 'stepped', 'poisson'), default='fixed')
+    parser.add_argument('--rate', type=float, default=50.0, help="requests per second (fixed/poisson)")
+    parser.add_argument('--rates', default='10,25,50,100', help="stepped: comma-separated rates")
+    parser.add_argument('--step-duration', type=float, default=15.0, help="stepped: seconds per step")
+    parser.add_argument('--duration', type=float, default=30.0, help="fixed/poisson: run time in seconds")
+    parser.add_argument('--mix', default='signin=1,progress=4', help="weighted operations, e.g. signin=1,progress=4")
+    parser.add_argument('--users', type=int, default=20, help="pooled users to spread requests over")
+    parser.add_argument('--max-outstanding', type=int, default=10000, help="drop arrivals beyond this many in flight")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--in-process', action='store_true', help="run against the Python backend stand-in")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from harness.user_pool import USER_POOL_FILE, UserPool
+
+    rng = random.Random(args.seed)
+    session_factory = None
+    if args.in_process:
+        import requests
+
+        from harness.fake_backend import InMemoryBackend, install
+        backend = InMemoryBackend()
+
+        def session_factory():
+            return install(requests.Session(), backend, args.api_base.rsplit('/api', 1)[0])
+
+    pool = UserPool(args.users, path=None if args.in_process else USER_POOL_FILE, api_base=args.api_base,
+                    session_factory=session_factory).ensure()
+    users = [(user, pool.token(index)) for index, user in enumerate(pool.users[:args.users])]
+
+    if args.model == 'fixed':
+        schedule = fixed_schedule(args.rate, args.duration)
+    elif args.model == 'poisson':
+        schedule = poisson_schedule(args.rate, args.duration, rng)
+    else:
+        schedule = stepped_schedule([float(r) for r in args.rates.split(',')], args.step_duration)
+
+    print("🚀 SvenskPå3 Open-Loop Load Test")
+    print(f"API Base: {'in-process' if args.in_process else args.api_base}")
+    print(f"Model: {args.model}, Mix: {args.mix}, Users: {len(users)}")
+    print()
+
+    async def run():
+        transport = InProcessTransport(backend) if args.in_process else HttpTransport(args.api_base)
+        try:
+            return await run_open_loop(transport, schedule, users, parse_mix(args.mix), args.max_outstanding,
+                                       rng=rng)
+        finally:
+            await transport.close()
+
+    stats, elapsed = asyncio.run(run())
+    stats.print_report(elapsed)
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Retry, timeout and backoff policy for the harness transports
+Shared by loadgen.AsyncAPIClient and SvenskPa3APITester.send. A policy retries
+transport errors, timeouts and retryable statuses with capped exponential
+backoff and full jitter, and a retry budget stops retries from multiplying
+load once most requests are failing.
+"""
+
+import asyncio
+import random
+import time
+
+RETRY_STATUSES = (502, 503, 504)
+# POST /api/progress is not idempotent, so POST is only retried when asked for
+RETRY_METHODS = ('GET', 'PUT', 'HEAD')
+
+
+def parse_duration(text):
+    """'250ms', '1.5s' or a bare number of seconds"""
+    text = str(text).strip()
+    if text.endswith('ms'):
+        return float(text[:-2]) / 1000
+    if text.endswith('s'):
+        return float(text[:-1])
+    return float(text)
+
+
+class RetryPolicy:
+    """Per-attempt timeout, attempt limit, backoff and retry budget, with counters for the whole run
+
+    `budget` is the fraction of requests that may be retried (plus `reserve`
+    retries to get started); None leaves retries unbounded
+    """
+
+    def __init__(self, attempts=1, timeout=None, backoff=0.05, max_backoff=1.0, multiplier=2.0, jitter=True,
+                 statuses=RETRY_STATUSES, methods=RETRY_METHODS, budget=None, reserve=10, seed=None):
+        self.attempts = attempts
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.budget = budget
+        self.reserve = reserve
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.retries = 0
+        self.gave_up = 0
+        self.budget_denied = 0
+
+    def __str__(self):
+        parts = [f"attempts={self.attempts}"]
+        if self.timeout is not None:
+            parts.append(f"timeout={self.timeout * 1000:g}ms")
+        if self.attempts > 1:
+            parts.append(f"backoff={self.backoff * 1000:g}ms")
+        if self.budget is not None:
+            parts.append(f"budget={self.budget:g}")
+        return ','.join(parts)
+
+    def delay(self, retry):
+        """Seconds to wait before retry number `retry` (1-based)"""
+        ceiling = min(self.max_backoff, self.backoff * self.multiplier ** (retry - 1))
+        return self.rng.uniform(0, ceiling) if self.jitter else ceiling
+
+    def retryable(self, method, status):
+        """Whether an attempt that ended with `status` (None: no response) may be repeated"""
+        return method.upper() in self.methods and (status is None or status in self.statuses)
+
+    def _next_delay(self, method, status, attempt):
+        """Backoff before the next attempt, or None to give up with this result"""
+        if attempt >= self.attempts or not self.retryable(method, status):
+            if status is None or status in self.statuses:
+                self.gave_up += 1
+            return None
+        if self.budget is not None and self.retries >= self.budget * self.requests + self.reserve:
+            self.budget_denied += 1
+            self.gave_up += 1
+            return None
+        self.retries += 1
+        return self.delay(attempt)
+
+    async def call(self, method, attempt):
+        """Await `attempt(timeout)` -> (status, value) until it succeeds or the policy gives up"""
+        self.requests += 1
+        for number in range(1, self.attempts + 1):
+            status, value = await attempt(self.timeout)
+            delay = self._next_delay(method, status, number)
+            if delay is None:
+                return status, value
+            await asyncio.sleep(delay)
+
+    def call_sync(self, method, attempt):
+        """Blocking form of call() for requests-based clients"""
+        self.requests += 1
+        for number in range(1, self.attempts + 1):
+            status, value = attempt(self.timeout)
+            delay = self._next_delay(method, status, number)
+            if delay is None:
+                return status, value
+            time.sleep(delay)
+
+    @property
+    def amplification(self):
+        """Attempts sent per logical request"""
+        return (self.requests + self.retries) / self.requests if self.requests else 1.0
+
+    def summary(self):
+        return {
+            "policy": str(self),
+            "requests": self.requests,
+            "retries": self.retries,
+            "gave_up": self.gave_up,
+            "budget_denied": self.budget_denied,
+            "amplification": self.amplification,
+        }
+
+
+def parse_policy(spec, seed=None):
+    """RetryPolicy from 'attempts=3,timeout=500ms,backoff=50ms,max-backoff=1s,budget=0.1,methods=GET+POST'"""
+    options = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, value = item.partition('=')
+        name = name.strip().replace('-', '_')
+        if name == 'attempts':
+            options['attempts'] = int(value)
+        elif name in ('timeout', 'backoff', 'max_backoff'):
+            options[name] = parse_duration(value)
+        elif name in ('multiplier', 'budget'):
+            options[name] = float(value)
+        elif name == 'reserve':
+            options['reserve'] = int(value)
+        elif name == 'jitter':
+            options['jitter'] = value.lower() not in ('0', 'false', 'no', 'off')
+        elif name == 'statuses':
+            options['statuses'] = tuple(int(status) for status in value.split('+'))
+        elif name == 'methods':
+            options['methods'] = tuple(value.split('+'))
+        else:
+            raise ValueError(f"Unknown retry option: {name}")
+    return RetryPolicy(seed=seed, **options)
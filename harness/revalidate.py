@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Conditional-GET revalidation benchmark for repeated dashboard loads
+Each load fetches auth/me and progress twice per user: once revalidating with
+the ETag from the previous load (If-None-Match) and once unconditionally.
+Reports the 304 ratio, bytes saved and the latency difference, and counts a
+304 whose cached body differs from the fresh one as stale. A lesson is
+completed every --write-every loads so validators have to change.
+"""
+
+import argparse
+import random
+import time
+
+from harness import API_BASE
+from harness.bench import BenchClient
+from harness.metrics import LatencyHistogram
+
+DASHBOARD = ('auth/me', 'progress')
+MODES = ('plain', 'conditional')
+
+
+def wire_bytes(response):
+    """Body plus header bytes as sent, roughly: `Name: value\\r\\n` per header"""
+    return len(response.content) + sum(len(name) + len(value) + 4 for name, value in response.headers.items())
+
+
+class RevalidationStats:
+    def __init__(self):
+        self.latency = {}
+        self.bytes = {}
+        self.statuses = {}
+        self.stale = 0
+        self.errors = 0
+
+    def record(self, mode, endpoint, response, elapsed):
+        key = (mode, endpoint)
+        self.latency.setdefault(key, LatencyHistogram()).record(elapsed)
+        self.bytes[key] = self.bytes.get(key, 0) + wire_bytes(response)
+        statuses = self.statuses.setdefault(key, {})
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    def rows(self):
+        rows = []
+        for endpoint in DASHBOARD:
+            plain, conditional = self.latency.get(('plain', endpoint)), self.latency.get(('conditional', endpoint))
+            if not plain or not conditional:
+                continue
+            plain_bytes = self.bytes[('plain', endpoint)] / plain.count
+            conditional_bytes = self.bytes[('conditional', endpoint)] / conditional.count
+            rows.append({
+                "endpoint": endpoint,
+                "loads": conditional.count,
+                "not_modified_ratio": self.statuses[('conditional', endpoint)].get(304, 0) / conditional.count,
+                "plain_p50_ms": plain.percentile(50) * 1000,
+                "conditional_p50_ms": conditional.percentile(50) * 1000,
+                "plain_p95_ms": plain.percentile(95) * 1000,
+                "conditional_p95_ms": conditional.percentile(95) * 1000,
+                "plain_bytes": plain_bytes,
+                "conditional_bytes": conditional_bytes,
+                "bytes_saved": 1 - conditional_bytes / plain_bytes if plain_bytes else 0.0,
+            })
+        return rows
+
+    def print_report(self):
+        print("=" * 98)
+        print("📊 REVALIDATION SUMMARY")
+        print("=" * 98)
+        print(f"{'Endpoint':<12}{'Loads':>7}{'304s':>8}{'p50 plain':>11}{'p50 cond':>10}{'p95 plain':>11}"
+              f"{'p95 cond':>10}{'B plain':>10}{'B cond':>9}{'Saved':>9}")
+        print("-" * 98)
+        for row in self.rows():
+            print(f"{row['endpoint']:<12}{row['loads']:>7}{row['not_modified_ratio']:>8.1%}"
+                  f"{row['plain_p50_ms']:>11.2f}{row['conditional_p50_ms']:>10.2f}"
+                  f"{row['plain_p95_ms']:>11.2f}{row['conditional_p95_ms']:>10.2f}"
+                  f"{row['plain_bytes']:>10.0f}{row['conditional_bytes']:>9.0f}{row['bytes_saved']:>9.1%}")
+        print()
+        print(f"Stale 304s: {self.stale}, request errors: {self.errors}")
+        print()
+
+
+class DashboardUser:
+    """A signed-in session with the browser-style ETag cache for the dashboard's GETs"""
+
+    def __init__(self, session):
+        self.session = session
+        self.cache = {}
+
+
+def timed_get(session, url, headers=None):
+    start = time.perf_counter()
+    response = session.get(url, headers=headers)
+    return response, time.perf_counter() - start
+
+
+def dashboard_load(user, api_base, stats, rng):
+    """One load in both modes, in random order so neither always runs second"""
+    fresh = {}
+    cached = {}
+    for mode in rng.sample(MODES, len(MODES)):
+        for endpoint in DASHBOARD:
+            url = f"{api_base}/{endpoint}"
+            headers = None
+            if mode == 'conditional' and url in user.cache:
+                headers = {'If-None-Match': user.cache[url][0]}
+            response, elapsed = timed_get(user.session, url, headers)
+            if response.status_code not in (200, 304):
+                stats.errors += 1
+                continue
+            stats.record(mode, endpoint, response, elapsed)
+            if mode == 'plain':
+                fresh[endpoint] = response.json()
+            elif response.status_code == 304:
+                cached[endpoint] = user.cache[url][1]
+            else:
+                cached[endpoint] = response.json()
+                user.cache[url] = (response.headers.get('ETag'), cached[endpoint])
+    stats.stale += sum(1 for endpoint, body in cached.items() if endpoint in fresh and body != fresh[endpoint])
+
+
+def run(api_base, users=20, loads=50, write_every=5, session_factory=None, history=None, seed=None, report=print):
+    """Drive `loads` dashboard loads for each of `users` users, returns RevalidationStats
+
+    `history(user_id)` may seed earlier daily_progress so the progress array has a realistic size
+    """
+    rng = random.Random(seed)
+    client = BenchClient(api_base, session_factory)
+    dashboard_users = []
+    for _ in range(users):
+        session, _ = client.signed_in()
+        if history is not None:
+            history(session.get(f"{api_base}/auth/me").json()['id'])
+        dashboard_users.append(DashboardUser(session))
+    report(f"   {users} users signed in")
+
+    stats = RevalidationStats()
+    for load in range(loads):
+        for user in dashboard_users:
+            if write_every and load % write_every == write_every - 1:
+                user.session.post(f"{api_base}/progress", json={})
+            dashboard_load(user, api_base, stats, rng)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure ETag revalidation on repeated dashboard loads")
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--loads', type=int, default=50, help="dashboard loads per user")
+    parser.add_argument('--write-every', type=int, default=5, help="complete a lesson every N loads (0 never)")
+    parser.add_argument('--history-days', type=int, default=30, help="--in-process: seed this much history per user")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--in-process', action='store_true', help="run against the Python backend stand-in")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    print("🔁 SvenskPå3 Revalidation Benchmark")
+    print(f"API Base: {'in-process' if args.in_process else args.api_base}")
+    print(f"Users: {args.users}, Loads: {args.loads}, Write every: {args.write_every or 'never'}")
+    print()
+
+    session_factory = history = None
+    if args.in_process:
+        from datetime import datetime, timedelta, timezone
+
+        import requests
+
+        from harness.fake_backend import InMemoryBackend, install
+        from harness.seeder import MemoryTarget, progress_chain
+        backend = InMemoryBackend()
+        target = MemoryTarget(backend)
+        rng = random.Random(args.seed)
+        yesterday = datetime.now(timezone.utc).date() - timedelta(days=1)
+
+        def session_factory():
+            return install(requests.Session(), backend, args.api_base.rsplit('/api', 1)[0])
+
+        def history(user_id):
+            if args.history_days:
+                target.insert('daily_progress', list(progress_chain(user_id, yesterday, args.history_days, rng)))
+
+    stats = run(args.api_base, args.users, args.loads, args.write_every, session_factory, history, args.seed)
+    stats.print_report()
+    return stats
+
+
+if __name__ == "__main__":
+    stats = main()
+    exit(1 if stats.stale or stats.errors else 0)
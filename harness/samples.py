@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Columnar per-request sample store for load-test runs
+Samples (offset from run start, endpoint id, status, latency µs, bytes) are
+kept in array-backed columns, 20 bytes each, and flushed incrementally
+to SQLite as zlib-compressed column chunks keyed by run. Every flush also
+folds the chunk into per-second, per-endpoint histogram rollups. At close,
+per-run summaries are written. Percentile-over-time, error-burst and
+run-to-run trend queries read only the rollups and summaries.
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from array import array
+
+from harness.metrics import LatencyHistogram, bucket_bounds, bucket_index
+
+SAMPLES_FILE = os.getenv('SAMPLES_FILE', 'samples.db')
+# Column name -> array typecode; offsets are µs since the run started
+COLUMNS = (('t_us', 'q'), ('endpoint', 'H'), ('status', 'H'), ('latency_us', 'I'), ('bytes', 'I'))
+MAX_UINT32 = (1 << 32) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY, label TEXT, started_at REAL, finished_at REAL, samples INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS endpoints (
+    run_id TEXT, endpoint_id INTEGER, method TEXT, endpoint TEXT, PRIMARY KEY (run_id, endpoint_id)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    run_id TEXT, seq INTEGER, count INTEGER, first_us INTEGER, last_us INTEGER,
+    t_us BLOB, endpoint BLOB, status BLOB, latency_us BLOB, bytes BLOB, PRIMARY KEY (run_id, seq)
+);
+CREATE TABLE IF NOT EXISTS seconds (
+    run_id TEXT, second INTEGER, endpoint_id INTEGER, count INTEGER, errors INTEGER, bytes INTEGER, buckets BLOB,
+    PRIMARY KEY (run_id, second, endpoint_id)
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    run_id TEXT, endpoint_id INTEGER, count INTEGER, errors INTEGER, p50_us INTEGER, p95_us INTEGER,
+    p99_us INTEGER, max_us INTEGER, PRIMARY KEY (run_id, endpoint_id)
+);
+"""
+
+
+def is_error(status):
+    """Transport failures (status 0) and 5xx count as errors; 4xx are expected answers"""
+    return status == 0 or status >= 500
+
+
+def pack_buckets(buckets):
+    """{bucket index: count} as a compact interleaved array('I') blob"""
+    packed = array('I')
+    for index in sorted(buckets):
+        packed.extend((index, buckets[index]))
+    return packed.tobytes()
+
+
+def unpack_buckets(blob):
+    packed = array('I')
+    packed.frombytes(blob)
+    return dict(zip(packed[::2], packed[1::2]))
+
+
+def histogram_from(bucket_maps):
+    """LatencyHistogram rebuilt from rollup bucket maps; its max is the top bucket's upper bound"""
+    histogram = LatencyHistogram()
+    for buckets in bucket_maps:
+        for index, count in buckets.items():
+            histogram.counts[index] += count
+            histogram.count += count
+            histogram.max_us = max(histogram.max_us, bucket_bounds(index)[1])
+    return histogram
+
+
+class SampleRun:
+    """Array-backed columns for one run, flushed to the store every `flush_every` samples"""
+
+    def __init__(self, store, run_id, flush_every=50000):
+        self.store = store
+        self.run_id = run_id
+        self.flush_every = flush_every
+        self.started = time.perf_counter()
+        self.columns = {name: array(code) for name, code in COLUMNS}
+        self.endpoint_ids = {}
+        self.seq = 0
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def endpoint_id(self, method, endpoint):
+        key = (method.upper(), endpoint)
+        with self.lock:
+            if key not in self.endpoint_ids:
+                self.endpoint_ids[key] = len(self.endpoint_ids)
+                self.store.add_endpoint(self.run_id, self.endpoint_ids[key], *key)
+            return self.endpoint_ids[key]
+
+    def record(self, method, endpoint, status, seconds, size=0, at=None):
+        """One request; `status` None or 0 is a transport failure, `at` a perf_counter() timestamp"""
+        self._append(self.endpoint_id(method, endpoint), status, seconds, size, at)
+
+    def recorder(self, method, endpoint):
+        """record() bound to one endpoint, for LoadStats' EndpointStats"""
+        endpoint_id = self.endpoint_id(method, endpoint)
+        return lambda status, seconds, size=0: self._append(endpoint_id, status, seconds, size)
+
+    def _append(self, endpoint_id, status, seconds, size, at=None):
+        offset_us = int(((at if at is not None else time.perf_counter()) - self.started) * 1_000_000)
+        with self.lock:
+            columns = self.columns
+            columns['t_us'].append(offset_us)
+            columns['endpoint'].append(endpoint_id)
+            columns['status'].append(status or 0)
+            columns['latency_us'].append(min(int(seconds * 1_000_000), MAX_UINT32))
+            columns['bytes'].append(min(size or 0, MAX_UINT32))
+            if len(columns['t_us']) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        columns = self.columns
+        if not columns['t_us']:
+            return
+        self.store.write_chunk(self.run_id, self.seq, columns)
+        self.seq += 1
+        self.total += len(columns['t_us'])
+        self.columns = {name: array(code) for name, code in COLUMNS}
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def close(self):
+        self.flush()
+        self.store.finish_run(self.run_id, self.total)
+
+
+class SampleStore:
+    """SQLite file of runs, column chunks, per-second rollups and per-run summaries"""
+
+    def __init__(self, path=SAMPLES_FILE):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def start_run(self, label='', run_id=None, flush_every=50000):
+        run_id = run_id or f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        with self.lock, self.db:
+            self.db.execute("INSERT INTO runs (run_id, label, started_at) VALUES (?, ?, ?)",
+                            (run_id, label, time.time()))
+        return SampleRun(self, run_id, flush_every)
+
+    def add_endpoint(self, run_id, endpoint_id, method, endpoint):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO endpoints VALUES (?, ?, ?, ?)",
+                            (run_id, endpoint_id, method, endpoint))
+
+    def write_chunk(self, run_id, seq, columns):
+        """Store one chunk of columns and merge it into the per-second rollups"""
+        t_us = columns['t_us']
+        rollups = {}
+        for offset, endpoint, status, latency, size in zip(t_us, columns['endpoint'], columns['status'],
+                                                          columns['latency_us'], columns['bytes']):
+            key = (offset // 1_000_000, endpoint)
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollup = rollups[key] = [0, 0, 0, {}]
+            rollup[0] += 1
+            rollup[1] += is_error(status)
+            rollup[2] += size
+            index = bucket_index(latency)
+            rollup[3][index] = rollup[3].get(index, 0) + 1
+
+        with self.lock, self.db:
+            self.db.execute("INSERT INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (run_id, seq, len(t_us), t_us[0], t_us[-1],
+                             *(zlib.compress(columns[name].tobytes()) for name, _ in COLUMNS)))
+            for (second, endpoint), (count, errors, size, buckets) in rollups.items():
+                # A second can straddle two chunks
+                existing = self.db.execute(
+                    "SELECT count, errors, bytes, buckets FROM seconds WHERE run_id = ? AND second = ? "
+                    "AND endpoint_id = ?", (run_id, second, endpoint)).fetchone()
+                if existing:
+                    count, errors, size = count + existing[0], errors + existing[1], size + existing[2]
+                    for index, bucket_count in unpack_buckets(existing[3]).items():
+                        buckets[index] = buckets.get(index, 0) + bucket_count
+                self.db.execute("INSERT OR REPLACE INTO seconds VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (run_id, second, endpoint, count, errors, size, pack_buckets(buckets)))
+
+    def finish_run(self, run_id, samples):
+        """Record per-endpoint summaries so trend queries never touch the rollups"""
+        per_endpoint = {}
+        for endpoint, count, errors, blob in self.db.execute(
+                "SELECT endpoint_id, count, errors, buckets FROM seconds WHERE run_id = ?", (run_id,)):
+            entry = per_endpoint.setdefault(endpoint, [0, 0, []])
+            entry[0] += count
+            entry[1] += errors
+            entry[2].append(unpack_buckets(blob))
+        with self.lock, self.db:
+            for endpoint, (count, errors, buckets) in per_endpoint.items():
+                histogram = histogram_from(buckets)
+                self.db.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                (run_id, endpoint, count, errors, histogram.percentile_us(50),
+                                 histogram.percentile_us(95), histogram.percentile_us(99), histogram.max_us))
+            self.db.execute("UPDATE runs SET finished_at = ?, samples = ? WHERE run_id = ?",
+                            (time.time(), samples, run_id))
+
+    # Queries
+
+    def resolve(self, run_id):
+        """'latest' or a prefix -> full run id"""
+        if run_id in (None, 'latest'):
+            row = self.db.execute("SELECT run_id FROM runs ORDER BY started_at DESC LIMIT 1").fetchone()
+        else:
+            row = self.db.execute("SELECT run_id FROM runs WHERE run_id LIKE ? ORDER BY started_at DESC LIMIT 1",
+                                  (f"{run_id}%",)).fetchone()
+        if row is None:
+            raise KeyError(f"No run matching {run_id!r} in {self.path}")
+        return row[0]
+
+    def runs(self, label=None, limit=20):
+        query = "SELECT run_id, label, started_at, finished_at, samples FROM runs"
+        params = ()
+        if label:
+            query += " WHERE label = ?"
+            params = (label,)
+        rows = self.db.execute(query + " ORDER BY started_at DESC LIMIT ?", (*params, limit)).fetchall()
+        return [dict(zip(('run_id', 'label', 'started_at', 'finished_at', 'samples'), row)) for row in rows]
+
+    def endpoint_ids(self, run_id, endpoint=None):
+        """{endpoint_id: 'METHOD endpoint'}, optionally only those whose name contains `endpoint`"""
+        rows = self.db.execute("SELECT endpoint_id, method, endpoint FROM endpoints WHERE run_id = ?", (run_id,))
+        names = {endpoint_id: f"{method} {path}" for endpoint_id, method, path in rows}
+        return {key: name for key, name in names.items() if not endpoint or endpoint in name}
+
+    def percentiles_over_time(self, run_id, window=10, percentiles=(50, 95, 99), endpoint=None):
+        """One row per `window` seconds: start, count, errors and latency percentiles in ms"""
+        run_id = self.resolve(run_id)
+        ids = self.endpoint_ids(run_id, endpoint)
+        windows = {}
+        for second, endpoint_id, count, errors, blob in self.db.execute(
+                "SELECT second, endpoint_id, count, errors, buckets FROM seconds WHERE run_id = ? ORDER BY second",
+                (run_id,)):
+            if endpoint_id not in ids:
+                continue
+            entry = windows.setdefault(second // window * window, [0, 0, []])
+            entry[0] += count
+            entry[1] += errors
+            entry[2].append(unpack_buckets(blob))
+        rows = []
+        for start, (count, errors, buckets) in sorted(windows.items()):
+            histogram = histogram_from(buckets)
+            rows.append({"start_s": start, "count": count, "errors": errors,
+                         **{f"p{pct}_ms": histogram.percentile_us(pct) / 1000 for pct in percentiles}})
+        return rows
+
+    def error_bursts(self, run_id, min_errors=1, max_gap=1):
+        """Runs of seconds with at least `min_errors` errors, merged across gaps up to `max_gap` seconds"""
+        run_id = self.resolve(run_id)
+        seconds = self.db.execute(
+            "SELECT second, SUM(count), SUM(errors) FROM seconds WHERE run_id = ? GROUP BY second "
+            "HAVING SUM(errors) >= ? ORDER BY second", (run_id, min_errors)).fetchall()
+        bursts = []
+        for second, count, errors in seconds:
+            if bursts and second - bursts[-1]['end_s'] <= max_gap:
+                burst = bursts[-1]
+                burst['end_s'] = second
+                burst['requests'] += count
+                burst['errors'] += errors
+            else:
+                bursts.append({"start_s": second, "end_s": second, "requests": count, "errors": errors})
+        return bursts
+
+    def trend(self, label=None, endpoint=None, limit=20):
+        """Per-run, per-endpoint summaries, oldest first"""
+        runs = list(reversed(self.runs(label, limit)))
+        rows = []
+        for run in runs:
+            ids = self.endpoint_ids(run['run_id'], endpoint)
+            for endpoint_id, count, errors, p50, p95, p99, max_us in self.db.execute(
+                    "SELECT endpoint_id, count, errors, p50_us, p95_us, p99_us, max_us FROM summaries "
+                    "WHERE run_id = ? ORDER BY endpoint_id", (run['run_id'],)):
+                if endpoint_id in ids:
+                    rows.append({"run_id": run['run_id'], "label": run['label'], "endpoint": ids[endpoint_id],
+                                 "count": count, "error_rate": errors / count if count else 0.0,
+                                 "p50_ms": p50 / 1000, "p95_ms": p95 / 1000, "p99_ms": p99 / 1000,
+                                 "max_ms": max_us / 1000})
+        return rows
+
+    def columns(self, run_id):
+        """Every raw sample of a run as {column: array}, for ad-hoc analysis"""
+        run_id = self.resolve(run_id)
+        result = {name: array(code) for name, code in COLUMNS}
+        for row in self.db.execute(
+                "SELECT t_us, endpoint, status, latency_us, bytes FROM chunks WHERE run_id = ? ORDER BY seq",
+                (run_id,)):
+            for (name, _), blob in zip(COLUMNS, row):
+                result[name].frombytes(zlib.decompress(blob))
+        return result
+
+    def close(self):
+        self.db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query load-test samples recorded with --samples")
+    parser.add_argument('--db', default=SAMPLES_FILE)
+    commands = parser.add_subparsers(dest='command', required=True)
+    runs = commands.add_parser('runs', help="list recorded runs")
+    runs.add_argument('--label')
+    over_time = commands.add_parser('percentiles', help="latency percentiles per time window")
+    over_time.add_argument('run', nargs='?', default='latest')
+    over_time.add_argument('--window', type=int, default=10, help="seconds per row")
+    over_time.add_argument('--endpoint', help="only endpoints containing this, e.g. 'GET progress'")
+    bursts = commands.add_parser('errors', help="bursts of 5xx and transport errors")
+    bursts.add_argument('run', nargs='?', default='latest')
+    bursts.add_argument('--min-errors', type=int, default=1, help="errors per second to count as bursting")
+    bursts.add_argument('--max-gap', type=int, default=1, help="merge bursts this many seconds apart")
+    trend = commands.add_parser('trend', help="per-endpoint percentiles across runs")
+    trend.add_argument('--label')
+    trend.add_argument('--endpoint')
+    trend.add_argument('--limit', type=int, default=20, help="most recent runs to include")
+    args = parser.parse_args(argv)
+
+    store = SampleStore(args.db)
+    try:
+        if args.command == 'runs':
+            rows = store.runs(args.label)
+            print(f"{'Run':<28}{'Label':<14}{'Started':<21}{'Duration':>10}{'Samples':>10}")
+            for run in rows:
+                duration = f"{run['finished_at'] - run['started_at']:.1f}s" if run['finished_at'] else 'open'
+                started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run['started_at']))
+                print(f"{run['run_id']:<28}{run['label'] or '-':<14}{started:<21}{duration:>10}{run['samples']:>10}")
+        elif args.command == 'percentiles':
+            rows = store.percentiles_over_time(args.run, args.window, endpoint=args.endpoint)
+            print(f"{'Window':>8}{'Count':>9}{'Errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+            for row in rows:
+                print(f"{row['start_s']:>7}s{row['count']:>9}{row['errors']:>8}"
+                      f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+        elif args.command == 'errors':
+            rows = store.error_bursts(args.run, args.min_errors, args.max_gap)
+            for row in rows:
+                print(f"   {row['start_s']}s-{row['end_s']}s: {row['errors']} errors in {row['requests']} requests")
+            print(f"{len(rows)} error bursts")
+        else:
+            rows = store.trend(args.label, args.endpoint, args.limit)
+            print(f"{'Run':<28}{'Endpoint':<24}{'Count':>8}{'Err %':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+            for row in rows:
+                print(f"{row['run_id']:<28}{row['endpoint']:<24}{row['count']:>8}{row['error_rate']:>7.1%}"
+                      f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}")
+    finally:
+        store.close()
+    return rows
+
+
+if __name__ == "__main__":
+    main()
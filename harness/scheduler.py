@@ -0,0 +1,74 @@
+"""
+Dependency-aware parallel scheduler for tester methods
+Tests declare the state they need and which tests must precede them on the same
+user; independent branches then run concurrently, each with its own tester.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def requires(*states, after=()):
+    """Declare what a test needs before it runs
+
+    states: 'session' (signed-in user) or 'lesson' (lesson completed today),
+            provisioned through the tester's ensure_state()
+    after:  names of tests whose side effects this test builds on; they run
+            first, in the same branch and on the same user
+    """
+    def decorate(func):
+        func.requires = tuple(states)
+        func.after = tuple(after)
+        return func
+    return decorate
+
+
+def plan_branches(owner, names):
+    """Split test names into branches linked by `after`, keeping declaration order"""
+    parent = {name: name for name in names}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for name in names:
+        for dependency in getattr(getattr(owner, name), 'after', ()):
+            if dependency not in parent:
+                raise ValueError(f"{name} runs after unknown test {dependency}")
+            parent[find(name)] = find(dependency)
+
+    branches = {}
+    for name in names:
+        branches.setdefault(find(name), []).append(name)
+    return list(branches.values())
+
+
+def run_branch(tester, names):
+    """Run one branch on one tester, returns {name: passed}"""
+    results = {}
+    for name in names:
+        test = getattr(tester, name)
+        try:
+            for state in getattr(test, 'requires', ()):
+                tester.ensure_state(state)
+            results[name] = bool(test())
+        except Exception as e:
+            print(f"❌ {name} raised {e!r}")
+            results[name] = False
+    return results
+
+
+def run_parallel(owner, tester_factory, names, max_workers=None):
+    """Run `names` with independent branches in parallel, returns results in `names` order
+
+    owner is the tester class the methods are declared on; tester_factory builds
+    a fresh tester (and therefore a fresh user) for every branch
+    """
+    branches = plan_branches(owner, names)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(branches)) as pool:
+        futures = [pool.submit(run_branch, tester_factory(), branch) for branch in branches]
+        for future in futures:
+            results.update(future.result())
+    return [results[name] for name in names]
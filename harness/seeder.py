@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Bulk synthetic history seeder for the `users` and `daily_progress` collections
+Writes consistent streakAfter / completionsCount / xpEarned chains in batches,
+either to MongoDB (pymongo) or to an in-memory backend stand-in.
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from harness import DAILY_XP_PER_LESSON, MAX_DAILY_LESSONS
+from harness.fake_backend import create_token
+
+SEED_PASSWORD = "SeedPassword123!"
+# bcrypt.hash(SEED_PASSWORD, 10), shared by every seeded user so seeding never pays for bcrypt
+SEED_PASSWORD_HASH = "$2a$10$dWt3P3qUg.WAuzGjn5v//.CYWbkwkfvf0yNNzZgnL4jXpOIwAHpVi"
+ACTIVITY_MODELS = ('daily', 'uniform', 'streaky')
+
+
+def active_days(rng, days, activity='streaky', p_active=0.6, p_continue=0.85):
+    """Yield one bool per day, oldest first, for a user's history"""
+    p_return = min(1.0, p_active * (1 - p_continue) / max(1 - p_active, 1e-9))
+    active = rng.random() < p_active
+    for _ in range(days):
+        if activity == 'daily':
+            active = True
+        elif activity == 'uniform':
+            active = rng.random() < p_active
+        else:
+            active = rng.random() < (p_continue if active else p_return)
+        yield active
+
+
+def progress_chain(user_id, today, days, rng, activity='streaky', p_active=0.6, p_continue=0.85,
+                   mean_completions=2.0):
+    """daily_progress documents for one user, following handleCompleteLesson's streak rules"""
+    streak = 0
+    previous_active = False
+    first_day = today - timedelta(days=days - 1)
+    for offset, active in enumerate(active_days(rng, days, activity, p_active, p_continue)):
+        if not active:
+            previous_active = False
+            continue
+        streak = streak + 1 if previous_active else 1
+        previous_active = True
+        completions = min(MAX_DAILY_LESSONS, 1 + int(rng.expovariate(1 / max(mean_completions - 1, 1e-9))))
+        day = first_day + timedelta(days=offset)
+        completed_at = datetime(day.year, day.month, day.day, rng.randint(6, 22), rng.randint(0, 59),
+                                tzinfo=timezone.utc)
+        yield {
+            "userId": user_id,
+            "date": day.isoformat(),
+            "xpEarned": completions * DAILY_XP_PER_LESSON,
+            "completed": True,
+            "streakAfter": streak,
+            "completionsCount": completions,
+            "completedAt": completed_at,
+            "lastCompletionAt": completed_at,
+        }
+
+
+class MongoTarget:
+    """Batched insert_many into a real database"""
+
+    def __init__(self, mongo_url, drop=False):
+        from bson import ObjectId
+        from pymongo import MongoClient
+
+        self.object_id = ObjectId
+        self.client = MongoClient(mongo_url)
+        self.db = self.client.get_default_database()
+        if drop:
+            self.db.users.drop()
+            self.db.daily_progress.drop()
+
+    def new_id(self):
+        return self.object_id()
+
+    def insert(self, collection, documents):
+        if documents:
+            self.db[collection].insert_many(documents, ordered=False)
+
+    def close(self):
+        self.client.close()
+
+
+class MemoryTarget:
+    """Writes straight into an InMemoryBackend's dicts"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.password_hash = backend._hash_password(SEED_PASSWORD)
+
+    def new_id(self):
+        return os.urandom(12).hex()
+
+    def insert(self, collection, documents):
+        if collection == 'users':
+            for user in documents:
+                user = {**user, "password": self.password_hash, "createdAt": user['createdAt'].isoformat()}
+                self.backend.users[user['_id']] = user
+                self.backend.users_by_email[user['email']] = user
+        else:
+            for doc in documents:
+                doc = {**doc, "_id": os.urandom(12).hex(),
+                       "completedAt": doc['completedAt'].isoformat(),
+                       "lastCompletionAt": doc['lastCompletionAt'].isoformat()}
+                self.backend.daily_progress.setdefault(doc['userId'], {})[doc['date']] = doc
+
+    def close(self):
+        pass
+
+
+def seed(target, users=1000, days=90, activity='streaky', p_active=0.6, p_continue=0.85, mean_completions=2.0,
+         batch_size=5000, fixed_history=False, today=None, seed_value=None, run_id=None, on_batch=None):
+    """Seed `users` users with up to `days` days of history each, returns counters"""
+    rng = random.Random(seed_value)
+    today = today or datetime.now(timezone.utc).date()
+    run_id = run_id or int(time.time())
+    user_batch, progress_batch = [], []
+    counts = {"users": 0, "daily_progress": 0}
+
+    def flush(force=False):
+        if user_batch and (force or len(user_batch) >= batch_size):
+            target.insert('users', user_batch)
+            counts['users'] += len(user_batch)
+            user_batch.clear()
+        if progress_batch and (force or len(progress_batch) >= batch_size):
+            target.insert('daily_progress', progress_batch)
+            counts['daily_progress'] += len(progress_batch)
+            progress_batch.clear()
+            if on_batch:
+                on_batch(counts)
+
+    for index in range(users):
+        _id = target.new_id()
+        history = days if fixed_history else rng.randint(1, days)
+        email = f"seed_{run_id}_{index}@example.com"
+        user_batch.append({
+            "_id": _id,
+            "email": email,
+            "password": SEED_PASSWORD_HASH,
+            "displayName": f"Seed {index}",
+            "level": rng.choice(['beginner', 'intermediate', 'advanced']),
+            "goal": '',
+            "scenarios": ['survival', 'butikk'],
+            "plan": 'free',
+            "createdAt": datetime.combine(today - timedelta(days=history - 1), datetime.min.time(),
+                                          tzinfo=timezone.utc),
+        })
+        progress_batch.extend(progress_chain(str(_id), today, history, rng, activity, p_active, p_continue,
+                                             mean_completions))
+        flush()
+    flush(force=True)
+    return counts
+
+
+def seeded_token(user_id, secret=None):
+    """Cookie value that authenticates a seeded user without going through signin"""
+    return create_token(str(user_id), secret or os.getenv('JWT_SECRET', ''))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed synthetic users and daily_progress history")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=90, help="maximum history length per user")
+    parser.add_argument('--fixed-history', action='store_true', help="give every user exactly --days of history")
+    parser.add_argument('--activity', choices=ACTIVITY_MODELS, default='streaky')
+    parser.add_argument('--p-active', type=float, default=0.6, help="long-run share of active days")
+    parser.add_argument('--p-continue', type=float, default=0.85, help="streaky: chance an active day is followed by another")
+    parser.add_argument('--mean-completions', type=float, default=2.0, help="mean lessons per active day")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--mongo-url', default=os.getenv('MONGO_URL', 'mongodb://localhost:27017/svenskpa3'))
+    parser.add_argument('--drop', action='store_true', help="drop users and daily_progress first")
+    parser.add_argument('--in-memory', action='store_true', help="seed a throwaway InMemoryBackend instead")
+    args = parser.parse_args(argv)
+
+    if args.in_memory:
+        from harness.fake_backend import InMemoryBackend
+        target = MemoryTarget(InMemoryBackend())
+        print("🌱 Seeding in-memory backend")
+    else:
+        target = MongoTarget(args.mongo_url, args.drop)
+        print(f"🌱 Seeding {args.mongo_url}")
+
+    started = time.perf_counter()
+
+    def progress(counts):
+        elapsed = time.perf_counter() - started
+        print(f"   {counts['users']} users, {counts['daily_progress']} daily_progress "
+              f"({(counts['users'] + counts['daily_progress']) / elapsed:.0f} docs/s)", end='\r')
+
+    try:
+        counts = seed(target, args.users, args.days, args.activity, args.p_active, args.p_continue,
+                      args.mean_completions, args.batch_size, args.fixed_history, seed_value=args.seed,
+                      on_batch=progress)
+    finally:
+        target.close()
+
+    elapsed = time.perf_counter() - started
+    total = counts['users'] + counts['daily_progress']
+    print()
+    print(f"✅ Seeded {counts['users']} users and {counts['daily_progress']} daily_progress documents "
+          f"in {elapsed:.1f}s ({total / elapsed:.0f} docs/s)")
+    return counts
+
+
+if __name__ == "__main__":
+    main()
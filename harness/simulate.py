@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Multi-day streak simulation against the X-Test-Now test clock
+Walks many users through months of synthetic days, completing lessons at
+random times of day, and checks GET /api/progress (currentStreak, totalXP,
+completedToday, completedLessonsToday) and each POST's streak against an
+independent reference model. Needs a server started with ALLOW_TEST_CLOCK=1,
+or --in-process.
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+from harness import API_BASE, DAILY_XP_PER_LESSON, MAX_DAILY_LESSONS
+from harness.seeder import ACTIVITY_MODELS, active_days
+
+SIM_PASSWORD = "SimPassword123!"
+XP_WINDOW_DAYS = 30
+
+
+class ReferenceUser:
+    """What GET /api/progress should report, derived from accepted completions only"""
+
+    def __init__(self):
+        self.completions = {}
+
+    def complete(self, day):
+        """Expected (status, streak) of one POST /api/progress on `day`"""
+        if self.completions.get(day, 0) >= MAX_DAILY_LESSONS:
+            return 400, None
+        self.completions[day] = self.completions.get(day, 0) + 1
+        return 200, self.streak(day)
+
+    def streak(self, day):
+        """Consecutive completed days ending today, or yesterday if today has none yet"""
+        anchor = day if day in self.completions else day - timedelta(days=1)
+        length = 0
+        while anchor in self.completions:
+            length += 1
+            anchor -= timedelta(days=1)
+        return length
+
+    def expected(self, day):
+        window_start = day - timedelta(days=XP_WINDOW_DAYS)
+        today = self.completions.get(day, 0)
+        return {
+            "currentStreak": self.streak(day),
+            "totalXP": sum(DAILY_XP_PER_LESSON * count for d, count in self.completions.items()
+                           if window_start <= d <= day),
+            "completedToday": today >= MAX_DAILY_LESSONS,
+            "completedLessonsToday": today,
+        }
+
+
+class InProcessTarget:
+    """Calls an InMemoryBackend (with its test clock on) directly, skipping HTTP and JSON"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def signup(self, email):
+        result = self.backend.handle('POST', 'auth/signup',
+                                     {"email": email, "password": SIM_PASSWORD, "displayName": "Sim User"})
+        return result.cookies.get('token')
+
+    def request(self, method, endpoint, token, now):
+        result = self.backend.handle(method, endpoint, {} if method == 'POST' else None, {'token': token},
+                                     {'X-Test-Now': now.isoformat()})
+        return result.status, result.body
+
+
+class LiveTarget:
+    """requests against a server started with ALLOW_TEST_CLOCK=1, one session per thread"""
+
+    def __init__(self, api_base=API_BASE):
+        self.api_base = api_base
+        self.local = threading.local()
+
+    def _session(self):
+        if not hasattr(self.local, 'session'):
+            import requests
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def signup(self, email):
+        response = self._session().post(f"{self.api_base}/auth/signup",
+                                        json={"email": email, "password": SIM_PASSWORD, "displayName": "Sim User"})
+        return response.cookies.get('token')
+
+    def request(self, method, endpoint, token, now):
+        response = self._session().request(method, f"{self.api_base}/{endpoint}", json={} if method == 'POST' else None,
+                                           headers={'Cookie': f"token={token}", 'X-Test-Now': now.isoformat()})
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        return response.status_code, body
+
+
+class SimUser:
+    def __init__(self, email, token, plan):
+        self.email = email
+        self.token = token
+        self.plan = plan
+        self.model = ReferenceUser()
+
+
+def plan_attempts(rng, days, activity, p_active, mean_completions, cap_rate):
+    """POST attempts per day for one user; `cap_rate` of active days try to go past the daily cap"""
+    attempts = []
+    for active in active_days(rng, days, activity, p_active):
+        if not active:
+            attempts.append(0)
+        elif rng.random() < cap_rate:
+            attempts.append(MAX_DAILY_LESSONS + 1)
+        else:
+            attempts.append(min(MAX_DAILY_LESSONS, 1 + int(rng.expovariate(1 / max(mean_completions - 1, 1e-9)))))
+    return attempts
+
+
+def random_time(rng, day):
+    """A moment on `day` in UTC, including the seconds around midnight"""
+    second = rng.choice((0, 1, 86398, 86399)) if rng.random() < 0.1 else rng.randrange(86400)
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(seconds=second)
+
+
+def simulate_day(target, user, day, attempts, rng, check):
+    """Run one user's day, returns mismatches as (email, day, field, expected, actual)"""
+    mismatches = []
+    for _ in range(attempts):
+        status, body = target.request('POST', 'progress', user.token, random_time(rng, day))
+        expected_status, expected_streak = user.model.complete(day)
+        if status != expected_status:
+            mismatches.append((user.email, day, 'POST status', expected_status, status))
+        elif status == 200 and body.get('streak') != expected_streak:
+            mismatches.append((user.email, day, 'POST streak', expected_streak, body.get('streak')))
+    if check:
+        status, body = target.request('GET', 'progress', user.token, random_time(rng, day))
+        if status != 200:
+            mismatches.append((user.email, day, 'GET status', 200, status))
+        else:
+            for field, expected in user.model.expected(day).items():
+                if body.get(field) != expected:
+                    mismatches.append((user.email, day, field, expected, body.get(field)))
+    return mismatches
+
+
+def run(target, users=1000, days=90, start=None, activity='streaky', p_active=0.6, mean_completions=2.0,
+        cap_rate=0.02, check_every=1, workers=1, seed=None, report=print):
+    """Simulate `users` users over `days` days, returns (mismatches, requests)"""
+    rng = random.Random(seed)
+    start = start or datetime.now(timezone.utc).date()
+    run_id = time.time_ns()
+    report(f"   Signing up {users} users...")
+    with ThreadPoolExecutor(workers) as pool:
+        tokens = list(pool.map(target.signup, (f"sim_{run_id}_{index}@example.com" for index in range(users))))
+    sim_users = []
+    for index, token in enumerate(tokens):
+        if not token:
+            raise RuntimeError(f"Signup failed for sim user {index}")
+        plan = plan_attempts(random.Random(rng.random()), days, activity, p_active, mean_completions, cap_rate)
+        sim_users.append(SimUser(f"sim_{run_id}_{index}@example.com", token, plan))
+
+    mismatches = []
+    requests_sent = 0
+    user_rngs = [random.Random(rng.random()) for _ in sim_users]
+    with ThreadPoolExecutor(workers) as pool:
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            check = offset % check_every == 0 or offset == days - 1
+            results = pool.map(lambda pair: simulate_day(target, pair[0], day, pair[0].plan[offset], pair[1], check),
+                               zip(sim_users, user_rngs))
+            for result in results:
+                mismatches.extend(result)
+            requests_sent += sum(user.plan[offset] for user in sim_users) + (len(sim_users) if check else 0)
+            if (offset + 1) % 10 == 0 or offset == days - 1:
+                report(f"   Day {offset + 1}/{days} ({day.isoformat()}): {requests_sent} requests, "
+                       f"{len(mismatches)} mismatches")
+    return mismatches, requests_sent
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate months of lesson streaks with the X-Test-Now clock")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--start', type=date.fromisoformat, default=None, help="first simulated day (YYYY-MM-DD)")
+    parser.add_argument('--activity', choices=ACTIVITY_MODELS, default='streaky')
+    parser.add_argument('--p-active', type=float, default=0.6, help="long-run share of active days")
+    parser.add_argument('--mean-completions', type=float, default=2.0, help="mean lessons per active day")
+    parser.add_argument('--cap-rate', type=float, default=0.02, help="share of active days that hit the daily cap")
+    parser.add_argument('--check-every', type=int, default=1, help="GET /api/progress every N days")
+    parser.add_argument('--workers', type=int, default=8, help="concurrent users for --live")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--in-process', action='store_true', help="simulate against the Python backend stand-in")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.in_process:
+        from harness.fake_backend import InMemoryBackend
+        target = InProcessTarget(InMemoryBackend(test_clock=True))
+        workers = 1
+    else:
+        target = LiveTarget(args.api_base)
+        workers = args.workers
+
+    print("📅 SvenskPå3 Streak Simulation")
+    print(f"API Base: {'in-process' if args.in_process else args.api_base} (needs ALLOW_TEST_CLOCK=1)")
+    print(f"Users: {args.users}, Days: {args.days}, Activity: {args.activity}")
+    print()
+    started = time.perf_counter()
+    mismatches, requests_sent = run(target, args.users, args.days, args.start, args.activity, args.p_active,
+                                    args.mean_completions, args.cap_rate, args.check_every, workers, args.seed)
+    elapsed = time.perf_counter() - started
+    print()
+    print(f"Simulated {args.users * args.days} user-days with {requests_sent} requests in {elapsed:.1f}s")
+    if mismatches:
+        fields = {}
+        for mismatch in mismatches:
+            fields[mismatch[2]] = fields.get(mismatch[2], 0) + 1
+        print(f"❌ {len(mismatches)} mismatches: {', '.join(f'{f} {n}' for f, n in sorted(fields.items()))}")
+        for email, day, field, expected, actual in mismatches[:10]:
+            print(f"   {day} {email}: {field} expected {expected}, got {actual}")
+    else:
+        print("🎉 Server matches the reference model")
+    return mismatches
+
+
+if __name__ == "__main__":
+    exit(1 if main() else 0)
@@ -0,0 +1,249 @@
+"""
+Pluggable result sinks for the API testers
+Request and response bodies are kept as live objects and only serialized when
+a test fails or the chosen verbosity asks for them.
+"""
+
+import json
+import threading
+import time
+from xml.sax.saxutils import escape, quoteattr
+
+QUIET, TESTS, REQUESTS, BODIES = 0, 1, 2, 3
+
+
+class RequestRecord:
+    """One request/response pair, serialized on demand"""
+
+    __slots__ = ('method', 'url', 'data', 'status', 'elapsed', 'response', 'timestamp')
+
+    def __init__(self, method, url, data, status, elapsed, response=None):
+        self.method = method
+        self.url = url
+        self.data = data
+        self.status = status
+        self.elapsed = elapsed
+        self.response = response
+        self.timestamp = time.time()
+
+    @property
+    def response_data(self):
+        try:
+            return self.response.json()
+        except Exception:
+            return None
+
+    def body_text(self):
+        response_data = self.response_data
+        if response_data is not None:
+            return json.dumps(response_data, indent=2, ensure_ascii=False)
+        return self.response.text if self.response is not None else ''
+
+    def as_dict(self, with_bodies=False):
+        record = {
+            "ts": self.timestamp,
+            "method": self.method,
+            "url": self.url,
+            "status": self.status,
+            "elapsed_ms": round(self.elapsed * 1000, 3),
+        }
+        if with_bodies:
+            response_data = self.response_data
+            record["request"] = self.data
+            record["response"] = response_data if response_data is not None else (
+                self.response.text if self.response is not None else None)
+        return record
+
+
+class ResultSink:
+    """Base sink: remembers the requests of the running test, per thread"""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def _pending(self):
+        if not hasattr(self.local, 'requests'):
+            self.local.requests = []
+            self.local.started = time.perf_counter()
+        return self.local.requests
+
+    def start(self, title):
+        self.local.requests = []
+        self.local.started = time.perf_counter()
+
+    def request(self, record):
+        self._pending().append(record)
+
+    def test(self, name, success, details=""):
+        requests = self._pending()
+        elapsed = time.perf_counter() - self.local.started
+        self.local.requests = []
+        self.local.started = time.perf_counter()
+        self.emit_test(name, success, details, requests, elapsed)
+
+    def emit_test(self, name, success, details, requests, elapsed):
+        pass
+
+    def close(self):
+        pass
+
+
+class ConsoleSink(ResultSink):
+    """Prints to stdout; verbosity QUIET/TESTS/REQUESTS/BODIES, failures always show their requests"""
+
+    def __init__(self, verbosity=BODIES):
+        super().__init__()
+        self.verbosity = verbosity
+        self.lock = threading.Lock()
+
+    def start(self, title):
+        super().start(title)
+        if self.verbosity >= REQUESTS:
+            print(title)
+
+    def request(self, record):
+        super().request(record)
+        if self.verbosity >= REQUESTS:
+            with self.lock:
+                self._print_request(record, self.verbosity >= BODIES)
+
+    def _print_request(self, record, with_bodies):
+        print(f"   Request: {record.method} {record.url}")
+        if with_bodies and record.data:
+            print(f"   Data: {json.dumps(record.data, indent=2, ensure_ascii=False)}")
+        print(f"   Response Status: {record.status if record.status is not None else 'No response'}")
+        if with_bodies and record.response is not None:
+            print(f"   Response: {record.body_text()}")
+
+    def emit_test(self, name, success, details, requests, elapsed):
+        if self.verbosity == QUIET and success:
+            return
+        with self.lock:
+            if not success and self.verbosity < REQUESTS:
+                for record in requests:
+                    self._print_request(record, True)
+            status = "✅ PASS" if success else "❌ FAIL"
+            print(f"{status} {name}")
+            if details:
+                print(f"   Details: {details}")
+            print()
+
+
+class JsonlSink(ResultSink):
+    """Buffered JSON Lines writer, one line per request and per test"""
+
+    def __init__(self, path, buffer_size=1000, bodies=False):
+        super().__init__()
+        self.path = path
+        self.buffer_size = buffer_size
+        self.bodies = bodies
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.handle = open(path, 'w', encoding='utf-8')
+
+    def _write(self, lines):
+        with self.lock:
+            self.buffer.extend(lines)
+            if len(self.buffer) >= self.buffer_size:
+                self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            self.handle.write('\n'.join(self.buffer) + '\n')
+            self.buffer.clear()
+
+    def emit_test(self, name, success, details, requests, elapsed):
+        with_bodies = self.bodies or not success
+        lines = [json.dumps({"type": "request", "test": name, **r.as_dict(with_bodies)}, ensure_ascii=False, default=str)
+                 for r in requests]
+        lines.append(json.dumps({"type": "test", "test": name, "success": bool(success), "details": details,
+                                 "elapsed_ms": round(elapsed * 1000, 3)}, ensure_ascii=False))
+        self._write(lines)
+
+    def close(self):
+        with self.lock:
+            self._flush()
+            self.handle.close()
+
+
+class JUnitSink(ResultSink):
+    """Collects test outcomes and writes a JUnit XML report on close"""
+
+    def __init__(self, path, suite_name="SvenskPa3APITester"):
+        super().__init__()
+        self.path = path
+        self.suite_name = suite_name
+        self.cases = []
+        self.lock = threading.Lock()
+
+    def emit_test(self, name, success, details, requests, elapsed):
+        output = None
+        if not success:
+            output = '\n'.join(
+                f"{r.method} {r.url} -> {r.status}\n{r.body_text()}" for r in requests)
+        with self.lock:
+            self.cases.append((name, success, details, elapsed, output))
+
+    def close(self):
+        failures = sum(1 for case in self.cases if not case[1])
+        total_time = sum(case[3] for case in self.cases)
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<testsuite name={quoteattr(self.suite_name)} tests="{len(self.cases)}" '
+            f'failures="{failures}" errors="0" time="{total_time:.3f}">',
+        ]
+        for name, success, details, elapsed, output in self.cases:
+            lines.append(f'  <testcase classname={quoteattr(self.suite_name)} name={quoteattr(name)} '
+                         f'time="{elapsed:.3f}">')
+            if not success:
+                lines.append(f'    <failure message={quoteattr(details or "failed")}/>')
+                if output:
+                    lines.append(f'    <system-out>{escape(output)}</system-out>')
+            lines.append('  </testcase>')
+        lines.append('</testsuite>')
+        with open(self.path, 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(lines) + '\n')
+
+
+class SampleSink(ResultSink):
+    """Records every request into a harness.samples store run"""
+
+    def __init__(self, path, label="backend_test"):
+        super().__init__()
+        from harness.samples import SampleStore
+
+        self.store = SampleStore(path)
+        self.run = self.store.start_run(label)
+
+    def request(self, record):
+        endpoint = record.url.split('/api/', 1)[-1]
+        size = len(record.response.content) if record.response is not None else 0
+        self.run.record(record.method, endpoint, record.status, record.elapsed, size)
+
+    def close(self):
+        self.run.close()
+        self.store.close()
+
+
+class MultiSink(ResultSink):
+    """Fans every event out to several sinks"""
+
+    def __init__(self, *sinks):
+        super().__init__()
+        self.sinks = sinks
+
+    def start(self, title):
+        for sink in self.sinks:
+            sink.start(title)
+
+    def request(self, record):
+        for sink in self.sinks:
+            sink.request(record)
+
+    def test(self, name, success, details=""):
+        for sink in self.sinks:
+            sink.test(name, success, details)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Soak / endurance runs with server and client memory tracking
+Keeps the harness.journeys mix going for hours. Every --interval it samples the
+server's process tree from /proc (RSS, anonymous RSS, data segment), the
+client's tracemalloc and RSS, and that window's latency percentiles and error
+rate. At the end (after --warmup) it flags series that grow monotonically or
+drift, such as an unbounded cache or a connection that degrades, and prints
+how closely server memory tracks latency.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+from harness import API_BASE
+from harness.journeys import JourneyStats, run_journeys
+from harness.metrics import LatencyHistogram
+
+MEMORY_FIELDS = {'VmRSS': 'rss', 'RssAnon': 'anon', 'VmData': 'data'}
+# Series checked for monotonic growth, with the relative change that makes it a finding
+WATCHED = (
+    ('server_rss_mb', 0.10),
+    ('server_anon_mb', 0.10),
+    ('client_traced_mb', 0.10),
+    ('client_rss_mb', 0.10),
+    ('p95_ms', 0.20),
+    ('error_rate', None),
+)
+
+
+def process_tree(root):
+    """`root` and all its descendants, from the ppid field of /proc/*/stat"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as handle:
+                # comm may contain spaces; ppid is the second field after its closing parenthesis
+                ppid = int(handle.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(children.get(pid, ()))
+    return tree
+
+
+def proc_memory(pids):
+    """Summed {'rss', 'anon', 'data'} bytes from /proc/<pid>/status, skipping processes that exited"""
+    totals = dict.fromkeys(MEMORY_FIELDS.values(), 0)
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/status') as handle:
+                for line in handle:
+                    name, _, value = line.partition(':')
+                    if name in MEMORY_FIELDS:
+                        totals[MEMORY_FIELDS[name]] += int(value.split()[0]) * 1024
+        except OSError:
+            continue
+    return totals
+
+
+def find_listener(port):
+    """Pid of the local process listening on TCP `port`, or None"""
+    inodes = set()
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table) as handle:
+                next(handle)
+                for line in handle:
+                    fields = line.split()
+                    if fields[3] == '0A' and int(fields[1].rsplit(':', 1)[1], 16) == port:
+                        inodes.add(fields[9])
+        except OSError:
+            continue
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            for fd in os.listdir(f'/proc/{entry}/fd'):
+                target = os.readlink(f'/proc/{entry}/fd/{fd}')
+                if target.startswith('socket:[') and target[8:-1] in inodes:
+                    return int(entry)
+        except OSError:
+            continue
+    return None
+
+
+class WindowRecorder:
+    """Stands in for a SampleRun on LoadStats, keeping only the current interval's latencies"""
+
+    def __init__(self):
+        self.swap()
+
+    def recorder(self, method, endpoint):
+        def record(status, seconds, size=0):
+            self.histogram.record(seconds)
+            if not status or status >= 500:
+                self.errors += 1
+        return record
+
+    def swap(self):
+        """(histogram, errors) of the window just ended"""
+        previous = getattr(self, 'histogram', None), getattr(self, 'errors', 0)
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        return previous
+
+
+def kendall_tau(values):
+    """Rank correlation of `values` with time: +1 always rising, -1 always falling"""
+    n = len(values)
+    if n < 3:
+        return 0.0
+    concordant = discordant = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if values[j] > values[i]:
+                concordant += 1
+            elif values[j] < values[i]:
+                discordant += 1
+    return (concordant - discordant) / (n * (n - 1) / 2)
+
+
+def pearson(xs, ys):
+    if len(xs) < 3 or len(set(xs)) < 2 or len(set(ys)) < 2:
+        return None
+    return statistics.correlation(xs, ys)
+
+
+def analyze(rows, warmup=60.0, tau_threshold=0.5):
+    """Findings per watched series over the post-warmup rows, and memory/latency correlations"""
+    rows = [row for row in rows if row['t_s'] >= warmup and row['requests']]
+    series_report = {}
+    findings = []
+    for name, threshold in WATCHED:
+        values = [row[name] for row in rows if row.get(name) is not None]
+        if len(values) < 8:
+            continue
+        quarter = max(2, len(values) // 4)
+        start, end = statistics.median(values[:quarter]), statistics.median(values[-quarter:])
+        change = (end - start) / start if start else (float('inf') if end > start else 0.0)
+        tau = kendall_tau(values)
+        series_report[name] = {"start": start, "end": end, "change": change, "tau": tau}
+        if name == 'error_rate':
+            growing = end > start and tau >= tau_threshold
+        else:
+            growing = tau >= tau_threshold and change >= threshold
+        if growing:
+            findings.append(f"{name} grows monotonically: {start:.2f} → {end:.2f} (τ={tau:.2f})")
+    correlations = {}
+    for memory in ('server_rss_mb', 'client_traced_mb'):
+        pairs = [(row[memory], row['p95_ms']) for row in rows if row.get(memory) is not None]
+        if pairs:
+            correlations[f"{memory}~p95_ms"] = pearson(*zip(*pairs))
+    return {"series": series_report, "findings": findings, "correlations": correlations}
+
+
+async def soak(client_factory, stats, window, duration, interval, server_pids=None, users=50, think_scale=1.0,
+               visit_gap=60.0, on_row=None):
+    """Run the journey mix for `duration` seconds, returns one row per `interval`"""
+    rows = []
+    started = time.perf_counter()
+
+    async def sample():
+        while True:
+            await asyncio.sleep(interval)
+            histogram, errors = window.swap()
+            traced, _ = tracemalloc.get_traced_memory()
+            row = {
+                "t_s": round(time.perf_counter() - started, 1),
+                "requests": histogram.count,
+                "error_rate": errors / histogram.count if histogram.count else 0.0,
+                "p50_ms": histogram.percentile_us(50) / 1000,
+                "p95_ms": histogram.percentile_us(95) / 1000,
+                "p99_ms": histogram.percentile_us(99) / 1000,
+                "client_traced_mb": traced / 2 ** 20,
+                "client_rss_mb": proc_memory([os.getpid()])['rss'] / 2 ** 20,
+                "server_rss_mb": None,
+                "server_anon_mb": None,
+                "server_data_mb": None,
+            }
+            if server_pids is not None:
+                memory = proc_memory(server_pids())
+                row.update(server_rss_mb=memory['rss'] / 2 ** 20, server_anon_mb=memory['anon'] / 2 ** 20,
+                           server_data_mb=memory['data'] / 2 ** 20)
+            rows.append(row)
+            if on_row:
+                on_row(row)
+
+    sampler = asyncio.create_task(sample())
+    try:
+        await run_journeys(client_factory, users, duration, think_scale=think_scale, visit_gap=visit_gap,
+                           stats=stats)
+    finally:
+        sampler.cancel()
+    return rows
+
+
+def print_row(row):
+    server = f"{row['server_rss_mb']:>9.1f}" if row['server_rss_mb'] is not None else f"{'-':>9}"
+    print(f"{row['t_s']:>8.0f}s{row['requests']:>8}{row['error_rate']:>7.1%}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+          f"{row['p99_ms']:>9.1f}{server}{row['client_traced_mb']:>10.1f}{row['client_rss_mb']:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hours-long journey soak with memory and latency drift checks")
+    parser.add_argument('--duration', type=float, default=3600.0, help="run time in seconds")
+    parser.add_argument('--interval', type=float, default=10.0, help="seconds per sample row")
+    parser.add_argument('--warmup', type=float, default=60.0, help="seconds excluded from the trend checks")
+    parser.add_argument('--users', type=int, default=50, help="concurrent virtual users")
+    parser.add_argument('--think-scale', type=float, default=1.0)
+    parser.add_argument('--visit-gap', type=float, default=60.0)
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--command', help="start the server with this (e.g. 'yarn start') and watch its process tree")
+    parser.add_argument('--pid', type=int, help="watch this server process tree instead of the --api-base listener")
+    parser.add_argument('--in-process', action='store_true', help="soak the Python stand-in; only client memory")
+    parser.add_argument('--tau', type=float, default=0.5, help="Kendall τ above which a series counts as monotonic")
+    parser.add_argument('--csv', help="write every sample row to this file")
+    parser.add_argument('--json', help="write the rows and findings to this file")
+    args = parser.parse_args(argv)
+
+    window = WindowRecorder()
+    stats = JourneyStats(window)
+    process = connector = server_pids = None
+    if args.in_process:
+        from harness.fake_backend import InMemoryBackend
+        from harness.journeys import InProcessJourneyClient
+        from harness.tts_replay import TtsRouteModel
+        backend, tts = InMemoryBackend(), TtsRouteModel()
+
+        def client_factory():
+            return InProcessJourneyClient(backend, stats, tts)
+    else:
+        import aiohttp
+
+        from harness.loadgen import AsyncAPIClient
+
+        def client_factory():
+            nonlocal connector
+            connector = connector or aiohttp.TCPConnector(limit=args.users * 2)
+            return AsyncAPIClient(connector, stats, args.api_base)
+
+        base_url = args.api_base.rsplit('/api', 1)[0]
+        if args.command:
+            from harness.coldstart import start_server, wait_listening
+            process = start_server(args.command)
+            wait_listening(base_url, process)
+            root = process.pid
+        else:
+            parts = urlsplit(base_url)
+            root = args.pid or (find_listener(parts.port or 80) if parts.hostname in ('localhost', '127.0.0.1')
+                                else None)
+        if root is not None:
+            def server_pids():
+                return process_tree(root)
+
+    print("🕰️  SvenskPå3 Soak Test")
+    print(f"API Base: {'in-process' if args.in_process else args.api_base}")
+    print(f"Duration: {args.duration:.0f}s, Interval: {args.interval:.0f}s, Users: {args.users}, "
+          f"Server memory: {'not tracked' if server_pids is None else 'pid tree of ' + str(root)}")
+    print()
+    print(f"{'Time':>9}{'Reqs':>8}{'Err':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'Srv MB':>9}{'Traced MB':>10}"
+          f"{'Client MB':>10}")
+
+    csv_file = writer = None
+    if args.csv:
+        csv_file = open(args.csv, 'w', newline='')
+
+    def on_row(row):
+        nonlocal writer
+        print_row(row)
+        if csv_file is not None:
+            if writer is None:
+                writer = csv.DictWriter(csv_file, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            csv_file.flush()
+
+    async def run():
+        try:
+            return await soak(client_factory, stats, window, args.duration, args.interval, server_pids, args.users,
+                              args.think_scale, args.visit_gap, on_row)
+        finally:
+            if connector is not None:
+                await connector.close()
+
+    tracemalloc.start()
+    try:
+        rows = asyncio.run(run())
+    finally:
+        tracemalloc.stop()
+        if csv_file is not None:
+            csv_file.close()
+        if process is not None:
+            from harness.coldstart import stop_server
+            stop_server(process)
+
+    report = analyze(rows, args.warmup, args.tau)
+    print()
+    for name, series in report['series'].items():
+        print(f"   {name:<18} {series['start']:>10.2f} → {series['end']:>10.2f} ({series['change']:+.1%}, "
+              f"τ={series['tau']:+.2f})")
+    for name, value in report['correlations'].items():
+        if value is not None:
+            print(f"   corr({name}) = {value:+.2f}")
+    print()
+    if report['findings']:
+        for finding in report['findings']:
+            print(f"❌ {finding}")
+    else:
+        print("🎉 No monotonic memory growth or latency drift")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"rows": rows, **report}, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    exit(1 if main()['findings'] else 0)
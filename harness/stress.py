@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress mode for POST /api/progress
+Fires bursts of simultaneous lesson completions per user (double-taps, several
+tabs) and checks the daily cap, XP and streak invariants afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+
+from harness import API_BASE, DAILY_XP_PER_LESSON, MAX_DAILY_LESSONS
+from harness.loadgen import TEST_PASSWORD, AsyncAPIClient, LoadStats
+
+
+def check_invariants(responses, progress_body):
+    """(kind, detail) violations for one user, from its burst responses and GET /api/progress afterwards"""
+    violations = []
+    accepted = [body for status, body in responses if status == 200]
+    # Stress users are created fresh, so every row they have is today's
+    rows = progress_body.get('progress', [])
+    today_rows = [p for p in rows if p.get('date') == rows[0].get('date')] if rows else []
+    today = today_rows[0] if today_rows else {}
+    completions = today.get('completionsCount', 0)
+
+    if len(today_rows) > 1:
+        violations.append(("duplicate rows", f"{len(today_rows)} daily_progress rows for today"))
+    if completions > MAX_DAILY_LESSONS:
+        violations.append(("cap exceeded", f"completionsCount {completions} > {MAX_DAILY_LESSONS}"))
+    if len(accepted) > MAX_DAILY_LESSONS:
+        violations.append(("cap exceeded", f"{len(accepted)} completions accepted"))
+    if len(accepted) != completions:
+        violations.append(("lost update", f"{len(accepted)} accepted, {completions} stored"))
+    for row in today_rows:
+        if row.get('xpEarned', 0) != DAILY_XP_PER_LESSON * row.get('completionsCount', 0):
+            violations.append(("xp mismatch",
+                               f"xpEarned {row.get('xpEarned')} != {DAILY_XP_PER_LESSON} x {row.get('completionsCount')}"))
+
+    streaks = [body.get('streak', 0) for body in sorted(accepted, key=lambda b: b.get('completionsCount', 0))]
+    if any(later < earlier for earlier, later in zip(streaks, streaks[1:])):
+        violations.append(("streak regressed", f"returned streaks {streaks}"))
+    if accepted and progress_body.get('currentStreak', 0) < max(streaks):
+        violations.append(("streak regressed",
+                           f"currentStreak {progress_body.get('currentStreak')} < returned {max(streaks)}"))
+    return violations
+
+
+async def stress_user(client, email, burst, bursts):
+    """Sign up, fire `bursts` rounds of `burst` concurrent completions, then read progress back"""
+    status, _ = await client.request('POST', 'auth/signup',
+                                     {"email": email, "password": TEST_PASSWORD, "displayName": "Stress User"})
+    if status != 200:
+        return None
+    responses = []
+    for _ in range(bursts):
+        responses.extend(await asyncio.gather(*(client.request('POST', 'progress', {}) for _ in range(burst))))
+    status, progress_body = await client.request('GET', 'progress')
+    if status != 200:
+        return None
+    return check_invariants(responses, progress_body)
+
+
+async def run_level(client_factory, users, burst, bursts, run_id):
+    """One concurrency level: `users` users at once, each firing bursts of `burst`"""
+    stats = LoadStats()
+    clients = [client_factory(stats) for _ in range(users)]
+    try:
+        results = await asyncio.gather(*(
+            stress_user(client, f"stress_{run_id}_{burst}_{index}@example.com", burst, bursts)
+            for index, client in enumerate(clients)
+        ))
+    finally:
+        stats.finished_at = time.perf_counter()
+        for client in clients:
+            await client.close()
+    return stats, results
+
+
+def report_level(burst, stats, results):
+    checked = [r for r in results if r is not None]
+    violating = [r for r in checked if r]
+    posts = stats.endpoints.get(('POST', 'progress'))
+    throughput = (posts.count / stats.elapsed) if posts else 0.0
+    p99 = posts.percentile(99) * 1000 if posts else 0.0
+    rate = len(violating) / len(checked) * 100 if checked else 0.0
+    print(f"{burst:>7}{len(checked):>8}{len(violating):>11}{rate:>10.1f}%{throughput:>12.1f}{p99:>10.1f}")
+    kinds = {}
+    for violations in violating:
+        for kind in {kind for kind, _ in violations}:
+            kinds[kind] = kinds.get(kind, 0) + 1
+    for kind, count in sorted(kinds.items(), key=lambda item: -item[1]):
+        print(f"{'':>7}   └─ {kind}: {count}")
+    return {"burst": burst, "users": len(checked), "violating": len(violating), "violation_rate": rate,
+            "throughput": throughput, "p99_ms": p99}
+
+
+async def run_stress(levels=(1, 2, 5, 10, 25), users=50, bursts=1, api_base=API_BASE, client_factory=None):
+    connector = None
+    if client_factory is None:
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=0)
+
+        def client_factory(stats):
+            return AsyncAPIClient(connector, stats, api_base)
+
+    run_id = int(time.time())
+    print(f"{'Burst':>7}{'Users':>8}{'Violating':>11}{'Rate':>11}{'POST req/s':>12}{'p99 ms':>10}")
+    print("-" * 59)
+    summary = []
+    try:
+        for burst in levels:
+            stats, results = await run_level(client_factory, users, burst, bursts, run_id)
+            summary.append(report_level(burst, stats, results))
+    finally:
+        if connector is not None:
+            await connector.close()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Race POST /api/progress with concurrent completions per user")
+    parser.add_argument('--levels', default='1,2,5,10,25', help="comma-separated concurrent completions per user")
+    parser.add_argument('--users', type=int, default=50, help="users bursting at the same time per level")
+    parser.add_argument('--bursts', type=int, default=1, help="bursts per user per level")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--in-process', action='store_true', help="run against the Python backend stand-in")
+    args = parser.parse_args(argv)
+
+    client_factory = None
+    if args.in_process:
+        from harness.fake_backend import InMemoryBackend, InProcessAsyncClient
+        backend = InMemoryBackend()
+
+        def client_factory(stats):
+            return InProcessAsyncClient(backend, stats)
+
+    print("🚀 SvenskPå3 Progress Race Stress Test")
+    print(f"API Base: {'in-process' if args.in_process else args.api_base}")
+    print()
+    levels = [int(level) for level in args.levels.split(',')]
+    summary = asyncio.run(run_stress(levels, args.users, args.bursts, args.api_base, client_factory))
+    print()
+    violating = sum(level['violating'] for level in summary)
+    if violating:
+        print(f"⚠️  {violating} user(s) ended with inconsistent progress")
+    else:
+        print("🎉 No invariant violations")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Pooled keep-alive HTTP transport shared by backend_test.py and simple_backend_test.py
+One bounded urllib3 pool per host serves every session, so each virtual user
+(or test) gets its own cookie jar without paying TCP setup again. Connections
+are counted as they open and close, and each response carries the time spent
+connecting, so latency can be split into connect time and the rest.
+"""
+
+import threading
+import time
+import weakref
+
+from harness import BASE_URL
+
+
+class Transport:
+    """Bounded keep-alive pools shared by cookie-isolated requests sessions
+
+    At most `pool_maxsize` sockets are kept per host; with `block=True` a request
+    waits for a free socket instead of opening an extra one, so a load run never
+    holds more than pool_maxsize sockets per host. With a `backend`
+    (harness.fake_backend.InMemoryBackend) sessions are answered in-process and
+    no sockets are opened.
+    """
+
+    def __init__(self, pool_maxsize=10, pool_connections=4, block=False, backend=None, base_url=BASE_URL):
+        self.pool_maxsize = pool_maxsize
+        self.block = block
+        self.backend = backend
+        self.base_url = base_url
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.requests = 0
+        self.connects = 0
+        self.connect_failures = 0
+        self.connect_seconds = 0.0
+        self.open = 0
+        self.peak_open = 0
+        self.pools = weakref.WeakSet()
+        self.adapter = None if backend is not None else _counting_adapter(self, pool_connections, pool_maxsize, block)
+
+    def session(self):
+        """A requests.Session with its own cookie jar over the shared pool"""
+        import requests
+
+        session = requests.Session()
+        if self.backend is not None:
+            from harness.fake_backend import install
+            install(session, self.backend, self.base_url)
+        else:
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+        return session
+
+    def close(self):
+        """Close every pooled socket
+
+        Sessions handed out stay usable: their next request opens a fresh pool
+        through the same adapter. Closing one of those sessions closes the shared
+        pool, so leave that to this method.
+        """
+        if self.adapter is not None:
+            self.adapter.close()
+        # urllib3 2 leaves cleared pools to the garbage collector; responses may still reference them
+        for pool in list(self.pools):
+            pool.close()
+
+    # Called from the adapter and connection classes below
+
+    def _begin(self):
+        self.local.connect_seconds = 0.0
+        self.local.connects = 0
+
+    def _connected(self, seconds, failed=False):
+        with self.lock:
+            self.connect_seconds += seconds
+            if failed:
+                self.connect_failures += 1
+                return
+            self.connects += 1
+            self.open += 1
+            self.peak_open = max(self.peak_open, self.open)
+        if hasattr(self.local, 'connects'):
+            self.local.connects += 1
+            self.local.connect_seconds += seconds
+
+    def _closed(self):
+        with self.lock:
+            self.open -= 1
+
+    def _end(self, response):
+        with self.lock:
+            self.requests += 1
+        response.connect_elapsed = self.local.connect_seconds
+        response.connection_reused = self.local.connects == 0
+
+    @property
+    def reused(self):
+        return max(0, self.requests - self.connects)
+
+    def summary(self):
+        return {
+            "requests": self.requests,
+            "new_connections": self.connects,
+            "reused_connections": self.reused,
+            "reuse_ratio": self.reused / self.requests if self.requests else 0.0,
+            "connect_failures": self.connect_failures,
+            "connect_ms_total": self.connect_seconds * 1000,
+            "connect_ms_mean": self.connect_seconds * 1000 / self.connects if self.connects else 0.0,
+            "peak_open": self.peak_open,
+            "pool_maxsize": self.pool_maxsize,
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"🔌 Connections: {summary['new_connections']} new, {summary['reused_connections']} reused "
+              f"({summary['reuse_ratio']:.0%} of {summary['requests']} requests), "
+              f"{summary['connect_ms_mean']:.2f} ms mean connect, "
+              f"peak {summary['peak_open']} open / {summary['pool_maxsize']} per host"
+              f"{' (blocking)' if self.block else ''}")
+
+
+def _counting_adapter(transport, pool_connections, pool_maxsize, block):
+    """requests HTTPAdapter whose urllib3 connections report to `transport`"""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    def counted(base):
+        class CountedConnection(base):
+            def connect(self):
+                start = time.perf_counter()
+                try:
+                    super().connect()
+                except Exception:
+                    transport._connected(time.perf_counter() - start, failed=True)
+                    raise
+                transport._connected(time.perf_counter() - start)
+
+            def close(self):
+                if self.sock is not None:
+                    transport._closed()
+                super().close()
+
+        return CountedConnection
+
+    class CountedHTTPPool(HTTPConnectionPool):
+        ConnectionCls = counted(HTTPConnection)
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            transport.pools.add(self)
+
+    class CountedHTTPSPool(HTTPSConnectionPool):
+        ConnectionCls = counted(HTTPSConnection)
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            transport.pools.add(self)
+
+    class CountingAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {'http': CountedHTTPPool, 'https': CountedHTTPSPool}
+
+        def send(self, request, **kwargs):
+            transport._begin()
+            response = super().send(request, **kwargs)
+            transport._end(response)
+            return response
+
+    return CountingAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=block)
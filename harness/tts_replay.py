@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+TTS workload replay with a Zipf-skewed phrase mix
+Pulls the phrases from LESSON_DATA in app/app/lesson/page.js and replays them
+against POST /api/tts, reporting hit ratio over time and cache bytes, either
+live (server started with TTS_STUB=1, also measuring cold vs warm latency) or
+against an in-process model of app/api/tts/route.js with an optional LRU byte
+budget, whose latencies are inputs rather than measurements.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import re
+import time
+from collections import OrderedDict
+
+from harness import API_BASE
+from harness.metrics import LatencyHistogram
+
+LESSON_PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app', 'app', 'lesson',
+                           'page.js')
+MAX_TEXT_LENGTH = 200
+# Modelled latency of a cache hit, in seconds
+HIT_LATENCY = 0.0005
+_STRING = r"'((?:[^'\\]|\\.)*)'"
+
+
+def load_phrases(path=LESSON_PAGE, include_options=False):
+    """Unique phrases from LESSON_DATA's `swedish` and `audio` fields, the ones playAudio sends
+
+    Quiz `options` (partly English answers) never reach /api/tts; include_options
+    adds them anyway to model a larger catalog
+    """
+    with open(path, encoding='utf-8') as handle:
+        source = handle.read()
+    source = source[source.index('const LESSON_DATA'):]
+    phrases = []
+    for match in re.finditer(rf"(swedish|audio):\s*{_STRING}|options:\s*\[([^\]]*)\]", source):
+        if match.group(1):
+            phrases.append(match.group(2))
+        elif include_options:
+            phrases.extend(re.findall(_STRING, match.group(3)))
+    phrases = [p.replace("\\'", "'").strip() for p in phrases]
+    return list(dict.fromkeys(p for p in phrases if p))
+
+
+def zipf_sampler(phrases, exponent=1.1, rng=None):
+    """Callable returning phrases with Zipf(exponent) popularity over a shuffled ranking"""
+    rng = rng or random.Random()
+    ranking = list(phrases)
+    rng.shuffle(ranking)
+    cum_weights = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, len(ranking) + 1)))
+    return lambda: rng.choices(ranking, cum_weights=cum_weights)[0]
+
+
+def base64_length(raw_bytes):
+    return 4 * ((raw_bytes + 2) // 3)
+
+
+class TtsRouteModel:
+    """In-process model of POST /api/tts; max_bytes=None is today's unbounded Map"""
+
+    def __init__(self, max_bytes=None, latency_ms=150.0, bytes_per_char=1500):
+        self.max_bytes = max_bytes
+        self.latency_ms = latency_ms
+        self.bytes_per_char = bytes_per_char
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        self.evictions = 0
+
+    def post(self, text):
+        """(status, hit, modelled latency in seconds)"""
+        trimmed = (text or '').strip()
+        if not trimmed or len(trimmed) > MAX_TEXT_LENGTH:
+            return 400, False, 0.0
+        if trimmed in self.cache:
+            self.cache.move_to_end(trimmed)
+            return 200, True, HIT_LATENCY
+
+        size = base64_length(len(trimmed) * self.bytes_per_char)
+        self.cache[trimmed] = size
+        self.cache_bytes += size
+        while self.max_bytes is not None and self.cache_bytes > self.max_bytes and len(self.cache) > 1:
+            _, evicted = self.cache.popitem(last=False)
+            self.cache_bytes -= evicted
+            self.evictions += 1
+        return 200, False, self.latency_ms / 1000
+
+
+class LiveTtsTarget:
+    """POST /api/tts on a running server; hits are inferred from first sight since the server cache never evicts"""
+
+    def __init__(self, api_base=API_BASE):
+        import requests
+
+        self.url = f"{api_base}/tts"
+        self.session = requests.Session()
+        self.cache = {}
+        self.cache_bytes = 0
+        self.evictions = 0
+
+    def post(self, text):
+        start = time.perf_counter()
+        response = self.session.post(self.url, json={"text": text})
+        elapsed = time.perf_counter() - start
+        hit = text.strip() in self.cache
+        if response.status_code == 200 and not hit:
+            size = len(response.json().get('audio', ''))
+            self.cache[text.strip()] = size
+            self.cache_bytes += size
+        return response.status_code, hit, elapsed
+
+
+def replay(target, sampler, requests_total=10000, window=1000, report=print):
+    """Drive `target` with `requests_total` sampled phrases, returns (windows, cold, warm) histograms"""
+    cold, warm = LatencyHistogram(), LatencyHistogram()
+    windows = []
+    window_hits = total_hits = errors = 0
+    for index in range(1, requests_total + 1):
+        status, hit, elapsed = target.post(sampler())
+        if status != 200:
+            errors += 1
+        elif hit:
+            window_hits += 1
+            total_hits += 1
+            warm.record(elapsed)
+        else:
+            cold.record(elapsed)
+        if index % window == 0 or index == requests_total:
+            size = window if index % window == 0 else index % window
+            row = {
+                "requests": index,
+                "window_hit_ratio": window_hits / size,
+                "hit_ratio": total_hits / index,
+                "entries": len(target.cache),
+                "cache_bytes": target.cache_bytes,
+                "evictions": target.evictions,
+                "errors": errors,
+            }
+            windows.append(row)
+            report(f"{index:>10}{row['window_hit_ratio'] * 100:>11.1f}%{row['hit_ratio'] * 100:>11.1f}%"
+                   f"{row['entries']:>9}{row['cache_bytes'] / 1_048_576:>11.2f}{row['evictions']:>11}")
+            window_hits = 0
+    return windows, cold, warm
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay lesson phrases against POST /api/tts")
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--window', type=int, default=2000, help="requests per reporting window")
+    parser.add_argument('--zipf', type=float, default=1.1, help="popularity skew exponent")
+    parser.add_argument('--extra-phrases', type=int, default=0,
+                        help="add N synthetic long-tail phrases to model a larger catalog")
+    parser.add_argument('--include-options', action='store_true',
+                        help="also replay quiz `options`, which the app never sends to /api/tts")
+    parser.add_argument('--max-bytes', type=int, default=None,
+                        help="in-process LRU byte budget to evaluate (default: unbounded, as route.js)")
+    parser.add_argument('--latency-ms', type=float, default=150.0, help="in-process modelled synthesis latency")
+    parser.add_argument('--bytes-per-char', type=int, default=1500, help="in-process MP3 bytes per character")
+    parser.add_argument('--live', action='store_true', help="hit a server started with TTS_STUB=1 instead")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    phrases = load_phrases(include_options=args.include_options)
+    phrases += [f"{phrase} ({n})" for n, phrase in zip(range(args.extra_phrases), itertools.cycle(phrases))]
+    rng = random.Random(args.seed)
+    sampler = zipf_sampler(phrases, args.zipf, rng)
+
+    if args.live:
+        target = LiveTtsTarget(args.api_base)
+    else:
+        target = TtsRouteModel(args.max_bytes, args.latency_ms, args.bytes_per_char)
+
+    print("🔊 SvenskPå3 TTS Cache Replay")
+    print(f"Phrases: {len(phrases)}, Zipf s={args.zipf}, Requests: {args.requests}")
+    print(f"Target: {'live ' + args.api_base if args.live else 'in-process model'}, "
+          f"Budget: {args.max_bytes if args.max_bytes else 'unbounded'}")
+    print()
+    print(f"{'Requests':>10}{'Window hit':>12}{'Total hit':>12}{'Entries':>9}{'Cache MB':>11}{'Evictions':>11}")
+    print("-" * 65)
+    windows, cold, warm = replay(target, sampler, args.requests, args.window)
+    print()
+    for label, histogram, modelled_ms in (("Cold (miss)", cold, args.latency_ms),
+                                          ("Warm (hit)", warm, HIT_LATENCY * 1000)):
+        summary = histogram.summary()
+        if args.live:
+            print(f"{label:<12} n={summary['count']:<8} p50={summary['p50_ms']:.1f}ms p99={summary['p99_ms']:.1f}ms")
+        else:
+            print(f"{label:<12} n={summary['count']:<8} latency modelled at {modelled_ms:g}ms, not measured")
+    return windows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Persistent pool of pre-authenticated test users
+Users are created once and their `token` cookies are cached on disk, so repeated
+runs skip bcrypt-bound signup/signin until a token nears its 7-day expiry.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+
+from harness import API_BASE
+
+USER_POOL_FILE = os.getenv('USER_POOL_FILE', '.user_pool.json')
+POOL_PASSWORD = "PoolPassword123!"
+# Refresh tokens this long before they actually expire
+REFRESH_MARGIN = 60 * 60
+
+
+def token_expiry(token):
+    """`exp` claim of a JWT in epoch seconds, 0 when it cannot be read"""
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return int(claims.get('exp', 0))
+    except Exception:
+        return 0
+
+
+class UserPool:
+    """N reusable users per API base, handed out as warm sessions"""
+
+    def __init__(self, size=10, path=USER_POOL_FILE, api_base=API_BASE, session_factory=None):
+        self.size = size
+        self.path = path
+        self.api_base = api_base
+        self.session_factory = session_factory
+        self.users = []
+        self.lock = threading.Lock()
+        self.next_index = 0
+        self.signins = 0
+        self.signups = 0
+
+    def _new_session(self):
+        if self.session_factory is not None:
+            return self.session_factory()
+        import requests
+        return requests.Session()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                self.users = json.load(handle).get(self.api_base, [])
+        except (OSError, ValueError):
+            self.users = []
+
+    def save(self):
+        if not self.path:
+            return
+        data = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError):
+                data = {}
+        data[self.api_base] = self.users
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(data, handle, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _authenticate(self, user, signup=False):
+        """Sign the user in (or up) and store the fresh token"""
+        session = self._new_session()
+        credentials = {"email": user['email'], "password": user['password']}
+        if signup:
+            self.signups += 1
+            response = session.post(f"{self.api_base}/auth/signup",
+                                    json={**credentials, "displayName": "Pool User"})
+            if response.status_code != 200:
+                signup = False
+        if not signup:
+            self.signins += 1
+            response = session.post(f"{self.api_base}/auth/signin", json=credentials)
+        token = session.cookies.get('token')
+        if response.status_code != 200 or not token:
+            raise RuntimeError(f"Could not authenticate pool user {user['email']}: {response.status_code}")
+        user['token'] = token
+        user['expires'] = token_expiry(token) or int(time.time()) + 60 * 60 * 24 * 7
+
+    def ensure(self):
+        """Load cached users and create any that are missing, returns self"""
+        with self.lock:
+            self.load()
+            run_id = int(time.time())
+            while len(self.users) < self.size:
+                user = {"email": f"pooluser_{run_id}_{len(self.users)}@example.com", "password": POOL_PASSWORD}
+                self._authenticate(user, signup=True)
+                self.users.append(user)
+            self.save()
+        return self
+
+    def __len__(self):
+        return len(self.users)
+
+    def token(self, index):
+        """Valid token for user `index`, refreshed lazily when close to expiry"""
+        with self.lock:
+            user = self.users[index % len(self.users)]
+            if user.get('expires', 0) - REFRESH_MARGIN <= time.time():
+                self._authenticate(user)
+                self.save()
+            return user['token']
+
+    def checkout(self):
+        """(user, token) for the next user, round robin"""
+        with self.lock:
+            index = self.next_index
+            self.next_index += 1
+        token = self.token(index)
+        return self.users[index % len(self.users)], token
+
+    def session(self):
+        """requests.Session already carrying a pooled user's token cookie"""
+        user, token = self.checkout()
+        session = self._new_session()
+        session.cookies.set('token', token, path='/')
+        return user, session
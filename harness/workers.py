@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Multi-process load workers with shared-memory metric aggregation
+Each worker process runs its own slice of virtual users and records straight
+into its own region of one shared array (counters plus LatencyHistogram
+buckets), so nothing is pickled per request. The coordinator merges the
+regions live; a merge costs O(workers x buckets), whatever the request count.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from array import array
+
+from harness import API_BASE
+from harness.loadgen import EndpointStats, LoadStats, run_load, warn_lesson_cap
+from harness.metrics import BUCKET_COUNT, LatencyHistogram, bucket_index
+
+# Every (method, endpoint) run_journey can send gets a fixed slot
+ENDPOINTS = (
+    ('POST', 'auth/signup'),
+    ('POST', 'auth/signin'),
+    ('GET', 'auth/me'),
+    ('GET', 'progress'),
+    ('POST', 'progress'),
+    ('POST', 'auth/logout'),
+)
+STATUS_CODES = 600
+
+# Per-worker header
+JOURNEYS_STARTED, JOURNEYS_COMPLETED, WORKER_DONE = range(3)
+WORKER_HEADER = 3
+# Per-endpoint slot: counters, then one counter per HTTP status, then histogram buckets
+COUNT, TOTAL_US, MIN_US, MAX_US, ERRORS = range(5)
+SLOT_HEADER = 5
+STATUS_OFFSET = SLOT_HEADER
+BUCKET_OFFSET = STATUS_OFFSET + STATUS_CODES
+SLOT_SIZE = BUCKET_OFFSET + BUCKET_COUNT
+WORKER_SIZE = WORKER_HEADER + len(ENDPOINTS) * SLOT_SIZE
+
+
+class SharedRegion:
+    """uint64 counters for `workers` workers in one multiprocessing.RawArray"""
+
+    def __init__(self, workers, buffer=None):
+        self.workers = workers
+        self.buffer = buffer if buffer is not None else multiprocessing.RawArray('Q', workers * WORKER_SIZE)
+        self.words = memoryview(self.buffer).cast('B').cast('Q')
+
+    def worker_offset(self, worker):
+        return worker * WORKER_SIZE
+
+    def slot_offset(self, worker, slot):
+        return self.worker_offset(worker) + WORKER_HEADER + slot * SLOT_SIZE
+
+    def merge(self, stats=None):
+        """LoadStats summing every worker's region; readers may see a request half-recorded until workers finish"""
+        stats = stats or LoadStats()
+        words = self.words
+        stats.journeys_started = sum(words[self.worker_offset(w) + JOURNEYS_STARTED] for w in range(self.workers))
+        stats.journeys_completed = sum(words[self.worker_offset(w) + JOURNEYS_COMPLETED]
+                                       for w in range(self.workers))
+        for slot, (method, endpoint) in enumerate(ENDPOINTS):
+            offsets = [self.slot_offset(w, slot) for w in range(self.workers)]
+            count = sum(words[o + COUNT] for o in offsets)
+            errors = sum(words[o + ERRORS] for o in offsets)
+            if not count and not errors:
+                continue
+            endpoint_stats = EndpointStats()
+            histogram = endpoint_stats.histogram
+            histogram.counts = array('Q', map(sum, zip(*(
+                words[o + BUCKET_OFFSET:o + SLOT_SIZE] for o in offsets))))
+            histogram.count = count
+            histogram.total_us = sum(words[o + TOTAL_US] for o in offsets)
+            histogram.max_us = max(words[o + MAX_US] for o in offsets)
+            minimums = [words[o + MIN_US] - 1 for o in offsets if words[o + MIN_US]]
+            histogram.min_us = min(minimums) if minimums else None
+            statuses = map(sum, zip(*(words[o + STATUS_OFFSET:o + BUCKET_OFFSET] for o in offsets)))
+            endpoint_stats.statuses = {status: n for status, n in enumerate(statuses) if n}
+            endpoint_stats.errors = errors
+            stats.endpoints[(method, endpoint)] = endpoint_stats
+        return stats
+
+    def done(self):
+        return sum(self.words[self.worker_offset(w) + WORKER_DONE] for w in range(self.workers))
+
+
+class SharedEndpointStats:
+    """EndpointStats look-alike writing into one slot of a SharedRegion"""
+
+    __slots__ = ('words', 'offset')
+
+    def __init__(self, words, offset):
+        self.words = words
+        self.offset = offset
+
+    def record(self, status, elapsed, size=0):
+        words, offset = self.words, self.offset
+        value_us = int(elapsed * 1_000_000)
+        words[offset + BUCKET_OFFSET + bucket_index(value_us)] += 1
+        words[offset + STATUS_OFFSET + (status if 0 <= status < STATUS_CODES else 0)] += 1
+        words[offset + TOTAL_US] += value_us
+        if value_us > words[offset + MAX_US]:
+            words[offset + MAX_US] = value_us
+        # MIN_US holds min + 1 so that 0 can mean "nothing recorded"
+        if not words[offset + MIN_US] or value_us + 1 < words[offset + MIN_US]:
+            words[offset + MIN_US] = value_us + 1
+        words[offset + COUNT] += 1
+
+    def fail(self, elapsed):
+        """A request that got no response"""
+        self.words[self.offset + ERRORS] += 1
+
+    @property
+    def count(self):
+        return self.words[self.offset + COUNT]
+
+    @property
+    def errors(self):
+        return self.words[self.offset + ERRORS]
+
+    @errors.setter
+    def errors(self, value):
+        self.words[self.offset + ERRORS] = value
+
+
+class WorkerStats:
+    """LoadStats look-alike for one worker, backed by its SharedRegion slice"""
+
+    def __init__(self, region, worker):
+        self.region = region
+        self.offset = region.worker_offset(worker)
+        self.endpoints = {key: SharedEndpointStats(region.words, region.slot_offset(worker, slot))
+                          for slot, key in enumerate(ENDPOINTS)}
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+    def endpoint(self, method, endpoint):
+        return self.endpoints[(method, endpoint)]
+
+    @property
+    def journeys_started(self):
+        return self.region.words[self.offset + JOURNEYS_STARTED]
+
+    @journeys_started.setter
+    def journeys_started(self, value):
+        self.region.words[self.offset + JOURNEYS_STARTED] = value
+
+    @property
+    def journeys_completed(self):
+        return self.region.words[self.offset + JOURNEYS_COMPLETED]
+
+    @journeys_completed.setter
+    def journeys_completed(self, value):
+        self.region.words[self.offset + JOURNEYS_COMPLETED] = value
+
+
+class PooledTokens:
+    """Tokens handed out by the coordinator's UserPool, indexed like UserPool.token"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def token(self, index):
+        return self.tokens[index % len(self.tokens)]
+
+
+def split(total, parts):
+    """Spread `total` over `parts` as evenly as possible"""
+    return [total // parts + (1 if index < total % parts else 0) for index in range(parts)]
+
+
+def worker_main(buffer, workers, worker, concurrency, duration, users, api_base, in_process, tokens, run_id):
+    """Entry point of one worker process"""
+    region = SharedRegion(workers, buffer)
+    stats = WorkerStats(region, worker)
+    client_factory = None
+    if in_process:
+        from harness.fake_backend import InMemoryBackend, InProcessAsyncClient
+        backend = InMemoryBackend()
+
+        def client_factory():
+            return InProcessAsyncClient(backend, stats)
+
+    try:
+        asyncio.run(run_load(concurrency, duration, users, api_base, client_factory, stats,
+                             PooledTokens(tokens) if tokens else None, run_id=f"{run_id}w{worker}"))
+    finally:
+        region.words[region.worker_offset(worker) + WORKER_DONE] = 1
+
+
+def run_workers(workers, concurrency=50, duration=30.0, users=None, api_base=API_BASE, in_process=False,
+                tokens=None, report_interval=1.0, report=print):
+    """Start `workers` processes sharing `concurrency` and `users`, merging their metrics live
+
+    Pooled `tokens` are dealt out round robin, so no two workers share a user and
+    each worker's daily lesson accounting covers every journey its users make
+    """
+    if tokens and len(tokens) < workers:
+        raise ValueError(f"{len(tokens)} pooled users cannot be split over {workers} workers")
+    region = SharedRegion(workers)
+    run_id = int(time.time())
+    user_split = split(users, workers) if users is not None else [None] * workers
+    processes = [
+        multiprocessing.Process(
+            target=worker_main,
+            args=(region.buffer, workers, worker, share, duration, user_split[worker], api_base, in_process,
+                  tokens[worker::workers] if tokens else None, run_id),
+            daemon=True,
+        )
+        for worker, share in enumerate(split(concurrency, workers))
+    ]
+    stats = LoadStats()
+    for process in processes:
+        process.start()
+
+    report(f"{'Elapsed':>8}{'Workers':>9}{'Requests':>10}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    report("-" * 54)
+    previous_requests, previous_at = 0, stats.started_at
+    try:
+        while region.done() < workers and any(p.is_alive() for p in processes):
+            time.sleep(report_interval)
+            snapshot = region.merge()
+            now = time.perf_counter()
+            requests = snapshot.total_requests
+            overall = LatencyHistogram()
+            for endpoint_stats in snapshot.endpoints.values():
+                overall.merge(endpoint_stats.histogram)
+            report(f"{now - stats.started_at:>7.1f}s{workers - region.done():>9}{requests:>10}"
+                   f"{(requests - previous_requests) / (now - previous_at):>9.1f}"
+                   f"{overall.percentile_us(50) / 1000:>9.1f}{overall.percentile_us(99) / 1000:>9.1f}")
+            previous_requests, previous_at = requests, now
+    finally:
+        for process in processes:
+            process.join()
+        stats.finished_at = time.perf_counter()
+    report()
+    return region.merge(stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-process load test for the SvenskPå3 API")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--concurrency', type=int, default=50, help="simultaneous virtual users, across all workers")
+    parser.add_argument('--duration', type=float, default=30.0, help="run time in seconds")
+    parser.add_argument('--users', type=int, default=None, help="stop after this many journeys, across all workers")
+    parser.add_argument('--api-base', default=API_BASE)
+    parser.add_argument('--in-process', action='store_true',
+                        help="each worker drives its own Python backend stand-in")
+    parser.add_argument('--user-pool', type=int, default=0, metavar='N',
+                        help="reuse N cached signed-in users and skip signup/signin")
+    parser.add_argument('--report-interval', type=float, default=1.0, help="seconds between live merges")
+    args = parser.parse_args(argv)
+    if args.in_process and args.user_pool:
+        parser.error("--user-pool needs a shared server; every --in-process worker has its own backend")
+    if args.user_pool and args.user_pool < args.workers:
+        parser.error("--user-pool needs at least one user per worker")
+
+    print("🚀 Starting SvenskPå3 Multi-Process Load Test")
+    print(f"API Base: {'in-process' if args.in_process else args.api_base}")
+    print(f"Workers: {args.workers}, Concurrency: {args.concurrency}, Duration: {args.duration}s, "
+          f"Users: {args.users or 'unlimited'}")
+    print()
+
+    tokens = None
+    if args.user_pool:
+        from harness.user_pool import USER_POOL_FILE, UserPool
+        pool = UserPool(args.user_pool, path=USER_POOL_FILE, api_base=args.api_base).ensure()
+        # Refresh in the coordinator so workers never race each other on signin
+        tokens = [pool.token(index) for index in range(len(pool.users))]
+        print(f"User pool: {len(tokens)} users ({pool.signups} signups, {pool.signins} signins)")
+        # Workers get disjoint slices of the pool and of --users, so the cap holds per pool as a whole
+        warn_lesson_cap(len(tokens), args.users)
+        print()
+
+    stats = run_workers(args.workers, args.concurrency, args.duration, args.users, args.api_base, args.in_process,
+                        tokens, args.report_interval)
+    stats.print_report()
+    return stats
+
+
+if __name__ == "__main__":
+    main()
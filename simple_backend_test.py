@@ -4,23 +4,28 @@ Simple Backend API Verification for SvenskPå3 Swedish Learning App
 Verifies all endpoints are working correctly
 """
 
-import requests
 import json
 import time
 import os
 
+from harness.transport import Transport
+
 # Get base URL from environment
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
 API_BASE = f"{BASE_URL}/api"
 
-def test_api_endpoints():
+def test_api_endpoints(backend=None, transport=None):
     """Test all API endpoints with simple verification"""
     print("🚀 SvenskPå3 Backend API Verification")
     print("=" * 50)
     print(f"API Base: {API_BASE}")
     print()
     
-    session = requests.Session()
+    # Only a transport created here is closed here; a caller's shared pool stays open
+    owned = transport is None
+    if owned:
+        transport = Transport(backend=backend, base_url=BASE_URL)
+    session = transport.session()
     test_email = f"verify_{int(time.time())}@example.com"
     test_password = "VerifyPass123!"
     
@@ -185,9 +190,21 @@ def test_api_endpoints():
         print("\n🎉 ALL APIS WORKING CORRECTLY!")
     else:
         print(f"\n⚠️ {total - passed} API(s) have issues")
-    
+
+    if backend is None:
+        transport.print_summary()
+    if owned:
+        transport.close()
     return passed, total
 
 if __name__ == "__main__":
-    passed, total = test_api_endpoints()
+    import sys
+
+    backend = None
+    if '--in-process' in sys.argv:
+        # Run against the Python stand-in for app/api/[[...path]]/route.js, no server needed
+        from harness.fake_backend import InMemoryBackend
+        backend = InMemoryBackend()
+
+    passed, total = test_api_endpoints(backend)
     exit(0 if passed == total else 1)
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Shared fixtures for the SvenskPå3 API test suite
+Runs against the in-process stand-in for app/api/[[...path]]/route.js by
+default; pass --live (and optionally --base-url) to hit a running server.
+Every xdist worker gets its own session fixtures, backend and email prefix,
+so `pytest -n auto` needs no coordination between workers.
+"""
+
+import threading
+import uuid
+
+import pytest
+
+from harness import BASE_URL
+
+TEST_PASSWORD = "TestPassword123!"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('svenskpa3')
+    group.addoption('--live', action='store_true', help="test a running server instead of the in-process backend")
+    group.addoption('--base-url', default=BASE_URL, help="server for --live (default: NEXT_PUBLIC_BASE_URL)")
+    group.addoption('--latency-budget-ms', type=float, default=500.0,
+                    help="p95 budget for @pytest.mark.benchmark tests")
+
+
+class User:
+    """A signed-up test user and the session holding its `token` cookie"""
+
+    def __init__(self, email, password, session, data):
+        self.email = email
+        self.password = password
+        self.session = session
+        self.id = data['user']['id']
+        self.display_name = data['user']['displayName']
+
+
+@pytest.fixture(scope='session')
+def base_url(request):
+    return request.config.getoption('base_url').rstrip('/')
+
+
+@pytest.fixture(scope='session')
+def api_base(base_url):
+    return f"{base_url}/api"
+
+
+@pytest.fixture(scope='session')
+def backend(request):
+    """InMemoryBackend shared by the worker's sessions, None with --live"""
+    if request.config.getoption('live'):
+        return None
+    from harness.fake_backend import InMemoryBackend
+    return InMemoryBackend()
+
+
+@pytest.fixture(scope='session')
+def transport(backend, base_url):
+    """One keep-alive connection pool shared by every session of this worker"""
+    from harness.transport import Transport
+    transport = Transport(pool_maxsize=32, backend=backend, base_url=base_url)
+    yield transport
+    transport.close()
+
+
+@pytest.fixture(scope='session')
+def new_session(transport):
+    """Factory for cookie-isolated sessions that reuse the warm pool"""
+    return transport.session
+
+
+@pytest.fixture
+def stand_in_server(request):
+    """(host, port) of the in-process backend served over real sockets from a daemon thread
+
+    Parametrize indirectly with an InMemoryBackend subclass to serve that instead
+    """
+    from harness.fake_backend import InMemoryBackend, make_http_server
+    server = make_http_server(getattr(request, 'param', InMemoryBackend)())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[:2]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope='session')
+def email_prefix(request):
+    """Unique per run and per xdist worker"""
+    worker = getattr(request.config, 'workerinput', {}).get('workerid', 'main')
+    return f"pytest_{worker}_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture(scope='session')
+def make_user(new_session, api_base, email_prefix):
+    """Factory signing up a new user, returns a User"""
+    counter = iter(range(1 << 30))
+
+    def factory(display_name="Test User"):
+        session = new_session()
+        email = f"{email_prefix}_{next(counter)}@example.com"
+        response = session.post(f"{api_base}/auth/signup",
+                                json={"email": email, "password": TEST_PASSWORD, "displayName": display_name})
+        assert response.status_code == 200, response.text
+        return User(email, TEST_PASSWORD, session, response.json())
+
+    return factory
+
+
+@pytest.fixture(scope='session')
+def user(make_user):
+    """Signed-in user shared by read-only tests"""
+    return make_user("Session User")
+
+
+@pytest.fixture
+def fresh_user(make_user):
+    """Signed-in user for tests that change state"""
+    return make_user()
+
+
+@pytest.fixture
+def anonymous(new_session):
+    """Session without a token cookie"""
+    return new_session()
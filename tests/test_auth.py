@@ -0,0 +1,99 @@
+"""
+POST /api/auth/signup, /signin, /logout and GET /api/auth/me
+"""
+
+TEST_PASSWORD = "SignupPassword123!"
+
+
+def test_signup_success(new_session, api_base, email_prefix):
+    session = new_session()
+    email = f"{email_prefix}_signup@example.com"
+    response = session.post(f"{api_base}/auth/signup",
+                            json={"email": email, "password": TEST_PASSWORD, "displayName": "Ny Bruker"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['success'] is True
+    assert data['user']['email'] == email
+    assert data['user']['displayName'] == "Ny Bruker"
+    assert 'token' in session.cookies
+
+
+def test_signup_normalizes_email(new_session, api_base, email_prefix):
+    email = f"{email_prefix}_Mixed@Example.com"
+    response = new_session().post(f"{api_base}/auth/signup", json={"email": f"  {email} ", "password": TEST_PASSWORD})
+
+    assert response.status_code == 200
+    assert response.json()['user']['email'] == email.lower()
+
+
+def test_signup_duplicate_email(user, anonymous, api_base):
+    response = anonymous.post(f"{api_base}/auth/signup",
+                              json={"email": user.email, "password": "AnotherPassword123!"})
+
+    assert response.status_code == 400
+    assert 'allerede registrert' in response.json()['error'].lower()
+
+
+def test_signup_missing_password(anonymous, api_base, email_prefix):
+    response = anonymous.post(f"{api_base}/auth/signup", json={"email": f"{email_prefix}_incomplete@example.com"})
+
+    assert response.status_code == 400
+    assert 'påkrevd' in response.json()['error'].lower()
+
+
+def test_signup_short_password(anonymous, api_base, email_prefix):
+    response = anonymous.post(f"{api_base}/auth/signup",
+                              json={"email": f"{email_prefix}_short@example.com", "password": "kort"})
+
+    assert response.status_code == 400
+    assert 'minst 8 tegn' in response.json()['error']
+
+
+def test_signin_success(user, new_session, api_base):
+    session = new_session()
+    response = session.post(f"{api_base}/auth/signin", json={"email": user.email, "password": user.password})
+
+    assert response.status_code == 200
+    assert response.json()['user']['id'] == user.id
+    assert 'token' in session.cookies
+
+
+def test_signin_wrong_password(user, anonymous, api_base):
+    response = anonymous.post(f"{api_base}/auth/signin", json={"email": user.email, "password": "WrongPassword123!"})
+
+    assert response.status_code == 401
+    assert 'ugyldig' in response.json()['error'].lower()
+    assert 'token' not in anonymous.cookies
+
+
+def test_me_with_token(user, api_base):
+    response = user.session.get(f"{api_base}/auth/me")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['id'] == user.id
+    assert data['email'] == user.email
+    assert data['plan'] == 'free'
+
+
+def test_me_without_token(anonymous, api_base):
+    response = anonymous.get(f"{api_base}/auth/me")
+
+    assert response.status_code == 401
+    assert 'autorisert' in response.json()['error'].lower()
+
+
+def test_logout_clears_cookie(fresh_user, api_base):
+    response = fresh_user.session.post(f"{api_base}/auth/logout")
+
+    assert response.status_code == 200
+    assert response.json()['success'] is True
+    assert not fresh_user.session.cookies.get('token')
+    assert fresh_user.session.get(f"{api_base}/auth/me").status_code == 401
+
+
+def test_unknown_route(anonymous, api_base):
+    response = anonymous.get(f"{api_base}/does-not-exist")
+
+    assert response.status_code == 404
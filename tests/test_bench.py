@@ -0,0 +1,30 @@
+"""
+harness.bench: a route that breaks must fail the regression gate, not drop out of it
+"""
+
+import requests
+
+from harness.bench import BenchClient, gate, run_benchmarks, selected
+from harness.fake_backend import InMemoryBackend, install
+
+
+class BrokenProgressBackend(InMemoryBackend):
+    def handle_get_progress(self, read_json, cookies):
+        raise RuntimeError("database unavailable")
+
+
+def test_failed_and_missing_routes_fail_the_gate():
+    backend = BrokenProgressBackend()
+    client = BenchClient('http://localhost:3000/api',
+                         lambda: install(requests.Session(), backend, 'http://localhost:3000'))
+    only = ['auth/me', 'GET progress']
+    results, failed = run_benchmarks(client, iterations=5, warmup=0, only=only, report=lambda *args: None)
+    assert list(results) == ['GET auth/me'] and list(failed) == ['GET progress']
+
+    baseline = {"endpoints": {"GET auth/me": {"samples_ms": results['GET auth/me']},
+                              "GET progress": {"samples_ms": [1.0] * 5}}}
+    assert gate(baseline, results, names=selected(only), report=lambda *args: None) == ['GET progress']
+    # Without explicit names the baseline's routes are still covered
+    assert gate(baseline, results, report=lambda *args: None) == ['GET progress']
+    # A route the baseline never measured is not a pass either
+    assert gate({"endpoints": {}}, results, report=lambda *args: None) == ['GET auth/me']
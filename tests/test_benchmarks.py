@@ -0,0 +1,43 @@
+"""
+Latency budgets for the hot read paths, run with -m benchmark or skipped with -m 'not benchmark'
+"""
+
+import time
+
+import pytest
+
+from harness.metrics import LatencyHistogram
+
+ITERATIONS = 50
+
+
+def timed(session, method, url, iterations=ITERATIONS, **kwargs):
+    histogram = LatencyHistogram()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = session.request(method, url, **kwargs)
+        histogram.record(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    return histogram
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('endpoint', ['auth/me', 'profile', 'progress'])
+def test_read_latency(user, api_base, endpoint, request, record_property):
+    histogram = timed(user.session, 'GET', f"{api_base}/{endpoint}")
+    summary = histogram.summary()
+    for key in ('p50_ms', 'p99_ms'):
+        record_property(key, summary[key])
+
+    budget = request.config.getoption('latency_budget_ms')
+    assert histogram.percentile_us(95) / 1000 <= budget, summary
+
+
+@pytest.mark.benchmark
+def test_complete_lesson_latency(fresh_user, api_base, request, record_property):
+    histogram = timed(fresh_user.session, 'POST', f"{api_base}/progress", iterations=10, json={})
+    summary = histogram.summary()
+    record_property('p50_ms', summary['p50_ms'])
+
+    budget = request.config.getoption('latency_budget_ms')
+    assert histogram.percentile_us(95) / 1000 <= budget, summary
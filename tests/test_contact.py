@@ -0,0 +1,37 @@
+"""
+POST /api/contact and the stubbed Stripe routes
+"""
+
+
+def test_contact_valid(anonymous, api_base):
+    response = anonymous.post(f"{api_base}/contact",
+                              json={"email": "contact@example.com",
+                                    "message": "Hej! Jag har en fråga om appen. Kan ni hjälpa mig?"})
+
+    assert response.status_code == 200
+    assert response.json()['success'] is True
+
+
+def test_contact_missing_message(anonymous, api_base):
+    response = anonymous.post(f"{api_base}/contact", json={"email": "incomplete@example.com"})
+
+    assert response.status_code == 400
+    assert 'påkrevd' in response.json()['error'].lower()
+
+
+def test_stripe_checkout_not_configured(user, api_base):
+    response = user.session.post(f"{api_base}/stripe/checkout", json={"priceId": "price_basic_monthly"})
+
+    assert response.status_code == 501
+    assert 'Stripe ikke konfigurert' in response.json()['error']
+
+
+def test_stripe_checkout_without_auth(anonymous, api_base):
+    assert anonymous.post(f"{api_base}/stripe/checkout", json={}).status_code == 401
+
+
+def test_stripe_webhook(anonymous, api_base):
+    response = anonymous.post(f"{api_base}/stripe/webhook", json={"type": "customer.subscription.updated"})
+
+    assert response.status_code == 200
+    assert response.json() == {"received": True}
@@ -0,0 +1,101 @@
+"""
+harness.faultproxy and harness.retry: injected latency/resets through a real socket, and retry policies
+"""
+
+import asyncio
+import time
+
+import pytest
+import requests
+
+from harness.faultproxy import FaultProxy, parse_fault
+from harness.retry import RetryPolicy, parse_policy
+
+
+@pytest.fixture
+def proxy_for(stand_in_server):
+    proxies = []
+
+    def start(*specs, seed=1):
+        proxy = FaultProxy(stand_in_server, [parse_fault(spec) for spec in specs], seed=seed).start_in_thread()
+        proxies.append(proxy)
+        return proxy
+
+    yield start
+    for proxy in proxies:
+        proxy.stop()
+
+
+def test_parse_fault_and_policy():
+    fault = parse_fault('POST progress:latency=200ms,jitter=0.05,reset=0.1,bandwidth=64k')
+    assert (fault.method, fault.path, fault.latency, fault.jitter, fault.reset, fault.bandwidth) == \
+        ('POST', 'progress', 0.2, 0.05, 0.1, 65536)
+    assert fault.matches('POST', 'progress') and not fault.matches('GET', 'progress')
+    assert parse_fault('latency=1s').matches('GET', None)
+
+    policy = parse_policy('attempts=4,timeout=500ms,backoff=10ms,max-backoff=30ms,budget=0.1,methods=GET+POST')
+    assert (policy.attempts, policy.timeout, policy.budget) == (4, 0.5, 0.1)
+    assert policy.retryable('POST', None) and not policy.retryable('POST', 400)
+    with pytest.raises(ValueError):
+        parse_policy('tries=3')
+
+
+def test_backoff_is_capped_with_full_jitter():
+    policy = RetryPolicy(attempts=5, backoff=0.01, max_backoff=0.03, seed=1)
+    for retry in range(1, 6):
+        assert all(0 <= policy.delay(retry) <= min(0.03, 0.01 * 2 ** (retry - 1)) for _ in range(50))
+    assert RetryPolicy(backoff=0.01, max_backoff=0.03, jitter=False).delay(4) == 0.03
+
+
+def test_retry_budget_limits_amplification():
+    policy = RetryPolicy(attempts=3, backoff=0, budget=0.1, reserve=2)
+    for _ in range(100):
+        assert policy.call_sync('GET', lambda timeout: (503, None)) == (503, None)
+    # Everything fails, yet retries stay within 10% of requests plus the reserve
+    assert policy.retries == 12
+    assert policy.amplification == pytest.approx(1.12)
+    assert policy.gave_up == 100 and policy.budget_denied >= 88
+
+
+def test_non_idempotent_requests_are_not_retried():
+    policy = RetryPolicy(attempts=3, backoff=0)
+    calls = []
+    policy.call_sync('POST', lambda timeout: calls.append(timeout) or (None, None))
+    assert len(calls) == 1
+
+
+def test_proxy_injects_latency_per_route(proxy_for):
+    proxy = proxy_for('GET auth/me:latency=150ms')
+    base = f"http://127.0.0.1:{proxy.port}/api"
+    with requests.Session() as session:
+        start = time.perf_counter()
+        assert session.get(f"{base}/profile").status_code == 401
+        fast = time.perf_counter() - start
+        start = time.perf_counter()
+        assert session.get(f"{base}/auth/me").status_code == 401
+        slow = time.perf_counter() - start
+    assert fast < 0.1 and slow >= 0.15
+    assert proxy.stats['GET auth/me']['requests'] == 1 and proxy.stats['-']['requests'] == 1
+
+
+def test_resets_fail_without_retries_and_recover_with_them(proxy_for):
+    from harness.loadgen import AsyncAPIClient, LoadStats
+
+    proxy = proxy_for('auth/me:reset=0.3', '*:drop=0.0')
+    base = f"http://127.0.0.1:{proxy.port}/api"
+
+    async def run(retry):
+        import aiohttp
+
+        stats = LoadStats()
+        async with aiohttp.TCPConnector() as connector:
+            client = AsyncAPIClient(connector, stats, base, retry)
+            statuses = [(await client.request('GET', 'auth/me'))[0] for _ in range(60)]
+            await client.close()
+        return statuses
+
+    assert None in asyncio.run(run(RetryPolicy(attempts=1)))
+    policy = RetryPolicy(attempts=6, backoff=0.001)
+    assert set(asyncio.run(run(policy))) == {401}
+    assert 1 < policy.amplification < 2
+    assert proxy.stats['auth/me']['resets'] > 0
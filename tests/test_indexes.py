@@ -0,0 +1,53 @@
+"""
+Plan analysis behind harness.indexes, on explain() output captured from MongoDB
+"""
+
+import re
+from pathlib import Path
+
+from harness.indexes import INDEXES, analyze
+
+ROUTE = Path(__file__).resolve().parent.parent / 'app' / 'api' / '[[...path]]' / 'route.js'
+
+
+def explain(plan, returned, keys, docs):
+    return {"queryPlanner": {"winningPlan": plan},
+            "executionStats": {"nReturned": returned, "totalKeysExamined": keys, "totalDocsExamined": docs}}
+
+
+def test_collscan_flagged():
+    result = analyze(explain({"stage": "COLLSCAN"}, 1, 0, 5000))
+
+    assert "COLLSCAN" in result['problems']
+    assert any(problem.startswith("examined/returned") for problem in result['problems'])
+
+
+def test_in_memory_sort_flagged():
+    plan = {"stage": "SORT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "userId_1"}}}
+    result = analyze(explain(plan, 12, 12, 12))
+
+    assert result['plan'] == "SORT → FETCH → IXSCAN"
+    assert result['problems'] == ["in-memory SORT"]
+
+
+def test_compound_index_range_is_clean():
+    plan = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "userId_1_date_-1"}}
+    result = analyze(explain(plan, 20, 21, 20))
+
+    assert result['indexes'] == ["userId_1_date_-1"]
+    assert result['problems'] == []
+
+
+def test_slot_based_and_express_plans():
+    sbe = {"queryPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "email_1"}},
+           "slotBasedPlan": {}}
+    assert analyze(explain(sbe, 1, 1, 1))['problems'] == []
+    assert analyze(explain({"stage": "EXPRESS_IDHACK"}, 1, 1, 1))['indexes'] == ["_id_"]
+
+
+def test_indexes_match_route():
+    source = ROUTE.read_text()
+    for collection, keys, options in INDEXES:
+        spec = ', '.join(f"{field}: {direction}" for field, direction in keys)
+        pattern = rf"collection: '{collection}', key: {{ {re.escape(spec)} }}, options: {{ unique: true }}"
+        assert re.search(pattern, source), (collection, spec)
@@ -0,0 +1,38 @@
+"""
+The journey state machine in harness.journeys, driven in-process with think times off
+"""
+
+import asyncio
+
+from harness.fake_backend import InMemoryBackend
+from harness.journeys import JOURNEY, InProcessJourneyClient, JourneyStats, load_lessons, run_journeys
+from harness.tts_replay import TtsRouteModel
+
+
+def test_lessons_parsed_from_page():
+    lessons = load_lessons()
+
+    assert 'butikk' in lessons and 'survival' in lessons
+    assert 'Kan jag betala med kort?' in lessons['butikk']
+    assert lessons['butikk'][0] is None
+
+
+def test_static_transitions_point_at_states():
+    for state, (_, _, transitions) in JOURNEY.items():
+        if not callable(transitions):
+            assert all(target in JOURNEY for target, _ in transitions), state
+
+
+def test_in_process_journeys():
+    stats = JourneyStats()
+    backend, tts = InMemoryBackend(), TtsRouteModel(latency_ms=0)
+    asyncio.run(run_journeys(lambda: InProcessJourneyClient(backend, stats, tts), users=10, visits=8, think_scale=0,
+                             stats=stats, seed=5))
+
+    assert stats.journeys_completed == stats.journeys_started == 80
+    assert stats.endpoint('POST', 'auth/signup').count == 10
+    # Every page load fires auth/me and progress together
+    assert stats.bursts[2] == stats.endpoint('GET', 'progress').count
+    assert stats.endpoint('POST', 'tts').count > 0
+    assert stats.endpoint('POST', 'progress').count == stats.states['lesson_complete']
+    assert all(status < 400 for endpoint in stats.endpoints.values() for status in endpoint.statuses)
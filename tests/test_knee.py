@@ -0,0 +1,26 @@
+"""
+harness.knee: where the ramp's latency, throughput and error ratio leave the linear part of the curve
+"""
+
+from harness.knee import find_knee
+
+
+def row(offered, errors=0, p99_ms=100.0, duration=10):
+    return {"offered": offered, "achieved": offered, "requests": offered * duration, "errors": errors,
+            "p99_ms": p99_ms}
+
+
+def test_linear_curve_has_no_knee():
+    assert find_knee([row(2), row(4), row(8)]) is None
+
+
+def test_latency_and_throughput_knees():
+    assert find_knee([row(2, p99_ms=80), row(4, p99_ms=120), row(8, p99_ms=300)]) == 2
+    assert find_knee([row(2), row(4), {**row(8), "achieved": 6.0}]) == 2
+
+
+def test_errors_are_judged_as_a_share_of_the_step():
+    # 5 failures in 1000 requests is 0.5%, within a 1% budget even though it exceeds 1% of the rate
+    assert find_knee([row(50), row(100, errors=5)]) is None
+    assert find_knee([row(50), row(100, errors=20)]) == 1
+    assert find_knee([row(1, errors=1)]) == 0
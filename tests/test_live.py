@@ -0,0 +1,95 @@
+"""
+harness.live: counters, in-flight gauges, sliding windows and the Prometheus exposition
+"""
+
+import asyncio
+import io
+import urllib.request
+
+from harness.live import LiveClient, LiveMetrics, MetricsServer, TerminalView
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def parse(exposition):
+    """{'name{labels}': value} for the sample lines"""
+    samples = {}
+    for line in exposition.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_counters_histogram_and_window_rates():
+    clock = Clock()
+    metrics = LiveMetrics(clock)
+    for second in range(20):
+        clock.now = 1_000_000.0 + second
+        for _ in range(5):
+            metrics.begin('POST', 'auth/signin')
+            metrics.end('POST', 'auth/signin', 200, 0.3)
+        metrics.begin('GET', 'progress')
+        metrics.end('GET', 'progress', 503 if second >= 15 else 200, 0.02)
+    metrics.begin('POST', 'auth/signin')
+    clock.now += 1
+
+    samples = parse(metrics.exposition())
+    signin = 'method="POST",endpoint="auth/signin"'
+    progress = 'method="GET",endpoint="progress"'
+    assert samples[f'svenskpa3_harness_requests_total{{{signin},status="200"}}'] == 100
+    assert samples[f'svenskpa3_harness_in_flight_requests{{{signin}}}'] == 1
+    assert samples[f'svenskpa3_harness_request_duration_seconds_bucket{{{signin},le="0.25"}}'] == 0
+    assert samples[f'svenskpa3_harness_request_duration_seconds_bucket{{{signin},le="0.5"}}'] == 100
+    assert samples[f'svenskpa3_harness_request_duration_seconds_bucket{{{signin},le="+Inf"}}'] == 100
+    assert samples[f'svenskpa3_harness_request_rate{{{signin},window="10s"}}'] == 5
+    assert samples[f'svenskpa3_harness_error_rate{{{progress},window="10s"}}'] == 0.5
+    # The 60s window only spans the 20 whole seconds the run has lasted
+    assert samples[f'svenskpa3_harness_error_rate{{{progress},window="60s"}}'] == 5 / 20
+    assert 0.29 <= samples[f'svenskpa3_harness_window_latency_seconds{{{signin},window="10s",quantile="0.95"}}'] <= 0.31
+
+
+def test_live_client_tracks_in_flight_and_failures():
+    metrics = LiveMetrics()
+    seen = []
+
+    class Client:
+        async def request(self, method, endpoint, data=None):
+            seen.append(metrics.snapshot()[0]['in_flight'])
+            return None, {}
+
+        def set_token(self, token):
+            seen.append(token)
+
+    client = metrics.wrap(Client)()
+    assert isinstance(client, LiveClient)
+    assert asyncio.run(client.request('GET', 'auth/me')) == (None, {})
+    client.set_token('abc')
+    row = metrics.snapshot()[0]
+    assert seen == [1, 'abc'] and row['in_flight'] == 0 and row['errors'] == 1
+
+
+def test_metrics_server_and_terminal_view():
+    metrics = LiveMetrics()
+    metrics.begin('GET', 'progress')
+    metrics.end('GET', 'progress', 200, 0.01)
+    server = MetricsServer(metrics, port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            body = response.read().decode()
+    finally:
+        server.close()
+    assert '# TYPE svenskpa3_harness_request_duration_seconds histogram' in body
+
+    stream = io.StringIO()
+    view = TerminalView(metrics, interval=3600, stream=stream)
+    view.draw()
+    view.close()
+    assert 'GET progress' in stream.getvalue() and '\x1b[' not in stream.getvalue()
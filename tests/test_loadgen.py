@@ -0,0 +1,24 @@
+"""
+harness.loadgen: closed-loop journeys through the in-process client, with and without a user pool
+"""
+
+import asyncio
+
+import requests
+
+from harness.fake_backend import MAX_DAILY_LESSONS, InMemoryBackend, InProcessAsyncClient, install
+from harness.loadgen import LoadStats, run_load
+from harness.user_pool import UserPool
+
+
+def test_pooled_users_stop_posting_at_the_daily_cap():
+    backend, stats = InMemoryBackend(), LoadStats()
+    pool = UserPool(2, path=None, api_base='http://localhost:3000/api',
+                    session_factory=lambda: install(requests.Session(), backend, 'http://localhost:3000')).ensure()
+    users = 3 * 2 * MAX_DAILY_LESSONS
+    asyncio.run(run_load(2, 60, users, client_factory=lambda: InProcessAsyncClient(backend, stats), stats=stats,
+                         user_pool=pool))
+
+    assert stats.journeys_completed == users
+    assert stats.endpoints[('POST', 'progress')].count == 2 * MAX_DAILY_LESSONS
+    assert all(set(endpoint.statuses) == {200} for endpoint in stats.endpoints.values())
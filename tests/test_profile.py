@@ -0,0 +1,51 @@
+"""
+GET and PUT /api/profile
+"""
+
+import pytest
+
+
+def test_get_profile(user, api_base):
+    response = user.session.get(f"{api_base}/profile")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {'displayName', 'level', 'goal', 'scenarios', 'plan'}
+    assert data['level'] == 'beginner'
+    assert data['scenarios'] == ['survival', 'butikk']
+
+
+def test_get_profile_without_auth(anonymous, api_base):
+    assert anonymous.get(f"{api_base}/profile").status_code == 401
+
+
+def test_update_profile(fresh_user, api_base):
+    update = {
+        "displayName": "Uppdaterat Namn",
+        "level": "intermediate",
+        "goal": "Jag vill lära mig svenska för jobbet",
+        "scenarios": ["butikk", "jobb"],
+    }
+    response = fresh_user.session.put(f"{api_base}/profile", json=update)
+
+    assert response.status_code == 200
+    assert response.json()['success'] is True
+    assert fresh_user.session.get(f"{api_base}/profile").json() == {**update, "plan": "free"}
+
+
+@pytest.mark.parametrize('update, error', [
+    ({"level": "expert"}, 'Ugyldig nivå'),
+    ({"goal": "x" * 201}, 'under 200 tegn'),
+    ({"scenarios": "butikk"}, 'må være en liste'),
+    ({"scenarios": ["butikk", "restaurang"]}, 'Ugyldig scenario valgt'),
+    ({"scenarios": ["butikk", "jobb", "lege"]}, 'maks 2 scenarioer'),
+])
+def test_update_profile_rejects_invalid(user, api_base, update, error):
+    response = user.session.put(f"{api_base}/profile", json=update)
+
+    assert response.status_code == 400
+    assert error in response.json()['error']
+
+
+def test_update_profile_without_auth(anonymous, api_base):
+    assert anonymous.put(f"{api_base}/profile", json={"displayName": "Ingen"}).status_code == 401
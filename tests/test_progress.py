@@ -0,0 +1,64 @@
+"""
+GET and POST /api/progress
+"""
+
+from harness.fake_backend import DAILY_XP_PER_LESSON, MAX_DAILY_LESSONS
+
+
+def test_progress_new_user(fresh_user, api_base):
+    response = fresh_user.session.get(f"{api_base}/progress")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "progress": [],
+        "currentStreak": 0,
+        "totalXP": 0,
+        "completedToday": False,
+        "completedLessonsToday": 0,
+        "maxDailyLessons": MAX_DAILY_LESSONS,
+    }
+
+
+def test_complete_first_lesson(fresh_user, api_base):
+    # The server decides the XP, whatever the client sends
+    response = fresh_user.session.post(f"{api_base}/progress", json={"xpEarned": 15})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['success'] is True
+    assert data['streak'] == 1
+    assert data['xpEarned'] == DAILY_XP_PER_LESSON
+    assert data['completionsCount'] == 1
+
+
+def test_repeat_lessons_same_day(fresh_user, api_base):
+    for _ in range(3):
+        response = fresh_user.session.post(f"{api_base}/progress", json={})
+        assert response.status_code == 200
+
+    data = response.json()
+    assert data['streak'] == 1
+    assert data['completionsCount'] == 3
+    assert data['totalXpToday'] == 3 * DAILY_XP_PER_LESSON
+
+    progress = fresh_user.session.get(f"{api_base}/progress").json()
+    assert progress['currentStreak'] == 1
+    assert progress['totalXP'] == 3 * DAILY_XP_PER_LESSON
+    assert progress['completedLessonsToday'] == 3
+    assert progress['completedToday'] is False
+    assert len(progress['progress']) == 1
+
+
+def test_daily_cap(fresh_user, api_base):
+    for _ in range(MAX_DAILY_LESSONS):
+        assert fresh_user.session.post(f"{api_base}/progress", json={}).status_code == 200
+
+    response = fresh_user.session.post(f"{api_base}/progress", json={})
+    assert response.status_code == 400
+    assert 'maks antall' in response.json()['error']
+    assert fresh_user.session.get(f"{api_base}/progress").json()['completedToday'] is True
+
+
+def test_progress_without_auth(anonymous, api_base):
+    assert anonymous.get(f"{api_base}/progress").status_code == 401
+    assert anonymous.post(f"{api_base}/progress", json={}).status_code == 401
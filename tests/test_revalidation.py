@@ -0,0 +1,43 @@
+"""
+ETag / If-None-Match on GET /api/auth/me, /api/profile and /api/progress
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize('endpoint', ['auth/me', 'profile', 'progress'])
+def test_not_modified_when_unchanged(fresh_user, api_base, endpoint):
+    first = fresh_user.session.get(f"{api_base}/{endpoint}")
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    second = fresh_user.session.get(f"{api_base}/{endpoint}", headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.content == b''
+    assert second.headers['ETag'] == etag
+
+
+def test_progress_etag_changes_after_lesson(fresh_user, api_base):
+    etag = fresh_user.session.get(f"{api_base}/progress").headers['ETag']
+    assert fresh_user.session.post(f"{api_base}/progress", json={}).status_code == 200
+
+    response = fresh_user.session.get(f"{api_base}/progress", headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json()['completedLessonsToday'] == 1
+    assert response.headers['ETag'] != etag
+
+
+def test_profile_etag_changes_after_update(fresh_user, api_base):
+    etag = fresh_user.session.get(f"{api_base}/auth/me").headers['ETag']
+    assert fresh_user.session.put(f"{api_base}/profile", json={"displayName": "Nytt Navn"}).status_code == 200
+
+    response = fresh_user.session.get(f"{api_base}/auth/me", headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json()['displayName'] == "Nytt Navn"
+
+
+def test_weak_comparison_and_lists(fresh_user, api_base):
+    etag = fresh_user.session.get(f"{api_base}/profile").headers['ETag']
+
+    response = fresh_user.session.get(f"{api_base}/profile", headers={'If-None-Match': f'"other", W/{etag}'})
+    assert response.status_code == 304
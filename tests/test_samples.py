@@ -0,0 +1,65 @@
+"""
+harness.samples: column chunks, per-second rollups and the trend queries over them
+"""
+
+import pytest
+
+from harness.samples import SampleStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SampleStore(str(tmp_path / 'samples.db'))
+    yield store
+    store.close()
+
+
+def record_run(store, label, latency_ms, errors_at=(), seconds=5, per_second=100, flush_every=137):
+    run = store.start_run(label, flush_every=flush_every)
+    for second in range(seconds):
+        for index in range(per_second):
+            status = 503 if second in errors_at else 200
+            run.record('GET', 'progress', status, latency_ms / 1000, 512, at=run.started + second + index / 1000)
+            run.record('POST', 'progress', 200, 2 * latency_ms / 1000, 64, at=run.started + second + index / 1000)
+    run.close()
+    return run.run_id
+
+
+def test_columns_round_trip(store):
+    run_id = record_run(store, 'a', 10)
+    columns = store.columns(run_id)
+
+    assert len(columns['t_us']) == 1000
+    assert set(columns['endpoint']) == {0, 1}
+    assert sum(columns['bytes']) == 500 * 512 + 500 * 64
+    assert store.runs()[0]['samples'] == 1000
+
+
+def test_percentiles_over_time(store):
+    run_id = record_run(store, 'a', 10)
+    rows = store.percentiles_over_time(run_id, window=2, endpoint='GET progress')
+
+    assert [row['start_s'] for row in rows] == [0, 2, 4]
+    assert [row['count'] for row in rows] == [200, 200, 100]
+    assert all(9.8 <= row['p50_ms'] <= 10.2 for row in rows)
+
+
+def test_error_bursts(store):
+    run_id = record_run(store, 'a', 10, errors_at=(1, 2, 4), seconds=6)
+
+    assert store.error_bursts(run_id) == [
+        {"start_s": 1, "end_s": 2, "requests": 400, "errors": 200},
+        {"start_s": 4, "end_s": 4, "requests": 200, "errors": 100},
+    ]
+    assert len(store.error_bursts(run_id, max_gap=2)) == 1
+
+
+def test_trend_across_runs(store):
+    for latency in (10, 20, 40):
+        record_run(store, 'nightly', latency)
+    record_run(store, 'other', 80)
+
+    rows = store.trend('nightly', endpoint='POST progress')
+    assert [row['p50_ms'] for row in rows] == pytest.approx([20, 40, 80], rel=0.02)
+    assert all(row['count'] == 500 and row['error_rate'] == 0 for row in rows)
+    assert store.resolve('latest') == store.runs()[0]['run_id']
@@ -0,0 +1,48 @@
+"""
+harness.seeder: synthetic daily_progress chains keep route.js's streak, cap and XP invariants
+"""
+
+from datetime import date, timedelta
+
+import requests
+
+from harness.fake_backend import DAILY_XP_PER_LESSON, MAX_DAILY_LESSONS, InMemoryBackend, install
+from harness.seeder import MemoryTarget, seed, seeded_token
+
+
+def test_seeded_chains_are_consistent():
+    backend = InMemoryBackend()
+    counts = seed(MemoryTarget(backend), users=50, days=60, mean_completions=12, seed_value=7)
+    assert counts['users'] == 50 and counts['daily_progress'] == sum(map(len, backend.daily_progress.values()))
+
+    for docs in backend.daily_progress.values():
+        previous = None
+        for doc in sorted(docs.values(), key=lambda doc: doc['date']):
+            day = date.fromisoformat(doc['date'])
+            consecutive = previous is not None and day - date.fromisoformat(previous['date']) == timedelta(days=1)
+            assert doc['streakAfter'] == (previous['streakAfter'] + 1 if consecutive else 1)
+            assert 1 <= doc['completionsCount'] <= MAX_DAILY_LESSONS
+            assert doc['xpEarned'] == doc['completionsCount'] * DAILY_XP_PER_LESSON
+            previous = doc
+    # mean_completions=12 makes some days hit the cap rather than exceed it
+    assert any(doc['completionsCount'] == MAX_DAILY_LESSONS
+               for docs in backend.daily_progress.values() for doc in docs.values())
+
+
+def test_seeded_history_reads_back_through_the_api():
+    backend = InMemoryBackend()
+    seed(MemoryTarget(backend), users=1, days=45, activity='daily', fixed_history=True, seed_value=1,
+         today=date.fromisoformat(backend._day(0)))
+    user_id = next(iter(backend.users))
+    session = install(requests.Session(), backend, 'http://localhost:3000')
+    session.cookies.set('token', seeded_token(user_id, backend.secret), path='/')
+
+    response = session.get('http://localhost:3000/api/progress')
+    assert response.status_code == 200
+    data = response.json()
+    today = backend.daily_progress[user_id][backend._day(0)]
+    assert data['currentStreak'] == 45
+    assert len(data['progress']) == 31
+    assert data['totalXP'] == sum(doc['xpEarned'] for doc in data['progress'])
+    assert data['completedLessonsToday'] == today['completionsCount']
+    assert data['completedToday'] == (today['completionsCount'] >= MAX_DAILY_LESSONS)
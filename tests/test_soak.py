@@ -0,0 +1,75 @@
+"""
+harness.soak: /proc memory sampling and the growth/drift checks over sample rows
+"""
+
+import asyncio
+import os
+
+from harness.soak import WindowRecorder, analyze, kendall_tau, proc_memory, process_tree, soak
+
+
+def rows(server_rss, p95, error_rate=None, interval=10):
+    return [{
+        "t_s": index * interval, "requests": 100, "p95_ms": p95[index], "server_rss_mb": server_rss[index],
+        "server_anon_mb": None, "client_traced_mb": 1.0, "client_rss_mb": 30.0,
+        "error_rate": error_rate[index] if error_rate else 0.0,
+    } for index in range(len(p95))]
+
+
+def test_kendall_tau():
+    assert kendall_tau([1, 2, 3, 4]) == 1
+    assert kendall_tau([4, 3, 2, 1]) == -1
+    assert kendall_tau([1, 1, 1, 1]) == 0
+
+
+def test_growing_memory_and_drifting_latency_are_flagged():
+    steady = [100 + (index % 3) for index in range(40)]
+    growing = [100 + 2 * index + (index % 3) for index in range(40)]
+    report = analyze(rows(growing, [5.0] * 40), warmup=0)
+    assert [finding.split(':')[0] for finding in report['findings']] == ['server_rss_mb grows monotonically']
+
+    report = analyze(rows(steady, [5 + index / 4 for index in range(40)]), warmup=0)
+    assert [finding.split(':')[0] for finding in report['findings']] == ['p95_ms grows monotonically']
+
+
+def test_steady_run_and_warmup_are_not_flagged():
+    # Memory climbs during the first minute only, as caches fill
+    rss = [50 + 10 * index if index < 6 else 110 + (index % 2) for index in range(40)]
+    report = analyze(rows(rss, [5.0] * 40), warmup=60)
+    assert report['findings'] == []
+    assert report['series']['server_rss_mb']['start'] >= 110
+
+
+def test_rss_latency_correlation():
+    rss = [100 + index for index in range(20)]
+    report = analyze(rows(rss, [float(value) for value in rss]), warmup=0)
+    assert abs(report['correlations']['server_rss_mb~p95_ms'] - 1) < 1e-9
+
+
+def test_proc_memory_of_own_tree():
+    pids = process_tree(os.getpid())
+    assert pids[0] == os.getpid()
+    memory = proc_memory(pids)
+    assert memory['rss'] > 0 and memory['data'] > 0
+    assert proc_memory([2 ** 30])['rss'] == 0
+
+
+def test_soak_in_process():
+    import tracemalloc
+
+    from harness.fake_backend import InMemoryBackend
+    from harness.journeys import InProcessJourneyClient, JourneyStats
+    from harness.tts_replay import TtsRouteModel
+
+    window = WindowRecorder()
+    stats = JourneyStats(window)
+    backend, tts = InMemoryBackend(), TtsRouteModel()
+    tracemalloc.start()
+    try:
+        sampled = asyncio.run(soak(lambda: InProcessJourneyClient(backend, stats, tts), stats, window, 1.0, 0.25,
+                                   server_pids=lambda: [os.getpid()], users=5, think_scale=0.01, visit_gap=0.01))
+    finally:
+        tracemalloc.stop()
+    assert len(sampled) >= 3
+    assert sum(row['requests'] for row in sampled) > 0
+    assert all(row['server_rss_mb'] > 0 and row['error_rate'] == 0 for row in sampled)
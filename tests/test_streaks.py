@@ -0,0 +1,44 @@
+"""
+Streaks, XP window and the daily cap across simulated days, using the X-Test-Now clock
+"""
+
+from datetime import date
+
+import pytest
+
+from harness import simulate
+from harness.fake_backend import InMemoryBackend
+
+
+@pytest.fixture
+def target():
+    return simulate.InProcessTarget(InMemoryBackend(test_clock=True))
+
+
+@pytest.mark.parametrize('activity', ['daily', 'uniform', 'streaky'])
+def test_simulation_matches_reference(target, activity):
+    mismatches, _ = simulate.run(target, users=20, days=45, start=date(2024, 2, 15), activity=activity,
+                                 cap_rate=0.1, seed=17, report=lambda line: None)
+
+    assert mismatches == []
+
+
+def test_streak_resets_after_missed_day(target):
+    token = target.signup("gap@example.com")
+    for day in ('2024-03-01T23:59:59+00:00', '2024-03-02T00:00:00+00:00', '2024-03-04T12:00:00+00:00'):
+        assert target.backend.handle('POST', 'progress', {}, {'token': token}, {'X-Test-Now': day}).status == 200
+
+    result = target.backend.handle('GET', 'progress', None, {'token': token}, {'X-Test-Now': '2024-03-04T13:00:00Z'})
+    assert result.body['currentStreak'] == 1
+    result = target.backend.handle('GET', 'progress', None, {'token': token}, {'X-Test-Now': '2024-04-10T00:00:00Z'})
+    assert result.body['currentStreak'] == 0
+    assert result.body['totalXP'] == 0
+
+
+def test_header_ignored_without_test_clock():
+    backend = InMemoryBackend(test_clock=False)
+    token = simulate.InProcessTarget(backend).signup("noclock@example.com")
+    backend.handle('POST', 'progress', {}, {'token': token}, {'X-Test-Now': '2001-01-01T00:00:00Z'})
+
+    result = backend.handle('GET', 'progress', None, {'token': token})
+    assert result.body['completedLessonsToday'] == 1
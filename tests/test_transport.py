@@ -0,0 +1,63 @@
+"""
+harness.transport: shared keep-alive pools, per-session cookies and connection counters
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from harness.fake_backend import InMemoryBackend
+from harness.transport import Transport
+
+
+@pytest.fixture
+def api_url(stand_in_server):
+    host, port = stand_in_server
+    return f"http://{host}:{port}/api"
+
+
+def test_sessions_share_sockets_but_not_cookies(api_url):
+    transport = Transport()
+    first, second = transport.session(), transport.session()
+    response = first.post(f"{api_url}/auth/signup", json={"email": "pool@example.com", "password": "PoolPass123!"})
+    assert response.status_code == 200 and not response.connection_reused and response.connect_elapsed > 0
+
+    me = second.get(f"{api_url}/auth/me")
+    assert me.status_code == 401 and me.connection_reused and me.connect_elapsed == 0
+    assert first.get(f"{api_url}/auth/me").status_code == 200
+
+    assert transport.summary()['new_connections'] == 1 and transport.reused == 2
+    transport.close()
+    assert transport.open == 0
+    # Sessions outlive the pool they were handed out with
+    assert first.get(f"{api_url}/auth/me").status_code == 200
+    assert transport.summary()['new_connections'] == 2
+    transport.close()
+
+
+def test_blocking_pool_stays_within_socket_budget(api_url):
+    transport = Transport(pool_maxsize=2, block=True)
+    sessions = [transport.session() for _ in range(6)]
+    with ThreadPoolExecutor(6) as pool:
+        for _ in range(3):
+            assert set(pool.map(lambda session: session.get(f"{api_url}/progress").status_code, sessions)) == {401}
+    summary = transport.summary()
+    assert summary['requests'] == 18
+    assert summary['peak_open'] <= 2 and summary['new_connections'] <= 2
+    transport.close()
+
+
+def test_in_process_transport_opens_no_sockets():
+    transport = Transport(backend=InMemoryBackend(), base_url='http://localhost:3000')
+    assert transport.session().get('http://localhost:3000/api/auth/me').status_code == 401
+    assert transport.summary()['requests'] == 0
+
+
+def test_caller_transport_stays_open():
+    import simple_backend_test
+
+    transport = Transport(backend=InMemoryBackend(), base_url=simple_backend_test.BASE_URL)
+    closed = []
+    transport.close = lambda: closed.append(True)
+    simple_backend_test.test_api_endpoints(transport.backend, transport)
+    assert not closed
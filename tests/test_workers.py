@@ -0,0 +1,44 @@
+"""
+harness.workers: worker processes recording into shared memory through the loadgen client interface
+"""
+
+import pytest
+
+from harness.fake_backend import MAX_DAILY_LESSONS, InMemoryBackend
+from harness.user_pool import UserPool
+from harness.workers import run_workers
+
+
+def test_in_process_workers_complete_all_journeys():
+    stats = run_workers(2, concurrency=2, users=20, in_process=True, report_interval=0.1, report=lambda *args: None)
+
+    assert stats.journeys_started == 20
+    assert stats.journeys_completed == 20
+    assert stats.total_requests == 20 * 6
+    assert all(endpoint.errors == 0 for endpoint in stats.endpoints.values())
+
+
+class UncappedProgressBackend(InMemoryBackend):
+    """Never reports completedToday, so only the load generator's own lesson accounting avoids the cap"""
+
+    def handle_get_progress(self, read_json, cookies):
+        response = super().handle_get_progress(read_json, cookies)
+        if isinstance(response.body, dict):
+            response.body['completedToday'] = False
+        return response
+
+
+@pytest.mark.parametrize('stand_in_server', [UncappedProgressBackend], indirect=True)
+def test_pooled_workers_split_users_and_respect_the_lesson_cap(stand_in_server):
+    host, port = stand_in_server
+    api_base = f"http://{host}:{port}/api"
+    pool = UserPool(2, path=None, api_base=api_base).ensure()
+    tokens = [pool.token(index) for index in range(2)]
+    # Each worker alone completes 2 x MAX_DAILY_LESSONS journeys
+    users = 2 * 2 * MAX_DAILY_LESSONS
+    stats = run_workers(2, concurrency=4, users=users, api_base=api_base, tokens=tokens, report_interval=0.1,
+                        report=lambda *args: None)
+
+    assert stats.journeys_completed == users
+    assert stats.endpoints[('POST', 'progress')].count == 2 * MAX_DAILY_LESSONS
+    assert all(set(endpoint.statuses) == {200} for endpoint in stats.endpoints.values())